@@ -34,13 +34,107 @@ class Settings(BaseSettings):
     )
     models_dir: Path = Field(default=Path("./models"), description="Models directory")
     logs_dir: Path = Field(default=Path("./logs"), description="Logs directory")
+    eeg_cache_dir: Path = Field(
+        default=Path("./data/cache/eeg"), description="Converted EEG subject cache directory"
+    )
+    feature_cache_dir: Path = Field(
+        default=Path("./data/cache/features"), description="Processed feature cache directory"
+    )
+    spill_dir: Path = Field(
+        default=Path("./data/cache/spill"), description="Disk-backed feature matrix directory"
+    )
 
     # EEG Configuration
+    dataset_format: Literal["deap", "sharded"] = Field(
+        default="deap", description="Layout of the EEG dataset in raw_data_eeg_path"
+    )
     label_threshold: float = Field(default=4.5, ge=1.0, le=9.0, description="Label threshold")
     n_user_total: int = Field(default=32, ge=1, description="Total number of users")
     n_trial_total: int = Field(default=40, ge=1, description="Total number of trials")
     n_time_total: int = Field(default=8064, ge=1, description="Total time samples")
     sampling_rate: int = Field(default=60, ge=1, description="Sampling rate in Hz")
+    numeric_dtype: Literal["float32", "float64"] = Field(
+        default="float64", description="Floating point dtype for EEG arrays and feature matrices"
+    )
+    eeg_storage: Literal["pickle", "memmap", "chunked", "quantized"] = Field(
+        default="pickle", description="Storage backend used to load EEG subjects"
+    )
+    eeg_store_codec: Literal["auto", "zstd", "lz4", "zlib"] = Field(
+        default="auto", description="Compression codec of the chunked EEG store"
+    )
+    eeg_io_threads: int = Field(default=4, ge=1, description="Threads for EEG chunk decompression")
+    dataset_manifest: Literal["off", "check", "generate"] = Field(
+        default="check", description="Validate subject files against the dataset manifest"
+    )
+    feature_mode: Literal["raw", "band_power", "de_asymmetry"] = Field(
+        default="raw",
+        description=(
+            "Batch features: raw samples, Welch log band powers per channel, or band "
+            "differential entropy with DASM hemispheric asymmetry"
+        ),
+    )
+    welch_segment_seconds: float = Field(
+        default=2.0, gt=0, description="Welch segment length in seconds for spectral features"
+    )
+    filter_low_hz: float = Field(
+        default=0.0, ge=0, description="Pre-filter low cutoff in Hz before features (0 = none)"
+    )
+    filter_high_hz: float = Field(
+        default=0.0, ge=0, description="Pre-filter high cutoff in Hz before features (0 = none)"
+    )
+    filter_order: int = Field(default=4, ge=1, le=10, description="Butterworth filter order")
+    epoch_seconds: float = Field(
+        default=0.0,
+        ge=0,
+        description="Split trials into epochs of this length in seconds (0 = off)",
+    )
+    epoch_hop_seconds: float = Field(
+        default=0.0, ge=0, description="Seconds between epoch starts (0 = epoch length, no overlap)"
+    )
+    decimation_factor: int = Field(
+        default=1,
+        ge=1,
+        le=16,
+        description="Anti-aliased downsampling factor of raw-sample features (1 = off)",
+    )
+    baseline_correction: Literal["off", "subtract", "zscore"] = Field(
+        default="off",
+        description="Correct trials by their pre-trial baseline mean (or mean and std)",
+    )
+    artifact_rejection: Literal["off", "drop", "weight"] = Field(
+        default="off",
+        description="Drop epochs with artifacts, or down-weight them as training samples",
+    )
+    artifact_weight: float = Field(
+        default=0.1, ge=0, le=1, description="Sample weight of a fully flagged epoch"
+    )
+    artifact_max_abs_uv: float = Field(
+        default=100.0, ge=0, description="Max deviation from the epoch mean in uV (0 = off)"
+    )
+    artifact_max_ptp_uv: float = Field(
+        default=150.0, ge=0, description="Max peak-to-peak amplitude in uV (0 = off)"
+    )
+    artifact_flat_uv: float = Field(
+        default=0.5,
+        ge=0,
+        description="Peak-to-peak below this flags a flat channel in uV (0 = off)",
+    )
+    artifact_hf_ratio: float = Field(
+        default=0.5, ge=0, le=1, description="Max share of power above artifact_hf_hz (0 = off)"
+    )
+    artifact_hf_hz: float = Field(
+        default=30.0, gt=0, description="Lower edge of the muscle artifact band in Hz"
+    )
+    fft_backend: Literal["auto", "numpy", "scipy"] = Field(
+        default="auto", description="FFT backend ('auto' benchmarks both on first use)"
+    )
+    fft_workers: int = Field(
+        default=0, ge=0, description="FFT worker threads for the scipy backend (0 = all CPUs)"
+    )
+    fft_pad_fast: bool = Field(
+        default=False,
+        description="Zero-pad plotted spectra to a fast FFT length (changes the frequency grid)",
+    )
 
     # Training Configuration
     n_user_train_start: int = Field(default=1, ge=1, description="Training start user")
@@ -71,6 +165,23 @@ class Settings(BaseSettings):
         default=33, ge=10, le=1000, description="Camera update interval in ms"
     )
     max_cache_size: int = Field(default=1000, ge=100, le=10000, description="Maximum cache size")
+    eeg_workers: int = Field(
+        default=1, ge=0, description="Worker processes for batch EEG processing (0 = all CPUs)"
+    )
+    max_cache_memory_mb: int = Field(
+        default=1024, ge=0, description="Maximum resident memory of the EEG subject cache in MB"
+    )
+    use_feature_cache: bool = Field(
+        default=True, description="Reuse processed feature matrices from the feature cache"
+    )
+    feature_cache_max_mb: int = Field(
+        default=4096, ge=0, description="Maximum disk usage of the feature cache in MB"
+    )
+    feature_memory_budget_mb: int = Field(
+        default=0,
+        ge=0,
+        description="Feature matrices above this size in MB are spilled to disk (0 = unlimited)",
+    )
 
     # Machine Learning
     default_ml_model: Literal["KNN", "SVM", "PCA+KNN", "PCA+SVM"] = Field(
@@ -79,7 +190,15 @@ class Settings(BaseSettings):
     knn_neighbors: int = Field(default=5, ge=1, description="KNN number of neighbors")
     knn_leaf_size: int = Field(default=200, ge=1, description="KNN leaf size")
 
-    @field_validator("data_dir", "raw_data_eeg_path", "models_dir", "logs_dir")
+    @field_validator(
+        "data_dir",
+        "raw_data_eeg_path",
+        "models_dir",
+        "logs_dir",
+        "eeg_cache_dir",
+        "feature_cache_dir",
+        "spill_dir",
+    )
     @classmethod
     def validate_paths(cls, v: Path) -> Path:
         """Validate and convert string paths to Path objects."""
@@ -0,0 +1,94 @@
+"""Vectorized detection of amplitude, flatline and muscle artifacts in EEG epochs."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from emotion_recognition.core.spectral import FFTBackend, welch_psd
+
+
+@dataclass(frozen=True)
+class ArtifactThresholds:
+    """Limits beyond which a channel of an epoch is flagged as an artifact.
+
+    A limit of 0 disables its check. Amplitudes are in the units of the
+    signal (microvolts for DEAP).
+    """
+
+    max_abs: float = 100.0
+    max_ptp: float = 150.0
+    min_ptp: float = 0.5
+    max_hf_ratio: float = 0.5
+    hf_low: float = 30.0
+
+
+def artifact_masks(
+    epochs: np.ndarray,
+    sampling_rate: float,
+    thresholds: ArtifactThresholds,
+    segment: int,
+    *,
+    backend: FFTBackend | None = None,
+) -> dict[str, np.ndarray]:
+    """Flag artifacts in every channel of every epoch at once.
+
+    Every check reduces the last axis of the whole epoch array, so all
+    trials, epochs and channels are scored in one pass per check:
+
+    - 'amplitude': largest deviation from the epoch mean above ``max_abs``
+      (blinks and saturation)
+    - 'peak_to_peak': range above ``max_ptp`` (movement and electrode pops)
+    - 'flatline': range below ``min_ptp`` (disconnected or clipped channels)
+    - 'high_frequency': share of Welch power at or above ``hf_low`` Hz above
+      ``max_hf_ratio`` (muscle activity)
+
+    Args:
+        epochs: Epoch samples of shape (..., n_channels, n_samples), e.g. an
+            ``epoch_view`` of whole trials
+        sampling_rate: Sampling rate in Hz
+        thresholds: Artifact limits
+        segment: Welch segment length in samples for the high-frequency check
+        backend: FFT backend (single-threaded numpy if None)
+
+    Returns:
+        Dictionary of enabled check name to boolean mask of shape
+        (..., n_channels), True where the channel is contaminated
+    """
+    masks = {}
+    high = epochs.max(axis=-1)
+    low = epochs.min(axis=-1)
+    peak_to_peak = high - low
+
+    if thresholds.max_abs > 0:
+        mean = epochs.mean(axis=-1)
+        masks["amplitude"] = np.maximum(high - mean, mean - low) > thresholds.max_abs
+    if thresholds.max_ptp > 0:
+        masks["peak_to_peak"] = peak_to_peak > thresholds.max_ptp
+    if thresholds.min_ptp > 0:
+        masks["flatline"] = peak_to_peak < thresholds.min_ptp
+    if thresholds.max_hf_ratio > 0 and thresholds.hf_low < sampling_rate / 2:
+        frequencies, psd = welch_psd(
+            epochs, sampling_rate, min(segment, epochs.shape[-1]), backend=backend
+        )
+        total = psd[..., frequencies > 0].sum(axis=-1)
+        high_frequency = psd[..., frequencies >= thresholds.hf_low].sum(axis=-1)
+        masks["high_frequency"] = high_frequency > thresholds.max_hf_ratio * total
+
+    return masks
+
+
+def epoch_weights(mask: np.ndarray, weight: float) -> np.ndarray:
+    """Weight epochs by the share of their channels flagged as artifacts.
+
+    The signal itself is left untouched; the weights are meant as sample
+    weights for the classifier.
+
+    Args:
+        mask: Flagged channels of shape (..., n_channels)
+        weight: Weight of an epoch with every channel flagged (0 to 1)
+
+    Returns:
+        Weights of shape (...,), 1 for clean epochs falling linearly to
+        ``weight`` as more channels are flagged
+    """
+    return 1.0 - (1.0 - weight) * mask.mean(axis=-1)
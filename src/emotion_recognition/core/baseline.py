@@ -0,0 +1,32 @@
+"""Baseline correction of EEG trials against their pre-trial segment."""
+
+import numpy as np
+
+# Lower bound on the baseline standard deviation, so flat channels are not divided by zero
+BASELINE_STD_FLOOR = 1e-12
+
+
+def baseline_correct(data: np.ndarray, baseline: np.ndarray, mode: str = "subtract") -> np.ndarray:
+    """Correct signals by the statistics of their baseline segments.
+
+    The per-channel statistics of every trial are reduced along the last
+    axis with ``keepdims``, so one broadcast operation corrects all channels
+    of all trials at once.
+
+    Args:
+        data: Signals of shape (..., n_channels, n_samples)
+        baseline: Baseline segments of shape (..., n_channels, n_baseline),
+            matching ``data`` on the leading axes
+        mode: 'subtract' removes the baseline mean, 'zscore' also divides by
+            the baseline standard deviation
+
+    Returns:
+        Corrected copy of ``data``
+    """
+    if mode not in ("subtract", "zscore"):
+        raise ValueError(f"Unknown baseline correction mode: {mode}")
+
+    corrected = data - baseline.mean(axis=-1, keepdims=True)
+    if mode == "zscore":
+        corrected /= np.maximum(baseline.std(axis=-1, keepdims=True), BASELINE_STD_FLOOR)
+    return corrected
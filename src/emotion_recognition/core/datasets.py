@@ -0,0 +1,468 @@
+"""Dataset adapters describing and loading EEG subjects from different layouts."""
+
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from emotion_recognition.core.eeg_store import (
+    ChunkedSubjectStore,
+    MemmapSubjectStore,
+    QuantizedSubjectStore,
+    read_deap_pickle,
+)
+from emotion_recognition.core.manifest import DatasetManifest
+
+# DEAP trials start with a 3 s pre-trial baseline recorded at 128 Hz
+DEAP_SAMPLING_RATE = 128
+DEAP_BASELINE_SAMPLES = 3 * DEAP_SAMPLING_RATE
+DEAP_N_CHANNELS = 40
+
+SHARDED_INDEX_FILE = "dataset.json"
+SHARDED_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SubjectInfo:
+    """Sizes and offsets of one subject, known without reading its payload."""
+
+    user_id: int
+    n_trials: int
+    n_channels: int
+    trial_lengths: tuple[int, ...]
+    trial_offsets: tuple[int, ...]
+    baseline_samples: int
+    sampling_rate: int
+
+    @property
+    def is_uniform(self) -> bool:
+        """Check whether all trials have the same number of samples."""
+        return len(set(self.trial_lengths)) <= 1
+
+    @property
+    def min_trial_length(self) -> int:
+        """Get the number of samples of the shortest trial."""
+        return min(self.trial_lengths, default=0)
+
+
+class DatasetAdapter(ABC):
+    """Interface between EEGProcessor and an on-disk dataset layout.
+
+    Loaded subjects are dictionaries with 'labels' of shape (n_trials, 4) and
+    'data' holding either one (n_trials, n_channels, n_samples) array, or a
+    list of (n_channels, n_samples) arrays when trial lengths differ.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def user_ids(self) -> list[int]:
+        """Get the IDs of all subjects in the dataset."""
+
+    @abstractmethod
+    def has_subject(self, user_id: int) -> bool:
+        """Check whether a subject is present.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the subject can be loaded
+        """
+
+    @abstractmethod
+    def source_files(self, user_id: int) -> list[Path]:
+        """Get the files a subject is read from, for cache keys.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of file paths
+        """
+
+    @abstractmethod
+    def subject_info(self, user_id: int) -> SubjectInfo | None:
+        """Describe a subject without reading its payload.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Subject info, or None if the subject is unknown
+        """
+
+    @abstractmethod
+    def load_subject(self, user_id: int, storage: str) -> dict | None:
+        """Load a subject.
+
+        Args:
+            user_id: User ID
+            storage: Storage backend name (adapters without backends ignore it)
+
+        Returns:
+            Dictionary with 'data' and 'labels' keys, or None if load fails
+        """
+
+
+class DeapDataset(DatasetAdapter):
+    """DEAP ``data_preprocessed_python`` directory of ``sNN.dat`` pickles.
+
+    Subjects can be read from the pickles directly or through the converted
+    memmap/chunked/quantized stores. Sizes come from the dataset manifest when one
+    exists, otherwise from the configured trial and sample counts.
+    """
+
+    name = "deap"
+
+    def __init__(
+        self,
+        root: Path,
+        stores: dict[str, MemmapSubjectStore | ChunkedSubjectStore | QuantizedSubjectStore],
+        manifest: DatasetManifest,
+        n_trials: int,
+        n_samples: int,
+    ) -> None:
+        """Initialize DEAP dataset.
+
+        Args:
+            root: Directory holding the subject pickles
+            stores: Converted storage backends by name
+            manifest: Dataset manifest of the directory
+            n_trials: Trials per subject when not listed in the manifest
+            n_samples: Samples per trial when not listed in the manifest
+        """
+        self.root = root
+        self.stores = stores
+        self.manifest = manifest
+        self.n_trials = n_trials
+        self.n_samples = n_samples
+
+    def subject_path(self, user_id: int) -> Path:
+        """Get the pickle path of a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Subject file path
+        """
+        return DatasetManifest.subject_path(self.root, user_id)
+
+    def user_ids(self) -> list[int]:
+        """Get the IDs of all subjects in the dataset."""
+        return sorted(
+            int(match.group(1))
+            for path in self.root.glob("s*.dat")
+            if (match := re.fullmatch(r"s(\d+)\.dat", path.name))
+        )
+
+    def has_subject(self, user_id: int) -> bool:
+        """Check whether a subject is present."""
+        return self.subject_path(user_id).exists()
+
+    def source_files(self, user_id: int) -> list[Path]:
+        """Get the files a subject is read from."""
+        return [self.subject_path(user_id)]
+
+    def subject_info(self, user_id: int) -> SubjectInfo | None:
+        """Describe a subject from the manifest or the configured sizes."""
+        if not self.has_subject(user_id):
+            return None
+
+        entry = self.manifest.subjects.get(user_id)
+        if entry is not None:
+            n_trials, n_channels, n_samples = entry["data"]["shape"]
+        else:
+            n_trials, n_channels, n_samples = self.n_trials, DEAP_N_CHANNELS, self.n_samples
+
+        return SubjectInfo(
+            user_id=user_id,
+            n_trials=n_trials,
+            n_channels=n_channels,
+            trial_lengths=(n_samples,) * n_trials,
+            trial_offsets=tuple(range(0, n_trials * n_samples, n_samples)),
+            baseline_samples=DEAP_BASELINE_SAMPLES,
+            sampling_rate=DEAP_SAMPLING_RATE,
+        )
+
+    def convert(self, user_id: int, storage: str) -> bool:
+        """Convert a subject pickle into a storage backend.
+
+        Args:
+            user_id: User ID
+            storage: 'memmap', 'chunked' or 'quantized'
+
+        Returns:
+            True if conversion successful, False otherwise
+        """
+        return self.stores[storage].convert(user_id, self.subject_path(user_id))
+
+    def ensure_converted(self, user_id: int, storage: str) -> None:
+        """Convert a subject into a storage backend unless it is already current.
+
+        Args:
+            user_id: User ID
+            storage: 'memmap', 'chunked' or 'quantized'
+        """
+        store = self.stores[storage]
+        if not store.is_current(user_id, self.subject_path(user_id)):
+            store.convert(user_id, self.subject_path(user_id))
+
+    def load_subject(self, user_id: int, storage: str) -> dict | None:
+        """Load a subject from its pickle or a converted storage backend."""
+        if storage == "pickle":
+            return read_deap_pickle(self.subject_path(user_id))
+
+        self.ensure_converted(user_id, storage)
+        return self.stores[storage].load(user_id)
+
+
+class ShardedDataset(DatasetAdapter):
+    """Sharded binary dataset for many subjects with variable-length trials.
+
+    Layout of the dataset directory:
+
+    - ``dataset.json``: sampling rate, channel count, baseline length and per
+      subject the shard name, trial lengths, sample offsets into the shard and
+      label row offset
+    - ``shard_NNNN.npy``: trials of a group of subjects concatenated along
+      time, shape (n_samples_total, n_channels), so each trial is one
+      contiguous block of the file
+    - ``shard_NNNN.labels.npy``: label rows of those trials, shape (n, 4)
+
+    Shards are memory-mapped, so loading a subject only creates views and
+    reading a trial only touches that trial's pages. Channel indices follow
+    the DEAP montage used by ``EEGProcessor.channel_map``.
+    """
+
+    name = "sharded"
+
+    def __init__(self, root: Path) -> None:
+        """Initialize sharded dataset.
+
+        Args:
+            root: Dataset directory
+        """
+        self.root = root
+        self._index: dict | None = None
+        self._index_mtime_ns: int | None = None
+        self._shards: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def index(self) -> dict:
+        """Get the dataset index, re-read when the file changes."""
+        index_path = self.root / SHARDED_INDEX_FILE
+        try:
+            mtime_ns = index_path.stat().st_mtime_ns
+        except OSError:
+            return {"subjects": {}}
+
+        if self._index is None or mtime_ns != self._index_mtime_ns:
+            self._index = json.loads(index_path.read_text())
+            self._index_mtime_ns = mtime_ns
+            self._shards.clear()
+        return self._index
+
+    def _entry(self, user_id: int) -> dict | None:
+        """Get the index entry of a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Index entry or None if the subject is unknown
+        """
+        return self.index["subjects"].get(str(user_id))
+
+    def _shard(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """Memory-map a shard's samples and labels.
+
+        Args:
+            name: Shard name
+
+        Returns:
+            Tuple of (samples, labels)
+        """
+        if name not in self._shards:
+            self._shards[name] = (
+                np.load(self.root / f"{name}.npy", mmap_mode="r"),
+                np.load(self.root / f"{name}.labels.npy", mmap_mode="r"),
+            )
+        return self._shards[name]
+
+    def user_ids(self) -> list[int]:
+        """Get the IDs of all subjects in the dataset."""
+        return sorted(int(user_id) for user_id in self.index["subjects"])
+
+    def has_subject(self, user_id: int) -> bool:
+        """Check whether a subject is present."""
+        return self._entry(user_id) is not None
+
+    def source_files(self, user_id: int) -> list[Path]:
+        """Get the shard files a subject is read from."""
+        entry = self._entry(user_id)
+        if entry is None:
+            return []
+        return [self.root / f"{entry['shard']}.npy", self.root / f"{entry['shard']}.labels.npy"]
+
+    def subject_info(self, user_id: int) -> SubjectInfo | None:
+        """Describe a subject from the dataset index."""
+        entry = self._entry(user_id)
+        if entry is None:
+            return None
+
+        return SubjectInfo(
+            user_id=user_id,
+            n_trials=len(entry["trial_lengths"]),
+            n_channels=self.index["n_channels"],
+            trial_lengths=tuple(entry["trial_lengths"]),
+            trial_offsets=tuple(entry["trial_offsets"]),
+            baseline_samples=self.index["baseline_samples"],
+            sampling_rate=self.index["sampling_rate"],
+        )
+
+    def load_subject(self, user_id: int, storage: str) -> dict | None:
+        """Load a subject as views into its memory-mapped shard."""
+        info = self.subject_info(user_id)
+        if info is None:
+            logger.error(f"User {user_id} not in sharded dataset {self.root}")
+            return None
+
+        entry = self._entry(user_id)
+        samples, labels = self._shard(entry["shard"])
+        label_rows = labels[entry["label_offset"] : entry["label_offset"] + info.n_trials]
+
+        if info.is_uniform and info.n_trials > 0:
+            # Consecutive equal-length trials form one (n_trials, n_channels, n_samples) view
+            start = info.trial_offsets[0]
+            length = info.trial_lengths[0]
+            block = samples[start : start + info.n_trials * length]
+            data = block.reshape(info.n_trials, length, info.n_channels).transpose(0, 2, 1)
+        else:
+            data = [
+                samples[offset : offset + length].T
+                for offset, length in zip(info.trial_offsets, info.trial_lengths, strict=True)
+            ]
+
+        return {"data": data, "labels": label_rows}
+
+
+def _write_shard(
+    root: Path,
+    shard: str,
+    subjects: list[tuple[int, list[np.ndarray], np.ndarray]],
+    n_channels: int,
+    dtype: str,
+) -> dict[str, dict]:
+    """Write one shard of subjects.
+
+    Args:
+        root: Dataset directory
+        shard: Shard name
+        subjects: List of (user_id, trials, labels)
+        n_channels: Channels per trial
+        dtype: Sample dtype
+
+    Returns:
+        Index entries of the written subjects by user ID string
+    """
+    entries = {}
+    offset = 0
+    label_offset = 0
+    for user_id, trials, labels in subjects:
+        lengths = [trial.shape[1] for trial in trials]
+        entries[str(user_id)] = {
+            "shard": shard,
+            "trial_lengths": lengths,
+            "trial_offsets": (offset + np.cumsum([0, *lengths[:-1]])).tolist() if lengths else [],
+            "label_offset": label_offset,
+        }
+        offset += sum(lengths)
+        label_offset += len(labels)
+
+    samples = np.lib.format.open_memmap(
+        root / f"{shard}.npy", mode="w+", dtype=dtype, shape=(offset, n_channels)
+    )
+    position = 0
+    for _, trials, _ in subjects:
+        for trial in trials:
+            samples[position : position + trial.shape[1]] = trial.T
+            position += trial.shape[1]
+    samples.flush()
+    del samples
+
+    np.save(root / f"{shard}.labels.npy", np.concatenate([labels for _, _, labels in subjects]))
+    return entries
+
+
+def write_sharded_dataset(
+    root: Path,
+    subjects: Iterable[tuple[int, list[np.ndarray], np.ndarray]],
+    sampling_rate: int,
+    *,
+    baseline_samples: int = 0,
+    subjects_per_shard: int = 16,
+    dtype: str = "float32",
+) -> int:
+    """Write subjects into the sharded dataset layout.
+
+    Only one shard worth of subjects is held in memory at a time.
+
+    Args:
+        root: Output directory
+        subjects: Iterable of (user_id, trials, labels), each trial of shape
+            (n_channels, n_samples) and labels of shape (n_trials, 4)
+        sampling_rate: Sampling rate in Hz
+        baseline_samples: Pre-trial baseline samples at the start of each trial
+        subjects_per_shard: Subjects stored per shard file
+        dtype: Sample dtype
+
+    Returns:
+        Number of subjects written
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    entries: dict[str, dict] = {}
+    n_channels: int | None = None
+    n_shards = 0
+    pending: list[tuple[int, list[np.ndarray], np.ndarray]] = []
+
+    for user_id, trials, labels in subjects:
+        channel_counts = {trial.shape[0] for trial in trials}
+        if n_channels is None and channel_counts:
+            n_channels = min(channel_counts)
+        if channel_counts - {n_channels}:
+            raise ValueError(f"User {user_id} has a different channel count than the dataset")
+        if len(labels) != len(trials):
+            raise ValueError(f"User {user_id} has {len(trials)} trials but {len(labels)} labels")
+
+        pending.append((user_id, trials, np.asarray(labels, dtype=np.float64).reshape(-1, 4)))
+        if len(pending) == subjects_per_shard:
+            entries.update(_write_shard(root, f"shard_{n_shards:04d}", pending, n_channels, dtype))
+            n_shards += 1
+            pending = []
+
+    if pending:
+        entries.update(_write_shard(root, f"shard_{n_shards:04d}", pending, n_channels or 0, dtype))
+
+    index = {
+        "format": "sharded-eeg",
+        "version": SHARDED_FORMAT_VERSION,
+        "sampling_rate": sampling_rate,
+        "baseline_samples": baseline_samples,
+        "n_channels": n_channels or 0,
+        "dtype": np.dtype(dtype).name,
+        "subjects": entries,
+    }
+    tmp_path = root / f".{SHARDED_INDEX_FILE}.{os.getpid()}.tmp"
+    tmp_path.write_text(json.dumps(index, indent=2))
+    os.replace(tmp_path, root / SHARDED_INDEX_FILE)
+
+    logger.info(f"Wrote {len(entries)} subjects to sharded dataset {root}")
+    return len(entries)
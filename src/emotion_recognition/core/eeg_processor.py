@@ -1,11 +1,41 @@
 """EEG data processing and management."""
 
-import pickle
+import contextlib
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, replace
+from pathlib import Path
 
 import numpy as np
 from loguru import logger
 
 from emotion_recognition.config import Settings
+from emotion_recognition.core.artifacts import ArtifactThresholds, artifact_masks, epoch_weights
+from emotion_recognition.core.baseline import baseline_correct
+from emotion_recognition.core.datasets import DatasetAdapter, DeapDataset, ShardedDataset
+from emotion_recognition.core.eeg_store import (
+    ChunkedSubjectStore,
+    MemmapSubjectStore,
+    QuantizedSubjectStore,
+)
+from emotion_recognition.core.epochs import epoch_count, epoch_view
+from emotion_recognition.core.feature_cache import FeatureCache
+from emotion_recognition.core.features import asymmetry_features
+from emotion_recognition.core.filters import FilterBank, decimate, decimated_length
+from emotion_recognition.core.manifest import DatasetManifest
+from emotion_recognition.core.spectral import (
+    EEG_BANDS,
+    FFTBackend,
+    band_power_features,
+    compute_spectrum,
+    select_fft_backend,
+)
+from emotion_recognition.core.spill import exceeds_budget, shared_array_dir, spill_array
+from emotion_recognition.core.subject_cache import SubjectCache
+from emotion_recognition.core.window_stats import PrefixStats
 from emotion_recognition.models.eeg import EEGData, EmotionLabel
 
 
@@ -35,10 +65,98 @@ class EEGProcessor:
             "F8": 20,
             "AF4": 17,
         }
+        # Channel-major layouts store the mapped channels in this order: the
+        # left hemisphere front to back, then the right hemisphere back to front
+        self._channel_order = list(self._channel_map)
+        self._channel_positions = {ch: pos for pos, ch in enumerate(self._channel_order)}
+        self._channel_groups = {
+            "all": self._channel_order,
+            "left": self._channel_order[:7],
+            "right": self._channel_order[7:],
+        }
+        # Symmetric pairs match the left group with the right group reversed
+        self._channel_pairs = list(
+            zip(self._channel_groups["left"], reversed(self._channel_groups["right"]), strict=True)
+        )
         self._active_channels = ["AF3", "F7", "F3", "FC5", "T7"]
+        self.dtype = np.dtype(settings.numeric_dtype)
+        self._subject_cache = SubjectCache(
+            max_entries=settings.max_cache_size,
+            max_bytes=settings.max_cache_memory_mb * 1024 * 1024,
+        )
+        self.feature_cache = FeatureCache(
+            settings.feature_cache_dir, max_bytes=settings.feature_cache_max_mb * 1024 * 1024
+        )
+        self.manifest = DatasetManifest(settings.raw_data_eeg_path)
+        self.dataset = self._create_dataset()
+        self._unusable_users: set[int] = set()
+        self._filter_banks: dict[tuple, FilterBank] = {}
+        self._fft_backend: FFTBackend | None = None
+        if settings.dataset_manifest != "off":
+            self.validate_dataset()
 
         logger.info("EEGProcessor initialized")
 
+    def _create_dataset(self) -> DatasetAdapter:
+        """Create the dataset adapter selected by the settings.
+
+        Returns:
+            Dataset adapter reading ``raw_data_eeg_path``
+        """
+        if self.settings.dataset_format == "sharded":
+            return ShardedDataset(self.settings.raw_data_eeg_path)
+
+        stores = {
+            "memmap": MemmapSubjectStore(self.settings.eeg_cache_dir),
+            "chunked": ChunkedSubjectStore(
+                self.settings.eeg_cache_dir,
+                codec=self.settings.eeg_store_codec,
+                n_threads=self.settings.eeg_io_threads,
+            ),
+            "quantized": QuantizedSubjectStore(self.settings.eeg_cache_dir, dtype=str(self.dtype)),
+        }
+        return DeapDataset(
+            self.settings.raw_data_eeg_path,
+            stores,
+            self.manifest,
+            n_trials=self.settings.n_trial_total,
+            n_samples=self.settings.n_time_total,
+        )
+
+    def validate_dataset(self) -> dict[int, str]:
+        """Check the subject files against the dataset manifest.
+
+        Costs one ``stat`` per subject. Missing or resized files are excluded
+        from batch processing; files that were only touched are reported. With
+        ``dataset_manifest='generate'`` a missing manifest is built first.
+
+        Returns:
+            Dictionary of user ID to problem for subjects that do not match
+        """
+        if not isinstance(self.dataset, DeapDataset):
+            return {}
+
+        if not self.manifest.exists():
+            if (
+                self.settings.dataset_manifest == "generate"
+                and self.settings.raw_data_eeg_path.is_dir()
+            ):
+                self.manifest.generate()
+            else:
+                logger.info(f"No dataset manifest in {self.settings.raw_data_eeg_path}")
+                return {}
+
+        problems = self.manifest.validate()
+        self._unusable_users = {
+            user_id for user_id, problem in problems.items() if problem in ("missing", "size")
+        }
+        for user_id, problem in problems.items():
+            if user_id in self._unusable_users:
+                logger.error(f"Subject {user_id} does not match the dataset manifest: {problem}")
+            else:
+                logger.warning(f"Subject {user_id} changed since the manifest was generated")
+        return problems
+
     @property
     def channel_map(self) -> dict[str, int]:
         """Get channel name to index mapping."""
@@ -62,63 +180,536 @@ class EEGProcessor:
         self._active_channels = channels
         logger.info(f"Active channels set to: {channels}")
 
-    def load_user_data(self, user_id: int) -> dict | None:
-        """Load EEG data for a specific user from DEAP dataset.
+    @property
+    def channel_order(self) -> list[str]:
+        """Get channel names in channel-major layout order."""
+        return self._channel_order.copy()
+
+    @property
+    def channel_groups(self) -> dict[str, list[str]]:
+        """Get named channel groups."""
+        return {name: channels.copy() for name, channels in self._channel_groups.items()}
+
+    @property
+    def channel_pairs(self) -> list[tuple[str, str]]:
+        """Get the symmetric (left, right) channel pairs."""
+        return self._channel_pairs.copy()
+
+    def channel_selector(self, channels: str | list[str] | None = None) -> slice | list[int]:
+        """Get the channel-major index selecting a channel group.
+
+        Channels that are consecutive in layout order, forwards or backwards,
+        map to a slice, so indexing with it returns a view instead of a copy.
+
+        Args:
+            channels: Group name or channel names (uses active channels if None)
+
+        Returns:
+            Slice for consecutive channels, otherwise a list of positions
+        """
+        if channels is None:
+            channels = self._active_channels
+        elif isinstance(channels, str):
+            channels = self._channel_groups[channels]
+
+        positions = [self._channel_positions[ch] for ch in channels]
+        if len(positions) == 1:
+            return slice(positions[0], positions[0] + 1)
+
+        step = positions[1] - positions[0]
+        if step in (1, -1) and np.all(np.diff(positions) == step):
+            stop = positions[-1] + step
+            return slice(positions[0], stop if stop >= 0 else None, step)
+        return positions
+
+    def channel_group_view(
+        self, data: np.ndarray, channels: str | list[str] | None = None
+    ) -> np.ndarray:
+        """Select a channel group from channel-major data.
+
+        Args:
+            data: Channel-major array with channels on the second to last axis
+            channels: Group name or channel names (uses active channels if None)
+
+        Returns:
+            View of the selected channels when they are consecutive, else a copy
+        """
+        return data[..., self.channel_selector(channels), :]
+
+    def filter_bank(
+        self, sampling_rate: int, bands: dict[str, tuple[float, float]] | None = None
+    ) -> FilterBank:
+        """Get an IIR filter bank, designed once per sampling rate and bands.
+
+        Args:
+            sampling_rate: Sampling rate in Hz
+            bands: Band name to (low, high) cutoffs in Hz (EEG_BANDS if None)
+
+        Returns:
+            Filter bank for offline use or, through ``stream()``, chunked input
+        """
+        if bands is None:
+            bands = EEG_BANDS
+        key = (sampling_rate, self.settings.filter_order, tuple(bands.items()))
+        if key not in self._filter_banks:
+            self._filter_banks[key] = FilterBank(bands, sampling_rate, self.settings.filter_order)
+        return self._filter_banks[key]
+
+    @property
+    def fft_backend(self) -> FFTBackend:
+        """Get the configured FFT backend, benchmarked on first use for 'auto'."""
+        if self._fft_backend is None:
+            self._fft_backend = select_fft_backend(
+                self.settings.fft_backend,
+                self.settings.fft_workers,
+                pad_fast=self.settings.fft_pad_fast,
+            )
+        return self._fft_backend
+
+    def pool_fft_backend(self, n_workers: int) -> FFTBackend:
+        """Get the FFT backend for each of a pool of worker processes.
+
+        The backend is resolved (and benchmarked for 'auto') once here, and
+        the FFT threads are split between the processes so the pool does not
+        run more FFT threads than there are CPUs.
+
+        Args:
+            n_workers: Number of worker processes
+
+        Returns:
+            FFT backend with at most cpu_count // n_workers threads
+        """
+        threads = max(1, (os.cpu_count() or 1) // n_workers)
+        if self.fft_backend.workers > 0:
+            threads = min(threads, self.fft_backend.workers)
+        return replace(self.fft_backend, workers=threads)
+
+    def prefilter(self, sampling_rate: int) -> FilterBank | None:
+        """Get the configured pre-filter applied before feature extraction.
 
         Args:
-            user_id: User ID (1-32)
+            sampling_rate: Sampling rate in Hz
 
         Returns:
-            Dictionary with 'data' and 'labels' keys, or None if load fails
+            Single-band filter bank, or None if filtering is off
         """
-        if not 1 <= user_id <= 32:
-            logger.error(f"Invalid user_id: {user_id}. Must be between 1 and 32")
+        low, high = self.settings.filter_low_hz, self.settings.filter_high_hz
+        if low <= 0 and high <= 0:
             return None
+        return self.filter_bank(sampling_rate, {"prefilter": (low, high)})
 
-        filename = self.settings.raw_data_eeg_path / f"s{user_id:02d}.dat"
+    @property
+    def artifact_thresholds(self) -> ArtifactThresholds:
+        """Get the configured artifact limits."""
+        return ArtifactThresholds(
+            max_abs=self.settings.artifact_max_abs_uv,
+            max_ptp=self.settings.artifact_max_ptp_uv,
+            min_ptp=self.settings.artifact_flat_uv,
+            max_hf_ratio=self.settings.artifact_hf_ratio,
+            hf_low=self.settings.artifact_hf_hz,
+        )
+
+    def artifact_mask(self, epochs: np.ndarray, sampling_rate: int) -> np.ndarray:
+        """Flag channels of epochs that fail any configured artifact check.
+
+        Args:
+            epochs: Epoch samples of shape (..., n_channels, n_samples)
+            sampling_rate: Sampling rate in Hz
+
+        Returns:
+            Boolean mask of shape (..., n_channels), True where contaminated
+        """
+        segment = round(self.settings.welch_segment_seconds * sampling_rate)
+        masks = artifact_masks(
+            epochs, sampling_rate, self.artifact_thresholds, segment, backend=self.fft_backend
+        )
+        flagged = np.zeros(epochs.shape[:-1], dtype=bool)
+        for mask in masks.values():
+            flagged |= mask
+        return flagged
+
+    def _active_window(
+        self,
+        data: np.ndarray,
+        time_range: tuple[int, int],
+        sampling_rate: int,
+        *,
+        baseline_samples: int = 0,
+    ) -> np.ndarray:
+        """Get the feature channels of channel-major trials over a time range.
+
+        These are the active channels, or all mapped channels in
+        'de_asymmetry' mode, which needs both channels of every symmetric
+        pair. Without a pre-filter or baseline correction this is a view of
+        the data. With a pre-filter, the trials are filtered from their first
+        sample, so the filter has settled by the start of the window, and the
+        window is cut from the output. With baseline correction, every
+        channel of every trial is corrected by its (filtered) pre-trial
+        segment in one broadcast operation.
+
+        Args:
+            data: Channel-major array of shape (..., n_channels, n_samples)
+            time_range: Tuple of (start_time, end_time)
+            sampling_rate: Sampling rate in Hz
+            baseline_samples: Pre-trial baseline samples at the start of each trial
+
+        Returns:
+            Array of shape (..., n_feature_channels, end_time - start_time)
+
+        Raises:
+            ValueError: If baseline correction is on and the time range ends
+                inside the baseline, which would leave a truncated baseline
+        """
+        start_time, end_time = time_range
+        mode = self.settings.baseline_correction
+        correct = mode != "off" and baseline_samples > 0
+        if correct and end_time < baseline_samples:
+            raise ValueError(
+                f"Time range ends at sample {end_time}, inside the "
+                f"{baseline_samples}-sample baseline"
+            )
+
+        channels = "all" if self.settings.feature_mode == "de_asymmetry" else None
+        trials = self.channel_group_view(data[..., :end_time], channels)
+        bank = self.prefilter(sampling_rate)
+        if bank is not None:
+            trials = bank.apply(trials)[0][0]
+
+        window = trials[..., start_time:]
+        if not correct:
+            return window
+        return baseline_correct(window, trials[..., :baseline_samples], mode)
+
+    def load_playback_data(self, user_id: int) -> dict | None:
+        """Load a subject for playback, baseline-corrected with the configured mode.
+
+        All trials are corrected by their pre-trial segments in one broadcast
+        operation (one per trial for ragged subjects) into a new array, so
+        the shared cached subject is left untouched and playback ticks only
+        slice the result. Trials keep their length, so playback offsets are
+        unchanged. Subjects with trials no longer than the baseline are
+        played uncorrected.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Subject data dictionary, or None if loading fails
+        """
+        user_data = self.load_user_data(user_id)
+        mode = self.settings.baseline_correction
+        info = self.dataset.subject_info(user_id)
+        if user_data is None or mode == "off" or info is None or info.baseline_samples <= 0:
+            return user_data
+
+        baseline = info.baseline_samples
+        trials = user_data["data"]
+        if min(trial.shape[-1] for trial in trials) <= baseline:
+            logger.warning(
+                f"User {user_id} has trials no longer than the {baseline}-sample baseline, "
+                "playing them uncorrected"
+            )
+            return user_data
 
-        if not filename.exists():
-            logger.error(f"Data file not found: {filename}")
+        if isinstance(trials, list):
+            corrected = [baseline_correct(trial, trial[:, :baseline], mode) for trial in trials]
+        else:
+            corrected = baseline_correct(trials, trials[..., :baseline], mode)
+        return {**user_data, "data": corrected}
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Get subject cache hit/miss/eviction statistics."""
+        return self._subject_cache.stats()
+
+    def clear_cache(self) -> None:
+        """Drop all cached subjects."""
+        self._subject_cache.clear()
+        logger.info("Subject cache cleared")
+
+    def load_user_data(self, user_id: int, storage: str | None = None) -> dict | None:
+        """Load EEG data for a specific user through the dataset adapter.
+
+        With the 'memmap', 'chunked' or 'quantized' storage backend DEAP
+        subjects are converted from their pickle on first use and read from
+        the converted files after that. Loaded subjects are kept in a bounded LRU cache, so
+        the returned arrays are shared between callers and must not be
+        modified in place. Data is converted to the configured numeric dtype,
+        except memory-mapped data, which keeps the dtype it was stored with.
+
+        Args:
+            user_id: User ID
+            storage: 'pickle', 'memmap', 'chunked' or 'quantized' (uses settings
+                if None)
+
+        Returns:
+            Dictionary with 'labels' and 'data' keys, where 'data' is an
+            (n_trials, n_channels, n_samples) array, or a list of per-trial
+            (n_channels, n_samples) arrays for variable-length trials; None if
+            load fails
+        """
+        if not self.dataset.has_subject(user_id):
+            logger.error(f"User {user_id} not found in {self.settings.raw_data_eeg_path}")
             return None
 
+        if storage is None:
+            storage = self.settings.eeg_storage
+
+        cache_key = (user_id, storage)
+        cached = self._subject_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            with open(filename, "rb") as f:
-                data = pickle.load(f, encoding="latin1")
+            data = self.dataset.load_subject(user_id, storage)
+            if data is None:
+                return None
 
-            logger.info(f"Loaded data for user {user_id} from {filename}")
+            data["data"] = self._as_dtype(data["data"])
+            self._subject_cache.put(cache_key, data)
+
+            logger.info(f"Loaded data for user {user_id} ({self.dataset.name}, {storage})")
             return data
 
         except Exception as e:
             logger.error(f"Error loading data for user {user_id}: {e}")
             return None
 
+    def _as_dtype(self, data: np.ndarray | list[np.ndarray]) -> np.ndarray | list[np.ndarray]:
+        """Convert subject data to the configured dtype, leaving memmaps on disk.
+
+        Args:
+            data: Subject array or list of per-trial arrays
+
+        Returns:
+            Data in the configured dtype (memory-mapped arrays unchanged)
+        """
+        if isinstance(data, list):
+            return [self._as_dtype(trial) for trial in data]
+        if isinstance(data, np.memmap):
+            return data
+        return np.asarray(data, dtype=self.dtype)
+
+    def convert_user_data(self, user_id: int, storage: str | None = None) -> bool:
+        """Convert a user's DEAP pickle into a binary storage backend.
+
+        Args:
+            user_id: User ID
+            storage: 'memmap', 'chunked' or 'quantized' (uses settings if None)
+
+        Returns:
+            True if conversion successful, False otherwise
+        """
+        if not isinstance(self.dataset, DeapDataset):
+            logger.error(f"{self.dataset.name} datasets do not need conversion")
+            return False
+
+        if not self.dataset.has_subject(user_id):
+            logger.error(f"Data file not found: {self.dataset.subject_path(user_id)}")
+            return False
+
+        if storage is None:
+            storage = self.settings.eeg_storage
+        if storage not in self.dataset.stores:
+            logger.error(f"Storage backend '{storage}' does not need conversion")
+            return False
+
+        return self.dataset.convert(user_id, storage)
+
+    def load_channel_major(self, user_id: int, storage: str | None = None) -> dict | None:
+        """Load a subject with its mapped channels reordered into layout order.
+
+        The layout holds only the channels of the channel map, contiguous in
+        ``channel_order``, so any consecutive channel group (including the
+        default active channels) is a zero-copy slice of it. Layouts are kept
+        in the subject cache next to the raw subjects and are read-only.
+
+        Args:
+            user_id: User ID
+            storage: 'pickle', 'memmap', 'chunked' or 'quantized' (uses settings
+                if None)
+
+        Returns:
+            Dictionary with 'data' of shape (n_trials, n_mapped_channels,
+            n_samples), or a list of per-trial (n_mapped_channels, n_samples)
+            arrays for variable-length trials, and 'labels' keys; None if load
+            fails
+        """
+        if storage is None:
+            storage = self.settings.eeg_storage
+
+        cache_key = (user_id, storage, "channel_major")
+        cached = self._subject_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user_data = self.load_user_data(user_id, storage)
+        if user_data is None:
+            return None
+
+        indices = [self._channel_map[ch] for ch in self._channel_order]
+        if isinstance(user_data["data"], list):
+            layout = [
+                np.ascontiguousarray(trial[indices], dtype=self.dtype)
+                for trial in user_data["data"]
+            ]
+            for trial in layout:
+                trial.setflags(write=False)
+        else:
+            layout = np.ascontiguousarray(user_data["data"][:, indices, :], dtype=self.dtype)
+            layout.setflags(write=False)
+
+        channel_major = {"data": layout, "labels": user_data["labels"]}
+        self._subject_cache.put(cache_key, channel_major)
+        return channel_major
+
+    def window_stats(self, user_id: int, storage: str | None = None) -> PrefixStats | None:
+        """Get the prefix-sum index of a subject's mapped channels.
+
+        The index is built once from the channel-major layout and kept in the
+        subject cache, so sweeping time ranges reads mean, variance, energy
+        and RMS of every trial and channel in constant time per window
+        instead of re-reducing the samples.
+
+        Args:
+            user_id: User ID
+            storage: 'pickle', 'memmap', 'chunked' or 'quantized' (uses settings
+                if None)
+
+        Returns:
+            Index over (n_trials, n_mapped_channels) signals in
+            ``channel_order``, or None if load fails or trial lengths differ
+        """
+        if storage is None:
+            storage = self.settings.eeg_storage
+
+        cache_key = (user_id, storage, "prefix_stats")
+        cached = self._subject_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user_data = self.load_channel_major(user_id, storage)
+        if user_data is None:
+            return None
+        if isinstance(user_data["data"], list):
+            logger.error(f"Window statistics need equal-length trials (user {user_id})")
+            return None
+
+        stats = PrefixStats(user_data["data"])
+        self._subject_cache.put(cache_key, stats)
+        return stats
+
+    def get_trial(
+        self,
+        user_id: int,
+        trial_id: int,
+        channels: list[str] | None = None,
+        time_range: tuple[int, int] | None = None,
+        storage: str | None = None,
+    ) -> EEGData | None:
+        """Read a single trial without decoding the whole subject.
+
+        The 'chunked' backend decompresses only the chunks holding the
+        requested channels of this trial, the 'quantized' backend dequantizes
+        only the requested rows, and the 'memmap' backend and sharded
+        datasets only fault in the pages of the requested rows. The 'pickle'
+        backend has no random access and falls back to the cached full subject.
+
+        Args:
+            user_id: User ID
+            trial_id: Trial ID (1-based, up to the subject's trial count)
+            channels: Channel names in output order (all channels if None)
+            time_range: Tuple of (start_time, end_time) (all samples if None)
+            storage: 'pickle', 'memmap', 'chunked' or 'quantized' (uses settings
+                if None)
+
+        Returns:
+            EEGData object or None if the read fails
+        """
+        info = self.dataset.subject_info(user_id)
+        if info is None:
+            logger.error(f"User {user_id} not found in {self.settings.raw_data_eeg_path}")
+            return None
+        if not 1 <= trial_id <= info.n_trials:
+            logger.error(f"Invalid trial_id: {trial_id}. Must be between 1 and {info.n_trials}")
+            return None
+
+        if storage is None:
+            storage = self.settings.eeg_storage
+
+        try:
+            channel_indices = (
+                None if channels is None else [self._channel_map[ch] for ch in channels]
+            )
+            trial_idx = trial_id - 1
+            start, end = (0, None) if time_range is None else time_range
+
+            if storage in ("chunked", "quantized") and isinstance(self.dataset, DeapDataset):
+                self.dataset.ensure_converted(user_id, storage)
+                store = self.dataset.stores[storage]
+                eeg_array = store.read(user_id, [trial_idx], channel_indices, time_range)[0]
+                labels = store.read_labels(user_id)[trial_idx]
+            else:
+                user_data = self.load_user_data(user_id, storage)
+                if user_data is None:
+                    return None
+
+                # Slice samples first so channel selection only copies what was asked for
+                eeg_array = user_data["data"][trial_idx][:, start:end]
+                if channel_indices is not None:
+                    eeg_array = eeg_array[channel_indices]
+                labels = user_data["labels"][trial_idx]
+
+            return EEGData(
+                data=np.asarray(eeg_array, dtype=self.dtype),
+                label=self._make_label(labels),
+                user_id=user_id,
+                trial_id=trial_id,
+            )
+
+        except Exception as e:
+            logger.error(f"Error reading trial {trial_id} for user {user_id}: {e}")
+            return None
+
+    def _make_label(self, labels: np.ndarray) -> EmotionLabel:
+        """Create an emotion label from a DEAP label row.
+
+        Args:
+            labels: Array of (valence, arousal, dominance, liking)
+
+        Returns:
+            EmotionLabel object
+        """
+        return EmotionLabel(
+            valence=float(labels[0]),
+            arousal=float(labels[1]),
+            dominance=float(labels[2]),
+            liking=float(labels[3]),
+        )
+
     def extract_trial_data(self, user_data: dict, trial_id: int, user_id: int) -> EEGData | None:
         """Extract EEG data for a specific trial.
 
         Args:
-            user_data: User data dictionary from DEAP
-            trial_id: Trial ID (1-40)
+            user_data: User data dictionary from load_user_data
+            trial_id: Trial ID (1-based, up to the subject's trial count)
             user_id: User ID (for metadata)
 
         Returns:
             EEGData object or None if extraction fails
         """
-        if not 1 <= trial_id <= 40:
-            logger.error(f"Invalid trial_id: {trial_id}. Must be between 1 and 40")
+        n_trials = len(user_data["data"])
+        if not 1 <= trial_id <= n_trials:
+            logger.error(f"Invalid trial_id: {trial_id}. Must be between 1 and {n_trials}")
             return None
 
         try:
             trial_idx = trial_id - 1  # Convert to 0-based index
-            eeg_array = user_data["data"][trial_idx]  # Shape: (40, 8064)
+            eeg_array = user_data["data"][trial_idx]  # Shape: (n_channels, n_samples)
             labels = user_data["labels"][trial_idx]  # Shape: (4,)
 
             # Create emotion label
-            emotion_label = EmotionLabel(
-                valence=float(labels[0]),
-                arousal=float(labels[1]),
-                dominance=float(labels[2]),
-                liking=float(labels[3]),
-            )
+            emotion_label = self._make_label(labels)
 
             # Create EEG data object
             return EEGData(data=eeg_array, label=emotion_label, user_id=user_id, trial_id=trial_id)
@@ -128,13 +719,19 @@ class EEGProcessor:
             return None
 
     def get_channel_data(
-        self, eeg_data: EEGData, channel_names: list[str] | None = None
+        self,
+        eeg_data: EEGData,
+        channel_names: list[str] | None = None,
+        *,
+        channel_major: bool = False,
     ) -> np.ndarray:
         """Extract specific channels from EEG data.
 
         Args:
             eeg_data: EEG data object
             channel_names: List of channel names (uses active channels if None)
+            channel_major: The trial comes from ``load_channel_major`` rather
+                than holding the dataset's raw channel rows
 
         Returns:
             EEG data for selected channels
@@ -144,6 +741,9 @@ class EEGProcessor:
 
         # Get channel indices
         try:
+            if channel_major:
+                # Channel-major trial: consecutive channels come back as a view
+                return eeg_data.data[self.channel_selector(channel_names), :]
             indices = [self._channel_map[ch] for ch in channel_names]
             return eeg_data.data[indices, :]
         except KeyError as e:
@@ -154,24 +754,27 @@ class EEGProcessor:
         self,
         data: np.ndarray,
         sampling_rate: int = 60,
+        *,
+        window: str | None = None,
+        db: bool = True,
     ) -> tuple[np.ndarray, np.ndarray]:
-        """Compute FFT of EEG signal.
+        """Compute FFT of EEG signals.
+
+        All rows are transformed in one call along the last axis, so a single
+        channel, a multi-channel window or an (n_channels, n_windows,
+        n_samples) stack of windows can be passed at once.
 
         Args:
-            data: EEG signal data (1D array)
+            data: EEG signal data of shape (..., n_samples)
             sampling_rate: Sampling rate in Hz
+            window: Window function applied before the FFT (None for rectangular)
+            db: Return amplitudes in dB
 
         Returns:
-            Tuple of (frequencies, amplitudes)
+            Tuple of (frequencies, amplitudes), with amplitudes of shape
+            (..., n_samples // 2 + 1)
         """
-        # Compute FFT
-        fft_values = np.abs(np.fft.rfft(data))
-        fft_freq = np.fft.rfftfreq(len(data), 1.0 / sampling_rate)
-
-        # Convert to dB scale
-        fft_db = 20 * np.log10(fft_values + 1e-10)  # Add small value to avoid log(0)
-
-        return fft_freq, fft_db
+        return compute_spectrum(data, sampling_rate, window=window, db=db, backend=self.fft_backend)
 
     def extract_time_window(
         self,
@@ -192,66 +795,760 @@ class EEGProcessor:
         end_idx = min(start_idx + window_size, eeg_data.data.shape[1])
         return eeg_data.data[:, start_idx:end_idx]
 
+    def _fill_user_rows(
+        self,
+        user_id: int,
+        trial_range: tuple[int, int],
+        time_range: tuple[int, int],
+        out: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+        """Write one user's flattened trial epochs into preallocated output rows.
+
+        Args:
+            user_id: User ID
+            trial_range: Tuple of (start_trial, end_trial) inclusive, within
+                the subject's trials
+            time_range: Tuple of (start_time, end_time)
+            out: Output rows for this user, shape (n_trials * n_epochs, n_features)
+
+        Returns:
+            Tuple of per-row (valid_mask, valence_labels, arousal_labels,
+            sample_weights), with each trial's labels repeated for its epochs,
+            or None if the user could not be loaded. Epochs of trials shorter
+            than the time range and epochs of zero weight are marked invalid.
+        """
+        user_data = self.load_channel_major(user_id)
+        info = self.dataset.subject_info(user_id)
+        if user_data is None or info is None:
+            return None
+
+        first, last = trial_range
+        end_time = time_range[1]
+        length, hop, n_epochs = self._epoch_layout(time_range, info.sampling_rate)
+        layout = user_data["data"]
+        n_trials = last - first + 1
+        valid = np.zeros(n_trials, dtype=bool)
+        weights = np.ones(n_trials * n_epochs)
+
+        try:
+            if isinstance(layout, list):
+                for row, trial in enumerate(layout[first - 1 : last]):
+                    if trial.shape[1] < end_time:
+                        continue
+                    window = self._active_window(
+                        trial,
+                        time_range,
+                        info.sampling_rate,
+                        baseline_samples=info.baseline_samples,
+                    )
+                    rows = slice(row * n_epochs, (row + 1) * n_epochs)
+                    row_weights = self._write_features(
+                        out[rows], window, info.sampling_rate, (length, hop)
+                    )
+                    if row_weights is not None:
+                        weights[rows] = row_weights
+                    valid[row] = True
+            else:
+                # Active channels are a slice of the channel-major layout and
+                # epochs are strided views of it, so unfiltered raw rows are
+                # copied straight from the cached subject
+                window = self._active_window(
+                    layout[first - 1 : last],
+                    time_range,
+                    info.sampling_rate,
+                    baseline_samples=info.baseline_samples,
+                )
+                row_weights = self._write_features(out, window, info.sampling_rate, (length, hop))
+                if row_weights is not None:
+                    weights[:] = row_weights
+                valid[:] = True
+        except ValueError as e:
+            logger.error(f"Error processing trials for user {user_id}: {e}")
+            valid[:] = False
+
+        rejected = weights == 0
+        if rejected.any():
+            logger.info(f"Dropped {rejected.sum()} artifact epochs of user {user_id}")
+
+        labels = np.repeat(np.asarray(user_data["labels"][first - 1 : last]), n_epochs, axis=0)
+        return (
+            np.repeat(valid, n_epochs) & ~rejected,
+            labels[:, 0].astype(float),
+            labels[:, 1].astype(float),
+            weights,
+        )
+
+    def _epoch_layout(
+        self, time_range: tuple[int, int], sampling_rate: int
+    ) -> tuple[int, int, int]:
+        """Get the epochs a trial window is split into.
+
+        Without epoching (``epoch_seconds`` of 0) the whole window is a
+        single epoch. Without a hop (``epoch_hop_seconds`` of 0) epochs do
+        not overlap.
+
+        Args:
+            time_range: Tuple of (start_time, end_time)
+            sampling_rate: Sampling rate in Hz
+
+        Returns:
+            Tuple of (epoch_length, hop, n_epochs) in samples
+        """
+        n_samples = max(time_range[1] - time_range[0], 0)
+        if self.settings.epoch_seconds <= 0:
+            return n_samples, 1, int(n_samples > 0)
+
+        length = round(self.settings.epoch_seconds * sampling_rate)
+        hop_seconds = self.settings.epoch_hop_seconds or self.settings.epoch_seconds
+        hop = max(round(hop_seconds * sampling_rate), 1)
+        return length, hop, epoch_count(n_samples, length, hop)
+
+    def _n_features(self, epoch_length: int) -> int:
+        """Get the feature count of one epoch under the configured feature mode.
+
+        Args:
+            epoch_length: Epoch length in samples
+
+        Returns:
+            Number of features per epoch (0 for an empty epoch)
+        """
+        if not epoch_length:
+            return 0
+        if self.settings.feature_mode == "band_power":
+            return len(self._active_channels) * len(EEG_BANDS)
+        if self.settings.feature_mode == "de_asymmetry":
+            return (len(self._channel_order) + len(self._channel_pairs)) * len(EEG_BANDS)
+        return len(self._active_channels) * decimated_length(
+            epoch_length, self.settings.decimation_factor
+        )
+
+    def _write_features(
+        self,
+        out: np.ndarray,
+        window: np.ndarray,
+        sampling_rate: int,
+        epochs: tuple[int, int],
+    ) -> np.ndarray | None:
+        """Write the features of trial windows into output rows, one per epoch.
+
+        Epochs are strided views of the window, so nothing is copied before
+        the features are written. In 'band_power' mode every channel of every
+        epoch contributes its Welch log band powers, and in 'de_asymmetry'
+        mode the band differential entropy of every mapped channel followed
+        by the DASM of every symmetric pair; each is computed for all
+        epochs in one batched call. In 'raw' mode the samples are copied,
+        decimated by ``decimation_factor`` in one polyphase pass over all
+        trials, channels and epochs.
+
+        With artifact rejection on, all epochs are screened and weighted; the
+        signal itself is never altered. In 'drop' mode epochs with an artifact
+        in any feature channel weigh 0, so the caller leaves their rows out,
+        and in 'weight' mode the weight falls with the share of flagged
+        channels, down to ``artifact_weight``.
+
+        Args:
+            out: Output rows, shape (n_trials * n_epochs, n_features)
+            window: Feature channel samples, shape (..., n_channels, n_samples)
+            sampling_rate: Sampling rate of the samples in Hz
+            epochs: Tuple of (epoch_length, hop) in samples
+
+        Returns:
+            Sample weight of every row, or None with artifact rejection off
+        """
+        features = epoch_view(window, *epochs)
+        weights = None
+        if self.settings.artifact_rejection != "off":
+            flagged = self.artifact_mask(features, sampling_rate)
+            if self.settings.artifact_rejection == "weight":
+                weights = epoch_weights(flagged, self.settings.artifact_weight).reshape(-1)
+            else:
+                weights = (~flagged.any(axis=-1)).reshape(-1).astype(float)
+
+        segment = round(self.settings.welch_segment_seconds * sampling_rate)
+        if self.settings.feature_mode == "band_power":
+            features = band_power_features(
+                features, sampling_rate, segment, backend=self.fft_backend
+            )
+        elif self.settings.feature_mode == "de_asymmetry":
+            left, right = zip(*self._channel_pairs, strict=True)
+            pairs = (self.channel_selector(list(left)), self.channel_selector(list(right)))
+            features = asymmetry_features(
+                features, sampling_rate, segment, pairs, backend=self.fft_backend
+            )
+        else:
+            features = decimate(features, self.settings.decimation_factor)
+        out.reshape(features.shape)[...] = features
+        return weights
+
+    def _available_users(self, user_range: tuple[int, int]) -> list[int]:
+        """Get users in a range that are present in the dataset.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+
+        Returns:
+            List of user IDs
+        """
+        user_ids = []
+        for user_id in range(user_range[0], user_range[1] + 1):
+            if user_id in self._unusable_users:
+                logger.warning(f"Skipping user {user_id} (fails dataset manifest check)")
+            elif self.dataset.has_subject(user_id):
+                user_ids.append(user_id)
+            else:
+                logger.warning(f"Skipping user {user_id}")
+        return user_ids
+
+    def _batch_layout(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+    ) -> tuple[list[tuple[int, int, int]], tuple[int, int], tuple[int, int]]:
+        """Resolve which trials and samples a batch covers from subject metadata.
+
+        Without a trial range all trials of each subject are used. Without a
+        time range the window runs from the end of the pre-trial baseline to
+        the end of the shortest trial, so every trial yields a full row; an
+        explicit end is clipped to the longest trial.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive, or None
+            time_range: Tuple of (start_time, end_time), or None
+
+        Returns:
+            Tuple of (per-user (user_id, first_trial, last_trial), resolved
+            trial_range, resolved time_range)
+        """
+        infos = [
+            info
+            for user_id in self._available_users(user_range)
+            if (info := self.dataset.subject_info(user_id)) is not None
+        ]
+
+        if trial_range is None:
+            trial_range = (1, max((info.n_trials for info in infos), default=0))
+        if time_range is None:
+            time_range = (
+                max((info.baseline_samples for info in infos), default=0),
+                min((info.min_trial_length for info in infos), default=0),
+            )
+        else:
+            longest = max((max(info.trial_lengths, default=0) for info in infos), default=0)
+            time_range = (time_range[0], min(time_range[1], longest))
+
+        subjects = []
+        for info in infos:
+            first = max(trial_range[0], 1)
+            last = min(trial_range[1], info.n_trials)
+            if first <= last:
+                subjects.append((info.user_id, first, last))
+            else:
+                logger.warning(f"User {info.user_id} has no trials in {trial_range}")
+
+        return subjects, trial_range, time_range
+
+    def _batch_rows(
+        self, subjects: list[tuple[int, int, int]], time_range: tuple[int, int]
+    ) -> tuple[list[int], int]:
+        """Count the output rows of each subject of a batch.
+
+        Args:
+            subjects: Tuples of (user_id, first_trial, last_trial)
+            time_range: Tuple of (start_time, end_time)
+
+        Returns:
+            Tuple of (rows per subject, epoch length in samples)
+        """
+        counts = []
+        epoch_length = 0
+        for user_id, first, last in subjects:
+            info = self.dataset.subject_info(user_id)
+            sampling_rate = info.sampling_rate if info is not None else 0
+            epoch_length, _, n_epochs = self._epoch_layout(time_range, sampling_rate)
+            counts.append((last - first + 1) * n_epochs)
+        return counts, epoch_length
+
+    def plan_batch(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+    ) -> dict[str, int]:
+        """Estimate the output of a batch from dataset metadata without reading payloads.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive (all trials if None)
+            time_range: Tuple of (start_time, end_time) (post-baseline samples if None)
+
+        Returns:
+            Dictionary with 'n_users', 'n_rows', 'n_features' and 'nbytes'
+        """
+        subjects, _, time_range = self._batch_layout(user_range, trial_range, time_range)
+        counts, epoch_length = self._batch_rows(subjects, time_range)
+        n_rows = sum(counts)
+        n_features = self._n_features(epoch_length)
+        return {
+            "n_users": len(subjects),
+            "n_rows": n_rows,
+            "n_features": n_features,
+            "nbytes": n_rows * n_features * self.dtype.itemsize,
+        }
+
     def process_raw_data_batch(
         self,
         user_range: tuple[int, int],
-        trial_range: tuple[int, int] = (1, 40),
-        time_range: tuple[int, int] = (384, 8064),
-    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+        n_workers: int | None = None,
+        *,
+        with_weights: bool = False,
+    ) -> tuple[np.ndarray, ...]:
         """Process batch of raw EEG data.
 
+        Trials are written straight into one preallocated output array, sized
+        from the dataset metadata. With more than one worker, users are fanned
+        out to a process pool and each worker writes its rows into a shared
+        memory-mapped output, so row order is the same as in the serial path.
+        The shared output lives in /dev/shm only if it fits the free space
+        there, and a dead worker yields the same empty result as no data.
+        When the output would exceed the ``feature_memory_budget_mb`` setting
+        it is allocated as a disk-backed memmap in ``spill_dir`` and returned
+        as such. With the 'band_power' feature mode each row holds the Welch
+        log band powers of every active channel instead of its raw samples.
+        With ``epoch_seconds`` set, every trial is split into overlapping
+        epochs that each become a row labelled with the trial's labels.
+        With ``artifact_rejection`` set to 'drop', epochs with an artifact in
+        any feature channel are left out; set to 'weight', they are kept with
+        a sample weight below 1.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive (all trials if None)
+            time_range: Tuple of (start_time, end_time) (post-baseline samples if None)
+            n_workers: Worker processes (uses settings if None, 0 for all CPUs)
+            with_weights: Also return the sample weight of every row
+
+        Returns:
+            Tuple of (data_array, valence_labels, arousal_labels), followed by
+            the sample weights if ``with_weights``
+        """
+        if n_workers is None:
+            n_workers = self.settings.eeg_workers
+        if n_workers == 0:
+            n_workers = os.cpu_count() or 1
+
+        subjects, trial_range, time_range = self._batch_layout(user_range, trial_range, time_range)
+        logger.info(
+            f"Processing batch: users {user_range[0]}-{user_range[1]}, "
+            f"trials {trial_range[0]}-{trial_range[1]}"
+        )
+
+        counts, epoch_length = self._batch_rows(subjects, time_range)
+        offsets = np.cumsum([0, *counts]).tolist()
+        n_features = self._n_features(epoch_length)
+        shape = (offsets[-1], n_features)
+
+        empty = (np.array([]),) * (4 if with_weights else 3)
+        if shape[0] == 0 or n_features == 0:
+            logger.error("No data processed")
+            return empty
+
+        nbytes = shape[0] * shape[1] * self.dtype.itemsize
+        spill = exceeds_budget(nbytes, self.settings.feature_memory_budget_mb * 1024 * 1024)
+        if spill:
+            logger.info(f"Batch of {nbytes / 1e6:.1f} MB exceeds memory budget, spilling to disk")
+
+        filled = self._fill_batch(subjects, offsets, shape, time_range, n_workers, spill=spill)
+        if filled is None:
+            return empty
+        data_array, results = filled
+
+        valid = np.zeros(shape[0], dtype=bool)
+        valence_array = np.zeros(shape[0])
+        arousal_array = np.zeros(shape[0])
+        weight_array = np.ones(shape[0])
+
+        for i, ((user_id, _, _), result) in enumerate(zip(subjects, results, strict=True)):
+            if result is None:
+                logger.warning(f"Skipping user {user_id}")
+                continue
+            rows = slice(offsets[i], offsets[i + 1])
+            valid[rows], valence_array[rows], arousal_array[rows], weight_array[rows] = result
+
+        if not valid.any():
+            logger.error("No data processed")
+            return empty
+
+        if not valid.all():
+            data_array = _compact_rows(data_array, valid) if spill else data_array[valid]
+            valence_array = valence_array[valid]
+            arousal_array = arousal_array[valid]
+            weight_array = weight_array[valid]
+
+        logger.info(f"Processed {len(data_array)} samples. Shape: {data_array.shape}")
+        batch = (data_array, valence_array, arousal_array, weight_array)
+        return batch if with_weights else batch[:3]
+
+    def _feature_cache_params(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int],
+        time_range: tuple[int, int],
+    ) -> dict:
+        """Get the parameters that determine a processed feature set.
+
         Args:
             user_range: Tuple of (start_user, end_user) inclusive
             trial_range: Tuple of (start_trial, end_trial) inclusive
-            time_range: Tuple of (start_time, end_time) inclusive
+            time_range: Tuple of (start_time, end_time)
 
         Returns:
-            Tuple of (data_array, valence_labels, arousal_labels)
+            JSON-serializable parameter dictionary
         """
-        data_list = []
-        valence_list = []
-        arousal_list = []
+        params = {
+            "dataset": self.dataset.name,
+            "user_range": list(user_range),
+            "trial_range": list(trial_range),
+            "time_range": list(time_range),
+            "channels": list(self._active_channels),
+            "label_threshold": self.settings.label_threshold,
+            "dtype": self.dtype.name,
+            "feature_mode": self.settings.feature_mode,
+        }
+        # Quantized storage is lossy, so its features differ from the other backends
+        if self.settings.eeg_storage == "quantized":
+            params["storage"] = self.settings.eeg_storage
+        if self.settings.feature_mode == "raw" and self.settings.decimation_factor > 1:
+            params["decimation_factor"] = self.settings.decimation_factor
+        if self.settings.feature_mode != "raw":
+            params["welch_segment_seconds"] = self.settings.welch_segment_seconds
+            params["bands"] = {name: list(band) for name, band in EEG_BANDS.items()}
+        # Asymmetry rows once also held RASM, so older cached matrices are wider
+        if self.settings.feature_mode == "de_asymmetry":
+            params["asymmetry"] = ["dasm"]
+        if self.settings.filter_low_hz > 0 or self.settings.filter_high_hz > 0:
+            params["filter"] = [
+                self.settings.filter_low_hz,
+                self.settings.filter_high_hz,
+                self.settings.filter_order,
+            ]
+        if self.settings.epoch_seconds > 0:
+            params["epoch_seconds"] = self.settings.epoch_seconds
+            params["epoch_hop_seconds"] = self.settings.epoch_hop_seconds
+        if self.settings.baseline_correction != "off":
+            params["baseline_correction"] = self.settings.baseline_correction
+        if self.settings.artifact_rejection != "off":
+            params["artifacts"] = {
+                "rejection": self.settings.artifact_rejection,
+                "weight": self.settings.artifact_weight,
+                **asdict(self.artifact_thresholds),
+            }
+            # Weight mode once attenuated the signal, so older cached matrices differ
+            if self.settings.artifact_rejection == "weight":
+                params["artifacts"]["weighting"] = "samples"
+        return params
 
-        start_user, end_user = user_range
-        start_trial, end_trial = trial_range
-        start_time, end_time = time_range
+    def prepare_feature_set(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+        use_cache: bool | None = None,
+        *,
+        with_weights: bool = False,
+    ) -> tuple[np.ndarray, ...]:
+        """Process a batch into features with binary labels, reusing cached results.
 
-        logger.info(
-            f"Processing batch: users {start_user}-{end_user}, " f"trials {start_trial}-{end_trial}"
+        The cache key covers every processing parameter and the checksums of
+        the source files, so any change to them produces a fresh computation.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive (all trials if None)
+            time_range: Tuple of (start_time, end_time) (post-baseline samples if None)
+            use_cache: Read and write the feature cache (uses settings if None)
+            with_weights: Also return the sample weight of every row
+
+        Returns:
+            Tuple of (data_array, valence_binary, arousal_binary), followed by
+            the sample weights if ``with_weights``
+        """
+        if use_cache is None:
+            use_cache = self.settings.use_feature_cache
+
+        subjects, trial_range, time_range = self._batch_layout(user_range, trial_range, time_range)
+
+        key = None
+        params = self._feature_cache_params(user_range, trial_range, time_range)
+        if use_cache:
+            sources = [
+                path for user_id, _, _ in subjects for path in self.dataset.source_files(user_id)
+            ]
+            key = self.feature_cache.make_key(params, sources)
+            cached = self.feature_cache.load(key)
+            if cached is not None:
+                features = (cached["data"], cached["valence"], cached["arousal"])
+                if with_weights:
+                    # Only 'weight' mode stores weights; every other row weighs 1
+                    weights = cached.get("weight", np.ones(len(cached["data"])))
+                    return (*features, weights)
+                return features
+
+        data, valence, arousal, weights = self.process_raw_data_batch(
+            user_range, trial_range, time_range, with_weights=True
         )
+        valence = self.labels_to_binary(valence)
+        arousal = self.labels_to_binary(arousal)
 
-        for user_id in range(start_user, end_user + 1):
-            user_data = self.load_user_data(user_id)
-            if user_data is None:
+        if key is not None and len(data) > 0:
+            arrays = {"data": data, "valence": valence, "arousal": arousal}
+            if self.settings.artifact_rejection == "weight":
+                arrays["weight"] = weights
+            self.feature_cache.save(key, arrays, params)
+
+        if with_weights:
+            return data, valence, arousal, weights
+        return data, valence, arousal
+
+    def _fill_batch(
+        self,
+        subjects: list[tuple[int, int, int]],
+        offsets: list[int],
+        shape: tuple[int, int],
+        time_range: tuple[int, int],
+        n_workers: int,
+        *,
+        spill: bool = False,
+    ) -> tuple[np.ndarray, list] | None:
+        """Allocate the batch output and fill it serially or with a process pool.
+
+        Args:
+            subjects: Tuples of (user_id, first_trial, last_trial) in output order
+            offsets: First output row of each subject, followed by the row count
+            shape: Output array shape
+            time_range: Tuple of (start_time, end_time)
+            n_workers: Number of worker processes
+            spill: Back the output with a file in ``spill_dir``
+
+        Returns:
+            Tuple of (output_array, per-user results in subjects order), or
+            None if a worker process died
+        """
+        if n_workers > 1 and len(subjects) > 1:
+            try:
+                return self._run_batch_pool(
+                    subjects,
+                    offsets,
+                    shape,
+                    time_range,
+                    min(n_workers, len(subjects)),
+                    spill_dir=self.settings.spill_dir if spill else None,
+                )
+            except BrokenProcessPool as e:
+                logger.error(f"Batch worker process died: {e}")
+                return None
+
+        data_array = (
+            spill_array(shape, self.dtype, self.settings.spill_dir)
+            if spill
+            else np.empty(shape, dtype=self.dtype)
+        )
+        results = [
+            self._fill_user_rows(
+                user_id, (first, last), time_range, data_array[offsets[i] : offsets[i + 1]]
+            )
+            for i, (user_id, first, last) in enumerate(subjects)
+        ]
+        return data_array, results
+
+    def _run_batch_pool(
+        self,
+        subjects: list[tuple[int, int, int]],
+        offsets: list[int],
+        shape: tuple[int, int],
+        time_range: tuple[int, int],
+        n_workers: int,
+        *,
+        spill_dir: Path | None = None,
+    ) -> tuple[np.ndarray, list]:
+        """Fan users out to a process pool writing into a shared output array.
+
+        Args:
+            subjects: Tuples of (user_id, first_trial, last_trial) in output order
+            offsets: First output row of each subject, followed by the row count
+            shape: Output array shape
+            time_range: Tuple of (start_time, end_time)
+            n_workers: Number of worker processes
+            spill_dir: Directory for a disk-backed output (tmpfs if None and
+                the output fits there, else the temp directory)
+
+        Returns:
+            Tuple of (output_array, per-user results in subjects order)
+
+        Raises:
+            BrokenProcessPool: If a worker process died
+        """
+        # Prefer tmpfs so the shared output lives in RAM rather than on disk
+        nbytes = shape[0] * shape[1] * self.dtype.itemsize
+        out_dir = shared_array_dir(nbytes, spill_dir)
+        fd, out_path = tempfile.mkstemp(prefix="eeg_batch_", suffix=".dat", dir=out_dir)
+        os.close(fd)
+
+        try:
+            data_array = np.memmap(out_path, dtype=self.dtype, mode="w+", shape=shape)
+            tasks = [
+                (user_id, (offsets[i], offsets[i + 1]), out_path, shape, (first, last), time_range)
+                for i, (user_id, first, last) in enumerate(subjects)
+            ]
+
+            logger.info(f"Processing {len(subjects)} users with {n_workers} workers")
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_batch_worker,
+                initargs=(
+                    self.settings,
+                    self._active_channels,
+                    self.pool_fft_backend(n_workers),
+                ),
+            ) as executor:
+                results = list(executor.map(_process_user_rows, tasks))
+
+        finally:
+            # The mapping stays valid after unlinking on POSIX systems
+            with contextlib.suppress(OSError):
+                os.unlink(out_path)
+
+        return data_array, results
+
+    def iter_trials(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+        *,
+        shuffle_buffer: int = 0,
+        seed: int | None = None,
+    ) -> Iterator[tuple[np.ndarray, float, float, float, int, int]]:
+        """Lazily yield flattened trials (or their epochs) one at a time.
+
+        Only one subject is decoded at a time, so memory stays constant no
+        matter how many users the range covers. With a shuffle buffer, trials
+        are drawn at random from a bounded window of upcoming trials. Sample
+        weights follow ``artifact_rejection`` as in ``process_raw_data_batch``.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive (all trials if None)
+            time_range: Tuple of (start_time, end_time) (post-baseline samples if None)
+            shuffle_buffer: Number of trials held for shuffling (0 keeps order)
+            seed: Random seed for shuffling
+
+        Yields:
+            Tuple of (features, valence, arousal, sample_weight, user_id, trial_id)
+        """
+        trials = self._iter_trials_ordered(user_range, trial_range, time_range)
+        if shuffle_buffer > 1:
+            trials = _shuffle_buffered(trials, shuffle_buffer, np.random.default_rng(seed))
+        yield from trials
+
+    def _iter_trials_ordered(
+        self,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None,
+        time_range: tuple[int, int] | None,
+    ) -> Iterator[tuple[np.ndarray, float, float, float, int, int]]:
+        """Yield flattened trials in user then trial order, one item per epoch.
+
+        Args:
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive, or None
+            time_range: Tuple of (start_time, end_time), or None
+
+        Yields:
+            Tuple of (features, valence, arousal, sample_weight, user_id, trial_id)
+        """
+        subjects, _, time_range = self._batch_layout(user_range, trial_range, time_range)
+
+        for user_id, first, last in subjects:
+            user_data = self.load_channel_major(user_id)
+            info = self.dataset.subject_info(user_id)
+            if user_data is None or info is None:
                 logger.warning(f"Skipping user {user_id}")
                 continue
 
-            for trial_id in range(start_trial, end_trial + 1):
+            length, hop, n_epochs = self._epoch_layout(time_range, info.sampling_rate)
+            for trial_id in range(first, last + 1):
                 eeg_data = self.extract_trial_data(user_data, trial_id, user_id)
-                if eeg_data is None:
+                if eeg_data is None or eeg_data.data.shape[1] < time_range[1] or not n_epochs:
                     continue
 
-                # Extract active channels and time window
-                channel_indices = [self._channel_map[ch] for ch in self._active_channels]
-                trial_data = eeg_data.data[channel_indices, start_time:end_time]
+                features = np.empty((n_epochs, self._n_features(length)), dtype=self.dtype)
+                try:
+                    window = self._active_window(
+                        eeg_data.data,
+                        time_range,
+                        info.sampling_rate,
+                        baseline_samples=info.baseline_samples,
+                    )
+                except ValueError as e:
+                    logger.error(f"Error processing trials for user {user_id}: {e}")
+                    break
+                weights = self._write_features(features, window, info.sampling_rate, (length, hop))
+                if weights is None:
+                    weights = np.ones(n_epochs)
+                for epoch, weight in zip(features, weights, strict=True):
+                    if weight == 0:
+                        continue
+                    yield (
+                        epoch,
+                        eeg_data.label.valence,
+                        eeg_data.label.arousal,
+                        float(weight),
+                        user_id,
+                        trial_id,
+                    )
 
-                # Flatten to 1D
-                flattened_data = trial_data.flatten()
+    def iter_batches(
+        self,
+        batch_size: int,
+        user_range: tuple[int, int],
+        trial_range: tuple[int, int] | None = None,
+        time_range: tuple[int, int] | None = None,
+        *,
+        shuffle_buffer: int = 0,
+        seed: int | None = None,
+    ) -> Iterator[tuple[np.ndarray, ...]]:
+        """Lazily yield fixed-size batches of flattened trials.
 
-                data_list.append(flattened_data)
-                valence_list.append(eeg_data.label.valence)
-                arousal_list.append(eeg_data.label.arousal)
+        Args:
+            batch_size: Trials per batch (the last batch may be smaller)
+            user_range: Tuple of (start_user, end_user) inclusive
+            trial_range: Tuple of (start_trial, end_trial) inclusive (all trials if None)
+            time_range: Tuple of (start_time, end_time) (post-baseline samples if None)
+            shuffle_buffer: Number of trials held for shuffling (0 keeps order)
+            seed: Random seed for shuffling
 
-        if not data_list:
-            logger.error("No data processed")
-            return np.array([]), np.array([]), np.array([])
+        Yields:
+            Tuple of (data_array, valence_labels, arousal_labels, sample_weights,
+            user_ids, trial_ids)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
 
-        data_array = np.array(data_list)
-        valence_array = np.array(valence_list)
-        arousal_array = np.array(arousal_list)
+        batch: list[tuple[np.ndarray, float, float, float, int, int]] = []
+        for trial in self.iter_trials(
+            user_range, trial_range, time_range, shuffle_buffer=shuffle_buffer, seed=seed
+        ):
+            batch.append(trial)
+            if len(batch) == batch_size:
+                yield _stack_trials(batch)
+                batch = []
 
-        logger.info(f"Processed {len(data_list)} samples. Shape: {data_array.shape}")
-        return data_array, valence_array, arousal_array
+        if batch:
+            yield _stack_trials(batch)
 
     def labels_to_binary(self, labels: np.ndarray, threshold: float | None = None) -> np.ndarray:
         """Convert continuous labels to binary classification.
@@ -267,3 +1564,112 @@ class EEGProcessor:
             threshold = self.settings.label_threshold
 
         return (labels > threshold).astype(int)
+
+
+def _shuffle_buffered(
+    items: Iterable[tuple], buffer_size: int, rng: np.random.Generator
+) -> Iterator[tuple]:
+    """Shuffle a stream through a bounded buffer.
+
+    Args:
+        items: Items to shuffle
+        buffer_size: Maximum number of items held at once
+        rng: Random number generator
+
+    Yields:
+        Items in shuffled order
+    """
+    buffer: list[tuple] = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+
+        idx = int(rng.integers(buffer_size))
+        yield buffer[idx]
+        buffer[idx] = item
+
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def _stack_trials(
+    trials: list[tuple[np.ndarray, float, float, float, int, int]],
+) -> tuple[np.ndarray, ...]:
+    """Stack per-trial tuples from EEGProcessor.iter_trials into batch arrays.
+
+    Args:
+        trials: List of (features, valence, arousal, sample_weight, user_id, trial_id)
+
+    Returns:
+        Tuple of (data_array, valence_labels, arousal_labels, sample_weights,
+        user_ids, trial_ids)
+    """
+    features, valence, arousal, weights, user_ids, trial_ids = zip(*trials, strict=True)
+    return (
+        np.stack(features),
+        np.asarray(valence),
+        np.asarray(arousal),
+        np.asarray(weights),
+        np.asarray(user_ids),
+        np.asarray(trial_ids),
+    )
+
+
+def _compact_rows(array: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Move valid rows to the front in place instead of copying them out.
+
+    Args:
+        array: 2D array, typically memory-mapped
+        valid: Boolean row mask
+
+    Returns:
+        View of the leading valid rows
+    """
+    for dst, src in enumerate(np.flatnonzero(valid)):
+        if dst != src:
+            array[dst] = array[src]
+    return array[: int(valid.sum())]
+
+
+# Per-process processor used by process_raw_data_batch pool workers
+_worker_processor: EEGProcessor | None = None
+
+
+def _init_batch_worker(
+    settings: Settings, active_channels: list[str], fft_backend: FFTBackend
+) -> None:
+    """Create the processor used by a batch worker process.
+
+    Args:
+        settings: Application settings
+        active_channels: Active channel names of the parent processor
+        fft_backend: FFT backend resolved by the parent for one pool worker
+    """
+    global _worker_processor  # noqa: PLW0603
+    _worker_processor = EEGProcessor(settings)
+    _worker_processor._fft_backend = fft_backend
+    _worker_processor.set_active_channels(active_channels)
+
+
+def _process_user_rows(
+    task: tuple[int, tuple[int, int], str, tuple[int, int], tuple[int, int], tuple[int, int]],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None:
+    """Fill one user's rows of the shared batch output inside a worker.
+
+    Args:
+        task: Tuple of (user_id, (first_row, end_row), out_path, shape,
+            trial_range, time_range)
+
+    Returns:
+        Result of EEGProcessor._fill_user_rows for the user
+    """
+    user_id, (first_row, end_row), out_path, shape, trial_range, time_range = task
+
+    assert _worker_processor is not None
+    out = np.memmap(out_path, dtype=_worker_processor.dtype, mode="r+", shape=shape)
+    result = _worker_processor._fill_user_rows(
+        user_id, trial_range, time_range, out[first_row:end_row]
+    )
+    out.flush()
+    return result
@@ -0,0 +1,701 @@
+"""On-disk binary layouts for DEAP subject files."""
+
+import json
+import mmap
+import os
+import pickle
+import threading
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+# Optional fast codecs for the chunked store; zlib is always available
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    lz4 = None  # type: ignore
+    LZ4_AVAILABLE = False
+
+
+def read_deap_pickle(source: Path) -> dict:
+    """Read a DEAP ``sNN.dat`` pickle.
+
+    Args:
+        source: Path to the pickled subject file
+
+    Returns:
+        Dictionary with 'data' and 'labels' keys
+    """
+    with open(source, "rb") as f:
+        return pickle.load(f, encoding="latin1")
+
+
+def _atomic_save(path: Path, array: np.ndarray) -> None:
+    """Write an array as ``.npy`` so readers never observe a partial file.
+
+    Args:
+        path: Destination path
+        array: Array to write
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+class MemmapSubjectStore:
+    """Stores each DEAP subject as raw ``.npy`` files that can be memory-mapped.
+
+    A subject is converted once from its pickle into ``sNN.data.npy`` and a
+    ``sNN.labels.npy`` sidecar. Loading then maps the data file read-only, so
+    callers only fault in the pages they touch and several processes share the
+    OS page cache instead of each holding a private copy.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initialize store.
+
+        Args:
+            root: Directory holding the converted subject files
+        """
+        self.root = root
+
+    def paths(self, user_id: int) -> tuple[Path, Path]:
+        """Get converted file paths for a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (data_path, labels_path)
+        """
+        stem = f"s{user_id:02d}"
+        return self.root / f"{stem}.data.npy", self.root / f"{stem}.labels.npy"
+
+    def is_current(self, user_id: int, source: Path) -> bool:
+        """Check whether a subject has been converted and is newer than its source.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+
+        Returns:
+            True if the converted files can be used as-is
+        """
+        data_path, labels_path = self.paths(user_id)
+        if not data_path.exists() or not labels_path.exists():
+            return False
+        return data_path.stat().st_mtime >= source.stat().st_mtime
+
+    def convert(self, user_id: int, source: Path, user_data: dict | None = None) -> bool:
+        """Convert a subject pickle into the binary layout.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+            user_data: Already unpickled subject data (read from source if None)
+
+        Returns:
+            True if conversion successful, False otherwise
+        """
+        try:
+            if user_data is None:
+                user_data = read_deap_pickle(source)
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            data_path, labels_path = self.paths(user_id)
+
+            # Labels first: the data file's mtime marks the conversion as complete
+            _atomic_save(labels_path, np.asarray(user_data["labels"]))
+            _atomic_save(data_path, np.asarray(user_data["data"]))
+
+            logger.info(f"Converted user {user_id} to binary layout in {self.root}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error converting data for user {user_id}: {e}")
+            return False
+
+    def load(self, user_id: int) -> dict | None:
+        """Load a converted subject with memory-mapped data.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary with 'data' (read-only memmap) and 'labels' keys, or None
+        """
+        data_path, labels_path = self.paths(user_id)
+
+        try:
+            data = np.load(data_path, mmap_mode="r")
+            labels = np.load(labels_path)
+            return {"data": data, "labels": labels}
+
+        except Exception as e:
+            logger.error(f"Error mapping data for user {user_id}: {e}")
+            return None
+
+
+def _get_codec(name: str, level: int) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """Get compress and decompress functions for a codec.
+
+    Args:
+        name: Codec name ('zstd', 'lz4' or 'zlib')
+        level: Compression level
+
+    Returns:
+        Tuple of (compress, decompress)
+    """
+    if name == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd codec requires: pip install zstandard")
+        compressor = zstandard.ZstdCompressor(level=level)
+        local = threading.local()
+
+        # Decompression contexts are not thread-safe, so each reader thread gets one
+        def decompress(buffer: bytes) -> bytes:
+            if not hasattr(local, "decompressor"):
+                local.decompressor = zstandard.ZstdDecompressor()
+            return local.decompressor.decompress(buffer)
+
+        return compressor.compress, decompress
+
+    if name == "lz4":
+        if not LZ4_AVAILABLE:
+            raise ValueError("lz4 codec requires: pip install lz4")
+        return (lambda b: lz4.frame.compress(b, compression_level=level)), lz4.frame.decompress
+
+    if name == "zlib":
+        return (lambda b: zlib.compress(b, level)), zlib.decompress
+
+    raise ValueError(f"Unknown codec: {name}")
+
+
+def resolve_codec(name: str) -> str:
+    """Resolve 'auto' to the fastest installed codec.
+
+    Args:
+        name: Codec name or 'auto'
+
+    Returns:
+        Concrete codec name
+    """
+    if name != "auto":
+        return name
+    if ZSTD_AVAILABLE:
+        return "zstd"
+    if LZ4_AVAILABLE:
+        return "lz4"
+    return "zlib"
+
+
+def byte_shuffle(array: np.ndarray) -> bytes:
+    """Group the i-th byte of every element together.
+
+    Neighbouring EEG samples share their exponent and high mantissa bytes, so
+    grouping bytes by significance gives the codec long similar runs.
+
+    Args:
+        array: Contiguous array
+
+    Returns:
+        Shuffled bytes
+    """
+    itemsize = array.dtype.itemsize
+    return np.ascontiguousarray(array).view(np.uint8).reshape(-1, itemsize).T.tobytes()
+
+
+def byte_unshuffle(buffer: bytes, dtype: np.dtype, shape: tuple[int, ...]) -> np.ndarray:
+    """Invert byte_shuffle.
+
+    Args:
+        buffer: Shuffled bytes
+        dtype: Element dtype
+        shape: Array shape
+
+    Returns:
+        Restored array
+    """
+    planes = np.frombuffer(buffer, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(shape)
+
+
+class ChunkedSubjectStore:
+    """Stores each DEAP subject as compressed trial x channel-group chunks.
+
+    A subject is written to ``sNN.chunks`` with a ``sNN.chunks.json`` index
+    holding the shape, dtype, codec, labels and the byte offset and length of
+    every chunk. Reads only decompress the chunks covering the requested
+    trials and channels, spread over a thread pool; the codecs release the
+    GIL while decompressing.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        codec: str = "auto",
+        level: int = 3,
+        channels_per_chunk: int = 1,
+        n_threads: int = 4,
+    ) -> None:
+        """Initialize store.
+
+        Args:
+            root: Directory holding the chunked subject files
+            codec: Compression codec ('auto', 'zstd', 'lz4' or 'zlib')
+            level: Compression level
+            channels_per_chunk: Channels grouped into one chunk
+            n_threads: Threads used for decompression
+        """
+        self.root = root
+        self.codec = resolve_codec(codec)
+        self.level = level
+        self.channels_per_chunk = channels_per_chunk
+        self.n_threads = n_threads
+
+        # Parsed indexes by user, invalidated when the index file changes
+        self._indexes: dict[int, tuple[int, dict]] = {}
+
+    def paths(self, user_id: int) -> tuple[Path, Path]:
+        """Get chunk and index file paths for a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (chunks_path, index_path)
+        """
+        stem = f"s{user_id:02d}"
+        return self.root / f"{stem}.chunks", self.root / f"{stem}.chunks.json"
+
+    def is_current(self, user_id: int, source: Path) -> bool:
+        """Check whether a subject has been converted and is newer than its source.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+
+        Returns:
+            True if the chunked files can be used as-is
+        """
+        chunks_path, index_path = self.paths(user_id)
+        if not chunks_path.exists() or not index_path.exists():
+            return False
+        return index_path.stat().st_mtime >= source.stat().st_mtime
+
+    def convert(self, user_id: int, source: Path, user_data: dict | None = None) -> bool:
+        """Compress a subject pickle into chunks.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+            user_data: Already unpickled subject data (read from source if None)
+
+        Returns:
+            True if conversion successful, False otherwise
+        """
+        try:
+            if user_data is None:
+                user_data = read_deap_pickle(source)
+
+            data = np.ascontiguousarray(user_data["data"])
+            n_trials, n_channels, _ = data.shape
+            compress, _ = _get_codec(self.codec, self.level)
+            group = self.channels_per_chunk
+            n_groups = -(-n_channels // group)
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            chunks_path, index_path = self.paths(user_id)
+            tmp_path = chunks_path.with_name(f".{chunks_path.name}.{os.getpid()}.tmp")
+
+            offsets = np.zeros((n_trials, n_groups), dtype=np.int64)
+            lengths = np.zeros((n_trials, n_groups), dtype=np.int64)
+            position = 0
+
+            with open(tmp_path, "wb") as f:
+                for trial in range(n_trials):
+                    for g in range(n_groups):
+                        chunk = data[trial, g * group : (g + 1) * group]
+                        payload = compress(byte_shuffle(chunk))
+                        f.write(payload)
+                        offsets[trial, g] = position
+                        lengths[trial, g] = len(payload)
+                        position += len(payload)
+            os.replace(tmp_path, chunks_path)
+
+            index = {
+                "shape": list(data.shape),
+                "dtype": data.dtype.str,
+                "codec": self.codec,
+                "channels_per_chunk": group,
+                "offsets": offsets.tolist(),
+                "lengths": lengths.tolist(),
+                "labels": np.asarray(user_data["labels"]).tolist(),
+            }
+            tmp_index = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+            tmp_index.write_text(json.dumps(index))
+            os.replace(tmp_index, index_path)
+
+            logger.info(
+                f"Converted user {user_id} to {self.codec} chunks "
+                f"({data.nbytes / 1e6:.1f} MB -> {position / 1e6:.1f} MB)"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error converting data for user {user_id}: {e}")
+            return False
+
+    def read_index(self, user_id: int) -> dict:
+        """Read a subject's chunk index, reusing the parsed copy while unchanged.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Index dictionary
+        """
+        _, index_path = self.paths(user_id)
+        mtime = index_path.stat().st_mtime_ns
+
+        cached = self._indexes.get(user_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        index = json.loads(index_path.read_text())
+        self._indexes[user_id] = (mtime, index)
+        return index
+
+    def read_labels(self, user_id: int) -> np.ndarray:
+        """Read a subject's labels from its index without touching any chunk.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Labels array of shape (n_trials, 4)
+        """
+        return np.asarray(self.read_index(user_id)["labels"])
+
+    def read(
+        self,
+        user_id: int,
+        trials: list[int] | None = None,
+        channels: list[int] | None = None,
+        time_range: tuple[int, int] | None = None,
+    ) -> np.ndarray:
+        """Read part of a subject, decompressing only the chunks it covers.
+
+        Args:
+            user_id: User ID
+            trials: 0-based trial indices (all if None)
+            channels: 0-based channel indices (all if None)
+            time_range: Tuple of (start, end) samples (all if None)
+
+        Returns:
+            Array of shape (n_trials, n_channels, n_samples)
+        """
+        index = self.read_index(user_id)
+        n_trials, n_channels, n_samples = index["shape"]
+        dtype = np.dtype(index["dtype"])
+        group = index["channels_per_chunk"]
+        offsets = index["offsets"]
+        lengths = index["lengths"]
+        _, decompress = _get_codec(index["codec"], self.level)
+
+        trials = list(range(n_trials)) if trials is None else list(trials)
+        channels = list(range(n_channels)) if channels is None else list(channels)
+        start, end = (0, n_samples) if time_range is None else time_range
+
+        # Map every chunk to the output channel positions it supplies
+        wanted: dict[int, list[tuple[int, int]]] = {}
+        for out_ch, ch in enumerate(channels):
+            wanted.setdefault(ch // group, []).append((out_ch, ch % group))
+
+        n_out_samples = len(range(n_samples)[start:end])
+        out = np.empty((len(trials), len(channels), n_out_samples), dtype)
+        chunks_path, _ = self.paths(user_id)
+
+        with open(chunks_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+            def read_chunk(task: tuple[int, int, int]) -> None:
+                out_trial, trial, g = task
+                offset, length = offsets[trial][g], lengths[trial][g]
+                chunk_channels = min(group, n_channels - g * group)
+                chunk = byte_unshuffle(
+                    decompress(mm[offset : offset + length]), dtype, (chunk_channels, n_samples)
+                )
+                for out_ch, local_ch in wanted[g]:
+                    out[out_trial, out_ch] = chunk[local_ch, start:end]
+
+            tasks = [(i, trial, g) for i, trial in enumerate(trials) for g in wanted]
+            if self.n_threads > 1 and len(tasks) > 1:
+                with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+                    list(executor.map(read_chunk, tasks))
+            else:
+                for task in tasks:
+                    read_chunk(task)
+
+        return out
+
+    def load(self, user_id: int) -> dict | None:
+        """Load a whole chunked subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary with 'data' and 'labels' keys, or None if load fails
+        """
+        try:
+            return {"data": self.read(user_id), "labels": self.read_labels(user_id)}
+
+        except Exception as e:
+            logger.error(f"Error reading chunks for user {user_id}: {e}")
+            return None
+
+
+# Largest magnitude of the quantized samples; symmetric so the offset maps to zero
+_Q16_MAX = np.iinfo(np.int16).max
+
+
+class QuantizedSubjectStore:
+    """Stores each DEAP subject as int16 samples with per-channel scale and offset.
+
+    A subject is written to ``sNN.q16.npy`` with a ``sNN.q16.json`` index
+    holding the per-channel scale and offset and the reconstruction error
+    measured at conversion, plus a ``sNN.q16.labels.npy`` sidecar. The file is
+    a quarter of the float64 layout, and reads dequantize only the requested
+    trials, channels and samples of the memory-mapped samples in one
+    vectorized pass.
+    """
+
+    def __init__(self, root: Path, dtype: str = "float32") -> None:
+        """Initialize store.
+
+        Args:
+            root: Directory holding the quantized subject files
+            dtype: Floating point dtype samples are dequantized into
+        """
+        self.root = root
+        self.dtype = np.dtype(dtype)
+
+    def paths(self, user_id: int) -> tuple[Path, Path, Path]:
+        """Get quantized file paths for a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Tuple of (data_path, index_path, labels_path)
+        """
+        stem = f"s{user_id:02d}.q16"
+        return (
+            self.root / f"{stem}.npy",
+            self.root / f"{stem}.json",
+            self.root / f"{stem}.labels.npy",
+        )
+
+    def is_current(self, user_id: int, source: Path) -> bool:
+        """Check whether a subject has been converted and is newer than its source.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+
+        Returns:
+            True if the quantized files can be used as-is
+        """
+        data_path, index_path, labels_path = self.paths(user_id)
+        if not all(path.exists() for path in (data_path, index_path, labels_path)):
+            return False
+        return index_path.stat().st_mtime >= source.stat().st_mtime
+
+    def convert(self, user_id: int, source: Path, user_data: dict | None = None) -> bool:
+        """Quantize a subject pickle and record its reconstruction error.
+
+        Args:
+            user_id: User ID
+            source: Original DEAP pickle path
+            user_data: Already unpickled subject data (read from source if None)
+
+        Returns:
+            True if conversion successful, False otherwise
+        """
+        try:
+            if user_data is None:
+                user_data = read_deap_pickle(source)
+
+            data = np.asarray(user_data["data"])
+            if not np.isfinite(data).all():
+                raise ValueError("data contains non-finite values")
+
+            low = data.min(axis=(0, 2)).astype(np.float64)
+            high = data.max(axis=(0, 2)).astype(np.float64)
+            offset = (high + low) / 2
+            scale = (high - low) / (2 * _Q16_MAX)
+            scale[scale == 0] = 1.0  # Constant channels quantize to zero
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            data_path, index_path, labels_path = self.paths(user_id)
+            tmp_path = data_path.with_name(f".{data_path.name}.{os.getpid()}.tmp")
+
+            # Quantize trial by trial so the float64 temporaries stay small
+            max_error = np.zeros(len(scale))
+            squared_error = np.zeros(len(scale))
+            quantized = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=np.int16, shape=data.shape
+            )
+            for trial, samples in enumerate(data):
+                normalized = (samples - offset[:, None]) / scale[:, None]
+                q = np.clip(np.rint(normalized), -_Q16_MAX, _Q16_MAX)
+                error = np.abs(q - normalized) * scale[:, None]
+                np.maximum(max_error, error.max(axis=1), out=max_error)
+                squared_error += np.square(error).sum(axis=1)
+                quantized[trial] = q
+            quantized.flush()
+            del quantized
+            os.replace(tmp_path, data_path)
+
+            n_values = data.shape[0] * data.shape[2]
+            rms_error = np.sqrt(squared_error / n_values)
+            signal_rms = np.sqrt(np.mean(np.square(data, dtype=np.float64)))
+            total_rms = float(np.sqrt(np.mean(np.square(rms_error))))
+            error = {
+                "max_abs": float(max_error.max()),
+                "rms": total_rms,
+                "snr_db": float(20 * np.log10(signal_rms / total_rms)) if total_rms else None,
+                "channel_max_abs": max_error.tolist(),
+                "channel_rms": rms_error.tolist(),
+            }
+
+            # The index is written last: its mtime marks the conversion as complete
+            _atomic_save(labels_path, np.asarray(user_data["labels"]))
+            index = {
+                "shape": list(data.shape),
+                "source_dtype": data.dtype.str,
+                "scale": scale.tolist(),
+                "offset": offset.tolist(),
+                "error": error,
+            }
+            tmp_index = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+            tmp_index.write_text(json.dumps(index))
+            os.replace(tmp_index, index_path)
+
+            logger.info(
+                f"Quantized user {user_id} to int16 in {self.root} "
+                f"(max error {error['max_abs']:.3g}, rms error {error['rms']:.3g})"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error quantizing data for user {user_id}: {e}")
+            return False
+
+    def read_index(self, user_id: int) -> dict:
+        """Read the quantization index of a subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Index with 'shape', 'scale', 'offset' and 'error' keys
+        """
+        _, index_path, _ = self.paths(user_id)
+        return json.loads(index_path.read_text())
+
+    def reconstruction_error(self, user_id: int) -> dict | None:
+        """Get the reconstruction error measured when a subject was quantized.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary with overall 'max_abs', 'rms' and 'snr_db' values and
+            per-channel 'channel_max_abs' and 'channel_rms' lists, or None
+        """
+        try:
+            return self.read_index(user_id)["error"]
+
+        except Exception as e:
+            logger.error(f"Error reading quantization index for user {user_id}: {e}")
+            return None
+
+    def read_labels(self, user_id: int) -> np.ndarray:
+        """Read a subject's labels.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Labels array of shape (n_trials, 4)
+        """
+        _, _, labels_path = self.paths(user_id)
+        return np.load(labels_path)
+
+    def read(
+        self,
+        user_id: int,
+        trials: list[int] | None = None,
+        channels: list[int] | None = None,
+        time_range: tuple[int, int] | None = None,
+    ) -> np.ndarray:
+        """Read and dequantize part of a subject.
+
+        Args:
+            user_id: User ID
+            trials: 0-based trial indices (all if None)
+            channels: 0-based channel indices (all if None)
+            time_range: Tuple of (start, end) samples (all if None)
+
+        Returns:
+            Array of shape (n_trials, n_channels, n_samples) in the store dtype
+        """
+        index = self.read_index(user_id)
+        data_path, _, _ = self.paths(user_id)
+        quantized = np.load(data_path, mmap_mode="r")
+
+        scale = np.asarray(index["scale"], dtype=self.dtype)
+        offset = np.asarray(index["offset"], dtype=self.dtype)
+        trial_sel = slice(None) if trials is None else list(trials)
+        channel_sel = slice(None) if channels is None else list(channels)
+        start, end = (None, None) if time_range is None else time_range
+
+        # Basic slicing first keeps the selection a view of the mapped file
+        selected = quantized[:, :, start:end][trial_sel]
+        selected = selected[:, channel_sel]
+
+        out = np.multiply(selected, scale[channel_sel, None], dtype=self.dtype)
+        out += offset[channel_sel, None]
+        return out
+
+    def load(self, user_id: int) -> dict | None:
+        """Load and dequantize a whole subject.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Dictionary with 'data' and 'labels' keys, or None if load fails
+        """
+        try:
+            return {"data": self.read(user_id), "labels": self.read_labels(user_id)}
+
+        except Exception as e:
+            logger.error(f"Error reading quantized data for user {user_id}: {e}")
+            return None
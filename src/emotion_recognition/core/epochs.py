@@ -0,0 +1,35 @@
+"""Sliding-window epoching of EEG trials into fixed-length segments."""
+
+import numpy as np
+
+
+def epoch_count(n_samples: int, length: int, hop: int) -> int:
+    """Get the number of full epochs that fit in a window.
+
+    Args:
+        n_samples: Window length in samples
+        length: Epoch length in samples
+        hop: Samples between the starts of consecutive epochs
+
+    Returns:
+        Number of epochs (0 if the window is shorter than one epoch)
+    """
+    if length < 1 or n_samples < length:
+        return 0
+    return (n_samples - length) // hop + 1
+
+
+def epoch_view(data: np.ndarray, length: int, hop: int) -> np.ndarray:
+    """Split the last axis of channel data into overlapping epochs without copying.
+
+    Args:
+        data: Array of shape (..., n_channels, n_samples)
+        length: Epoch length in samples
+        hop: Samples between the starts of consecutive epochs
+
+    Returns:
+        Strided view of shape (..., n_epochs, n_channels, length); read-only,
+        since overlapping epochs share memory
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(data, length, axis=-1)[..., ::hop, :]
+    return np.moveaxis(windows, -2, -3)
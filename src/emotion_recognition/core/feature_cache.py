@@ -0,0 +1,291 @@
+"""Persistent content-addressed cache for processed feature matrices."""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+_CHECKSUM_INDEX = "checksums.json"
+_META_FILE = "meta.json"
+
+
+def file_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 of a file's content.
+
+    Args:
+        path: File path
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_feature_set(
+    directory: Path, arrays: dict[str, np.ndarray], meta: dict[str, Any] | None = None
+) -> int:
+    """Write arrays as a feature set directory of ``.npy`` files plus ``meta.json``.
+
+    Arrays that are already memory-mapped from their target file (e.g. a matrix
+    parsed straight into ``data.npy``) are not rewritten.
+
+    Args:
+        directory: Target directory
+        arrays: Arrays to store by name (e.g. 'data', 'valence', 'arousal')
+        meta: Extra metadata to record
+
+    Returns:
+        Total size of the stored arrays in bytes
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in arrays.items():
+        path = directory / f"{name}.npy"
+        # Arrays already memory-mapped from their target file are left in place
+        if (
+            isinstance(array, np.memmap)
+            and path.exists()
+            and os.path.samefile(array.filename, path)
+        ):
+            continue
+        np.save(path, np.asarray(array))
+
+    nbytes = sum(int(np.asarray(array).nbytes) for array in arrays.values())
+    full_meta = {
+        **(meta or {}),
+        "arrays": {name: list(np.shape(array)) for name, array in arrays.items()},
+        "nbytes": nbytes,
+    }
+    (directory / _META_FILE).write_text(json.dumps(full_meta, indent=2, default=str))
+    return nbytes
+
+
+def load_feature_set(directory: Path) -> dict[str, np.ndarray]:
+    """Load a feature set directory with memory-mapped arrays.
+
+    Args:
+        directory: Feature set directory
+
+    Returns:
+        Dictionary of arrays by name
+    """
+    meta = json.loads((directory / _META_FILE).read_text())
+    return {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]}
+
+
+class FeatureCache:
+    """On-disk cache of feature matrices keyed by a hash of their inputs.
+
+    Each entry is a directory named after its key holding one ``.npy`` file per
+    array plus a ``meta.json`` with the key parameters, shapes and last access
+    time. Arrays are memory-mapped on load, so a hit costs milliseconds
+    regardless of matrix size. Source file checksums are memoized by size and
+    modification time, so unchanged files are only hashed once.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        """Initialize feature cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Maximum total size of cached entries (0 disables caching)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def source_checksum(self, path: Path) -> str:
+        """Get the content checksum of a source file, memoized by size and mtime.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            Hex digest
+        """
+        stat = path.stat()
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        index_path = self.root / _CHECKSUM_INDEX
+
+        index: dict[str, dict[str, str]] = {}
+        if index_path.exists():
+            try:
+                index = json.loads(index_path.read_text())
+            except (OSError, ValueError):
+                index = {}
+
+        entry = index.get(str(path.resolve()))
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["sha256"]
+
+        checksum = file_checksum(path)
+        index[str(path.resolve())] = {"stamp": stamp, "sha256": checksum}
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_name(f".{_CHECKSUM_INDEX}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index, indent=2))
+        os.replace(tmp_path, index_path)
+        return checksum
+
+    def make_key(self, params: dict[str, Any], sources: list[Path]) -> str:
+        """Build a cache key from processing parameters and source contents.
+
+        Args:
+            params: JSON-serializable processing parameters
+            sources: Source files the features are computed from
+
+        Returns:
+            Hex key
+        """
+        payload = {
+            "params": params,
+            "sources": [[path.name, self.source_checksum(path)] for path in sorted(sources)],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def load(self, key: str) -> dict[str, np.ndarray] | None:
+        """Load a cached entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Dictionary of memory-mapped arrays, or None on a miss
+        """
+        entry_dir = self.root / key
+        meta_path = entry_dir / _META_FILE
+        if not meta_path.exists():
+            return None
+
+        try:
+            arrays = load_feature_set(entry_dir)
+
+            meta = json.loads(meta_path.read_text())
+            meta["last_access"] = time.time()
+            meta_path.write_text(json.dumps(meta, indent=2))
+
+            logger.info(f"Feature cache hit: {key[:12]}")
+            return arrays
+
+        except Exception as e:
+            logger.error(f"Error loading feature cache entry {key[:12]}: {e}")
+            return None
+
+    def save(self, key: str, arrays: dict[str, np.ndarray], params: dict[str, Any]) -> bool:
+        """Store arrays under a key and enforce the size limit.
+
+        Args:
+            key: Cache key
+            arrays: Arrays to store by name
+            params: Processing parameters recorded for inspection
+
+        Returns:
+            True if the entry was stored, False otherwise
+        """
+        nbytes = sum(int(np.asarray(array).nbytes) for array in arrays.values())
+        if nbytes > self.max_bytes:
+            logger.warning(f"Feature set of {nbytes} bytes exceeds cache limit, not cached")
+            return False
+
+        entry_dir = self.root / key
+        tmp_dir = self.root / f".{key}.{os.getpid()}.tmp"
+
+        try:
+            now = time.time()
+            meta = {"key": key, "params": params, "created": now, "last_access": now}
+            save_feature_set(tmp_dir, arrays, meta)
+
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir)
+            os.replace(tmp_dir, entry_dir)
+
+        except Exception as e:
+            logger.error(f"Error saving feature cache entry {key[:12]}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        self._enforce_limit(keep=key)
+        logger.info(f"Feature cache stored: {key[:12]} ({nbytes / 1e6:.1f} MB)")
+        return True
+
+    def entries(self) -> list[dict[str, Any]]:
+        """List cached entries, most recently used first.
+
+        Returns:
+            List of entry metadata dictionaries
+        """
+        if not self.root.exists():
+            return []
+
+        entries = []
+        for meta_path in self.root.glob(f"*/{_META_FILE}"):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                logger.warning(f"Ignoring unreadable feature cache entry: {meta_path.parent}")
+
+        entries.sort(key=lambda meta: meta["last_access"], reverse=True)
+        return entries
+
+    def total_bytes(self) -> int:
+        """Get the total size of cached entries.
+
+        Returns:
+            Size in bytes
+        """
+        return sum(meta["nbytes"] for meta in self.entries())
+
+    def remove(self, key: str) -> bool:
+        """Remove a cached entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if an entry was removed
+        """
+        entry_dir = self.root / key
+        if not entry_dir.exists():
+            return False
+
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return True
+
+    def clear(self) -> int:
+        """Remove all cached entries and memoized checksums.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = sum(self.remove(meta["key"]) for meta in self.entries())
+        (self.root / _CHECKSUM_INDEX).unlink(missing_ok=True)
+        logger.info(f"Feature cache cleared ({removed} entries)")
+        return removed
+
+    def _enforce_limit(self, keep: str) -> None:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Args:
+            keep: Key that must not be evicted
+        """
+        entries = self.entries()
+        total = sum(meta["nbytes"] for meta in entries)
+
+        for meta in reversed(entries):
+            if total <= self.max_bytes:
+                break
+            if meta["key"] == keep:
+                continue
+            self.remove(meta["key"])
+            total -= meta["nbytes"]
+            logger.info(f"Evicted feature cache entry {meta['key'][:12]}")
@@ -0,0 +1,261 @@
+"""Import and export of the legacy ``old_code`` text datasets."""
+
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from emotion_recognition.core.feature_cache import save_feature_set
+
+# Legacy config keys of each split's files, in (data, valence, arousal) order
+_LEGACY_SPLITS = ("train", "test")
+_LEGACY_CLASS_KEYS = ("label_valance_class_path", "label_arousal_class_path")
+_LEGACY_LABEL_KEYS = ("label_valance_path", "label_arousal_path")
+
+
+def _text_chunks(path: Path, n_chunks: int) -> list[tuple[int, int, int]]:
+    """Split a text file into line-aligned byte ranges.
+
+    Args:
+        path: Text file path
+        n_chunks: Target number of chunks
+
+    Returns:
+        List of (start, end, n_rows) byte ranges covering the file
+    """
+    size = path.stat().st_size
+    bounds = [0]
+
+    with open(path, "rb") as f:
+        for i in range(1, n_chunks):
+            f.seek(max(size * i // n_chunks, bounds[-1]))
+            f.readline()  # Move to the start of the next line
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+        bounds.append(size)
+
+        chunks = []
+        for start, end in itertools.pairwise(bounds):
+            f.seek(start)
+            buffer = f.read(end - start)
+            n_rows = buffer.count(b"\n")
+            if not buffer.endswith(b"\n") and buffer.rsplit(b"\n", 1)[-1].strip():
+                n_rows += 1  # Last line without a trailing newline
+            chunks.append((start, end, n_rows))
+
+    return chunks
+
+
+def _parse_text_chunk(task: tuple[str, int, int, str, int, int, int]) -> None:
+    """Parse one byte range of a text matrix into its rows of the output file.
+
+    Args:
+        task: Tuple of (path, start, end, out_path, row_offset, n_rows, n_cols)
+    """
+    path, start, end, out_path, row_offset, n_rows, n_cols = task
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("ascii")
+
+    values = np.fromstring(text, sep=" ")
+    if values.size != n_rows * n_cols:
+        raise ValueError(
+            f"{path}: expected {n_rows} x {n_cols} values at byte {start}, got {values.size}"
+        )
+
+    out = np.load(out_path, mmap_mode="r+")
+    out[row_offset : row_offset + n_rows] = values.reshape(n_rows, n_cols)
+    out.flush()
+
+
+def parse_text_matrix(
+    path: Path,
+    out_path: Path,
+    n_workers: int = 0,
+    dtype: str = "float64",
+    chunks_per_worker: int = 4,
+) -> np.ndarray:
+    """Parse a whitespace-separated text matrix into a ``.npy`` file.
+
+    The file is split into line-aligned byte ranges that worker processes
+    parse in parallel, each writing its rows straight into the memory-mapped
+    output, so the text is never held in memory as a whole.
+
+    Args:
+        path: Text file with one row per line
+        out_path: Destination ``.npy`` path
+        n_workers: Worker processes (0 for all CPUs, 1 to parse in-process)
+        dtype: Output dtype
+        chunks_per_worker: Byte ranges per worker, for load balancing
+
+    Returns:
+        Memory-mapped parsed matrix
+    """
+    if n_workers == 0:
+        n_workers = os.cpu_count() or 1
+
+    with open(path, "rb") as f:
+        first_line = f.readline()
+    n_cols = np.fromstring(first_line.decode("ascii"), sep=" ").size
+
+    chunks = _text_chunks(path, max(n_workers * chunks_per_worker, 1))
+    n_rows = sum(rows for _, _, rows in chunks)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(n_rows, n_cols))
+    del out  # Header written; workers reopen the file to fill their rows
+
+    tasks = []
+    row_offset = 0
+    for start, end, rows in chunks:
+        tasks.append((str(path), start, end, str(out_path), row_offset, rows, n_cols))
+        row_offset += rows
+
+    logger.info(f"Parsing {path.name}: {n_rows} x {n_cols} in {len(tasks)} chunks")
+    if n_workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(_parse_text_chunk, tasks))
+    else:
+        for task in tasks:
+            _parse_text_chunk(task)
+
+    return np.load(out_path, mmap_mode="r")
+
+
+def read_label_file(path: Path) -> np.ndarray:
+    """Read a legacy label file with one value per line.
+
+    Args:
+        path: Label file path
+
+    Returns:
+        1D label array
+    """
+    return np.loadtxt(path, ndmin=1)
+
+
+def read_legacy_config(config_path: Path, base_dir: Path | None = None) -> dict:
+    """Read ``config_deap_eeg.json`` and resolve its dataset file paths.
+
+    Args:
+        config_path: Legacy config file
+        base_dir: Directory holding the dataset files; overrides the absolute
+            directories recorded in the config (keeps only their file names)
+
+    Returns:
+        Config dictionary with path values converted to Path objects
+    """
+    config = json.loads(config_path.read_text())
+
+    for key, value in config.items():
+        if key.endswith("_path") and isinstance(value, str):
+            path = Path(value)
+            config[key] = base_dir / path.name if base_dir is not None else path
+
+    return config
+
+
+def import_legacy_dataset(
+    config_path: Path,
+    output_dir: Path,
+    base_dir: Path | None = None,
+    n_workers: int = 0,
+    dtype: str = "float64",
+) -> dict[str, Path]:
+    """Convert the legacy train/test text files into binary feature sets.
+
+    Class label files (``*_label_*_class.dat``) are used when present;
+    otherwise the continuous label files are binarized with the config's
+    ``label_threshold``. Each split becomes ``output_dir/<split>`` holding
+    ``data.npy``, ``valence.npy``, ``arousal.npy`` and ``meta.json``, ready
+    for ``load_feature_set`` and ``MLModelManager.set_training_data``.
+
+    Args:
+        config_path: Legacy ``config_deap_eeg.json``
+        output_dir: Directory receiving one feature set per split
+        base_dir: Directory holding the legacy files (uses config paths if None)
+        n_workers: Worker processes for text parsing (0 for all CPUs)
+        dtype: Feature dtype
+
+    Returns:
+        Dictionary of split name to feature set directory
+    """
+    config = read_legacy_config(config_path, base_dir)
+    channels = list(config.get("nChannel_ON", {}))
+    imported = {}
+
+    for split in _LEGACY_SPLITS:
+        data_path = config.get(f"{split}_data_eeg_path")
+        if data_path is None or not data_path.exists():
+            logger.warning(f"Legacy {split} data not found, skipping")
+            continue
+
+        split_dir = output_dir / split
+        data = parse_text_matrix(data_path, split_dir / "data.npy", n_workers, dtype)
+
+        labels = []
+        for class_key, label_key in zip(_LEGACY_CLASS_KEYS, _LEGACY_LABEL_KEYS, strict=True):
+            class_path = config.get(f"{split}_{class_key}")
+            if class_path is not None and class_path.exists():
+                labels.append(read_label_file(class_path).astype(int))
+            else:
+                continuous = read_label_file(config[f"{split}_{label_key}"])
+                labels.append((continuous > config["label_threshold"]).astype(int))
+
+        if not all(len(label) == len(data) for label in labels):
+            raise ValueError(f"Legacy {split} labels do not match {len(data)} data rows")
+
+        save_feature_set(
+            split_dir,
+            {"data": data, "valence": labels[0], "arousal": labels[1]},
+            {
+                "source": "legacy",
+                "channels": channels,
+                "time_range": [config.get("nTime_head"), config.get("nTime_end")],
+                "user_range": [config.get(f"nUser_{split}_head"), config.get(f"nUser_{split}_end")],
+                "label_threshold": config.get("label_threshold"),
+            },
+        )
+        imported[split] = split_dir
+        logger.info(f"Imported legacy {split} set: {data.shape}")
+
+    return imported
+
+
+def export_legacy_text(
+    data: np.ndarray,
+    valence: np.ndarray,
+    arousal: np.ndarray,
+    *,
+    data_path: Path,
+    valence_path: Path,
+    arousal_path: Path,
+) -> None:
+    """Write a feature set in the legacy text layout for interoperability.
+
+    Rows are space-separated with a trailing space, as ``old_code/deapX.py``
+    writes them, and labels are one value per line.
+
+    Args:
+        data: Feature matrix
+        valence: Valence labels
+        arousal: Arousal labels
+        data_path: Destination of the data matrix
+        valence_path: Destination of the valence labels
+        arousal_path: Destination of the arousal labels
+    """
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    label_fmt = "%d" if np.issubdtype(np.asarray(valence).dtype, np.integer) else "%.17g"
+
+    np.savetxt(data_path, data, fmt="%.17g", delimiter=" ", newline=" \n")
+    np.savetxt(valence_path, valence, fmt=label_fmt)
+    np.savetxt(arousal_path, arousal, fmt=label_fmt)
+    logger.info(f"Exported {len(data)} rows to {data_path}")
@@ -0,0 +1,251 @@
+"""Dataset manifest with per-subject shapes, label ranges and checksums."""
+
+import json
+import os
+import pickletools
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from emotion_recognition.core.eeg_store import read_deap_pickle
+from emotion_recognition.core.feature_cache import file_checksum
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Pickle opcodes that store a raw byte string, and the size of their length field
+_RAW_BYTES_OPCODES = {
+    "SHORT_BINSTRING": 1,
+    "BINSTRING": 4,
+    "SHORT_BINBYTES": 1,
+    "BINBYTES": 4,
+    "BINBYTES8": 8,
+    "BYTEARRAY8": 8,
+}
+
+
+def _payload_offsets(path: Path, sizes: dict[str, int]) -> dict[str, int | None]:
+    """Find the byte offsets of array buffers stored inline in a pickle.
+
+    Args:
+        path: Pickle file path
+        sizes: Buffer size in bytes of each array to locate
+
+    Returns:
+        Dictionary of array name to payload offset, or None if the buffer is
+        not stored as raw bytes (e.g. re-encoded text in protocol 2 pickles
+        written by Python 3)
+    """
+    offsets: dict[str, int | None] = dict.fromkeys(sizes)
+    pending = {size: name for name, size in sizes.items()}
+
+    with open(path, "rb") as f:
+        for opcode, arg, pos in pickletools.genops(f):
+            length_field = _RAW_BYTES_OPCODES.get(opcode.name)
+            if length_field is None or arg is None:
+                continue
+            name = pending.pop(len(arg), None)
+            if name is not None:
+                offsets[name] = pos + 1 + length_field
+            if not pending:
+                break
+
+    return offsets
+
+
+def describe_subject(path: Path, checksum: bool = True) -> dict[str, Any]:
+    """Describe one DEAP subject file for the manifest.
+
+    Args:
+        path: Subject ``sNN.dat`` path
+        checksum: Compute the SHA-256 of the file
+
+    Returns:
+        Manifest entry with file stamp, array shapes, dtypes, label ranges,
+        payload offsets and content hash
+    """
+    stat = path.stat()
+    subject = read_deap_pickle(path)
+    data = np.asarray(subject["data"])
+    labels = np.asarray(subject["labels"])
+
+    offsets = _payload_offsets(path, {"data": data.nbytes, "labels": labels.nbytes})
+    return {
+        "file": path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_checksum(path) if checksum else None,
+        "data": {
+            "shape": list(data.shape),
+            "dtype": data.dtype.str,
+            "fortran_order": bool(data.flags.f_contiguous and not data.flags.c_contiguous),
+            "offset": offsets["data"],
+        },
+        "labels": {
+            "shape": list(labels.shape),
+            "dtype": labels.dtype.str,
+            "offset": offsets["labels"],
+            "min": labels.min(axis=0).tolist(),
+            "max": labels.max(axis=0).tolist(),
+        },
+    }
+
+
+class DatasetManifest:
+    """Manifest of the subject files in a DEAP data directory.
+
+    The manifest is generated once and records everything needed to plan work
+    on the dataset without opening the payloads. Validation only compares
+    file sizes and modification times against it, so checking the whole
+    dataset costs one ``stat`` per subject; ``verify`` re-hashes the files
+    when a full integrity check is wanted.
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        """Initialize manifest.
+
+        Args:
+            data_dir: Directory holding the ``sNN.dat`` subject files
+        """
+        self.data_dir = data_dir
+        self.path = data_dir / MANIFEST_FILE
+        self._subjects: dict[int, dict[str, Any]] | None = None
+
+    @staticmethod
+    def subject_path(data_dir: Path, user_id: int) -> Path:
+        """Get the path of a subject file.
+
+        Args:
+            data_dir: Data directory
+            user_id: User ID
+
+        Returns:
+            Subject file path
+        """
+        return data_dir / f"s{user_id:02d}.dat"
+
+    def exists(self) -> bool:
+        """Check whether the manifest file exists."""
+        return self.path.exists()
+
+    @property
+    def subjects(self) -> dict[int, dict[str, Any]]:
+        """Get manifest entries by user ID (empty if there is no manifest)."""
+        if self._subjects is None:
+            self._subjects = self._read()
+        return self._subjects
+
+    def _read(self) -> dict[int, dict[str, Any]]:
+        """Read manifest entries from disk.
+
+        Returns:
+            Manifest entries by user ID
+        """
+        if not self.path.exists():
+            return {}
+
+        try:
+            manifest = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading dataset manifest {self.path}: {e}")
+            return {}
+
+        if manifest.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Ignoring dataset manifest with unknown version: {self.path}")
+            return {}
+        return {int(user_id): entry for user_id, entry in manifest["subjects"].items()}
+
+    def generate(self, user_ids: list[int] | None = None, checksum: bool = True) -> bool:
+        """Scan the subject files and write the manifest.
+
+        Args:
+            user_ids: Users to include (all ``sNN.dat`` files found if None)
+            checksum: Record SHA-256 content hashes
+
+        Returns:
+            True if the manifest was written, False otherwise
+        """
+        if user_ids is None:
+            user_ids = sorted(int(path.stem[1:]) for path in self.data_dir.glob("s[0-9][0-9].dat"))
+
+        subjects = {}
+        for user_id in user_ids:
+            path = self.subject_path(self.data_dir, user_id)
+            try:
+                subjects[user_id] = describe_subject(path, checksum)
+            except Exception as e:
+                logger.error(f"Error describing {path} for the manifest: {e}")
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created": time.time(),
+            "subjects": {str(user_id): entry for user_id, entry in subjects.items()},
+        }
+
+        try:
+            tmp_path = self.path.with_name(f".{MANIFEST_FILE}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(manifest, indent=2))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error writing dataset manifest {self.path}: {e}")
+            return False
+
+        self._subjects = subjects
+        logger.info(f"Dataset manifest written for {len(subjects)} subjects: {self.path}")
+        return True
+
+    def check(self, user_id: int) -> str | None:
+        """Check a subject file against its manifest entry with a single stat.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            None if the file matches, 'stale' if only its modification time
+            changed, or 'missing', 'unlisted' or 'size' describing the problem
+        """
+        entry = self.subjects.get(user_id)
+        if entry is None:
+            return "unlisted"
+
+        try:
+            stat = self.subject_path(self.data_dir, user_id).stat()
+        except OSError:
+            return "missing"
+
+        if stat.st_size != entry["size"]:
+            return "size"
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            return "stale"
+        return None
+
+    def validate(self) -> dict[int, str]:
+        """Check every subject listed in the manifest.
+
+        Returns:
+            Dictionary of user ID to problem for subjects that do not match
+        """
+        problems = {}
+        for user_id in self.subjects:
+            problem = self.check(user_id)
+            if problem is not None:
+                problems[user_id] = problem
+        return problems
+
+    def verify(self, user_id: int) -> bool:
+        """Re-hash a subject file and compare it with the recorded checksum.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the content hash matches
+        """
+        entry = self.subjects.get(user_id)
+        path = self.subject_path(self.data_dir, user_id)
+        if entry is None or entry["sha256"] is None or not path.exists():
+            return False
+        return file_checksum(path) == entry["sha256"]
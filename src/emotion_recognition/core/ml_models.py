@@ -1,17 +1,19 @@
 """Machine learning models for emotion classification."""
 
+import json
 import pickle
 from pathlib import Path
 from typing import Literal
 
 import numpy as np
 from loguru import logger
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.metrics import accuracy_score, confusion_matrix
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 
 from emotion_recognition.config import Settings
+from emotion_recognition.core.spill import astype_spilled, exceeds_budget, row_chunks
 
 ModelType = Literal["KNN", "SVM", "PCA+KNN", "PCA+SVM"]
 
@@ -26,19 +28,22 @@ class MLModelManager:
             settings: Application settings
         """
         self.settings = settings
+        self.dtype = np.dtype(settings.numeric_dtype)
+        self.memory_budget = settings.feature_memory_budget_mb * 1024 * 1024
 
         # Models for arousal and valence
         self.arousal_model: object | None = None
         self.valence_model: object | None = None
 
         # PCA transformers (if using PCA)
-        self.arousal_pca: PCA | None = None
-        self.valence_pca: PCA | None = None
+        self.arousal_pca: PCA | IncrementalPCA | None = None
+        self.valence_pca: PCA | IncrementalPCA | None = None
 
         # Training data (kept for reference)
         self.train_data: np.ndarray | None = None
         self.train_valence: np.ndarray | None = None
         self.train_arousal: np.ndarray | None = None
+        self.train_weight: np.ndarray | None = None
 
         # Test data
         self.test_data: np.ndarray | None = None
@@ -138,22 +143,111 @@ class MLModelManager:
         self.current_model_type = model_type
         logger.info(f"{model_type} models created successfully")
 
+    def _is_out_of_core(self, data: np.ndarray) -> bool:
+        """Check whether data is a disk-backed matrix above the memory budget.
+
+        Args:
+            data: Feature matrix
+
+        Returns:
+            True if the data should be processed in row blocks
+        """
+        return isinstance(data, np.memmap) and exceeds_budget(data.nbytes, self.memory_budget)
+
+    def _as_features(self, data: np.ndarray) -> np.ndarray:
+        """Convert data to the configured dtype without loading spilled matrices.
+
+        Args:
+            data: Feature matrix, in memory or memory-mapped
+
+        Returns:
+            Feature matrix in the configured dtype
+        """
+        if self._is_out_of_core(data) and data.dtype != self.dtype:
+            return astype_spilled(data, self.dtype, self.settings.spill_dir)
+        if isinstance(data, np.memmap) and data.dtype == self.dtype:
+            return data
+        return np.asarray(data, dtype=self.dtype)
+
+    def _row_blocks(self, data: np.ndarray, min_rows: int = 1) -> list[slice]:
+        """Get the row blocks used to stream a matrix.
+
+        Args:
+            data: Feature matrix
+            min_rows: Minimum rows per block
+
+        Returns:
+            One slice over all rows for in-memory data, else budget-sized blocks
+        """
+        if not self._is_out_of_core(data):
+            return [slice(0, len(data))]
+        return list(row_chunks(len(data), data[0].nbytes, min_rows))
+
+    def _fit_transform_pca(
+        self, pca: PCA, data: np.ndarray
+    ) -> tuple[PCA | IncrementalPCA, np.ndarray]:
+        """Fit a PCA transformer and project the data.
+
+        Spilled matrices are fitted with IncrementalPCA over row blocks, so
+        only one block and the reduced output are held in memory.
+
+        Args:
+            pca: Unfitted PCA transformer
+            data: Training data
+
+        Returns:
+            Tuple of (fitted transformer, projected data)
+        """
+        # Compact inputs such as band-power features have fewer dimensions
+        n_components = min(pca.n_components, *data.shape)
+        if n_components < pca.n_components:
+            logger.info(f"Reducing PCA to {n_components} components for {data.shape} data")
+            pca.set_params(n_components=n_components)
+
+        if not self._is_out_of_core(data):
+            return pca, pca.fit_transform(data)
+
+        blocks = self._row_blocks(data, min_rows=pca.n_components)
+        incremental = IncrementalPCA(n_components=pca.n_components)
+        for rows in blocks:
+            incremental.partial_fit(data[rows])
+        return incremental, self._transform(incremental, data)
+
+    def _transform(self, pca: PCA | IncrementalPCA, data: np.ndarray) -> np.ndarray:
+        """Project data with a fitted PCA transformer block by block.
+
+        Args:
+            pca: Fitted transformer
+            data: Data to project
+
+        Returns:
+            Projected data
+        """
+        return np.concatenate([pca.transform(data[rows]) for rows in self._row_blocks(data)])
+
     def set_training_data(
         self,
         data: np.ndarray,
         valence_labels: np.ndarray,
         arousal_labels: np.ndarray,
+        sample_weight: np.ndarray | None = None,
     ) -> None:
         """Set training data.
 
+        Memory-mapped matrices are kept on disk; they are only cast (block by
+        block into a new spilled matrix) when their dtype differs.
+
         Args:
-            data: Training data array
+            data: Training data array (converted to the configured dtype)
             valence_labels: Valence labels
             arousal_labels: Arousal labels
+            sample_weight: Per-row weights, e.g. from artifact weighting (all
+                rows weigh 1 if None)
         """
-        self.train_data = data
+        self.train_data = self._as_features(data)
         self.train_valence = valence_labels
         self.train_arousal = arousal_labels
+        self.train_weight = sample_weight
 
         logger.info(f"Training data set: {data.shape}")
 
@@ -166,19 +260,46 @@ class MLModelManager:
         """Set test data.
 
         Args:
-            data: Test data array
+            data: Test data array (converted to the configured dtype)
             valence_labels: Valence labels
             arousal_labels: Arousal labels
         """
-        self.test_data = data
+        self.test_data = self._as_features(data)
         self.test_valence = valence_labels
         self.test_arousal = arousal_labels
 
         logger.info(f"Test data set: {data.shape}")
 
+    def _weighted_training_set(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """Get the training rows and fit arguments that apply the sample weights.
+
+        SVC takes the weights as ``sample_weight``. KNeighborsClassifier has
+        no sample weights, so KNN models are fitted on the full-weight rows
+        only, and PCA is fitted on those same rows.
+
+        Returns:
+            Tuple of (data, valence_labels, arousal_labels, fit_kwargs)
+        """
+        data, valence, arousal = self.train_data, self.train_valence, self.train_arousal
+        weight = self.train_weight
+        if weight is None or (weight >= 1).all():
+            return data, valence, arousal, {}
+
+        if isinstance(self.arousal_model, SVC):
+            return data, valence, arousal, {"sample_weight": weight}
+
+        keep = np.flatnonzero(weight >= 1)
+        logger.info(f"Leaving {len(weight) - len(keep)} down-weighted rows out of KNN training")
+        return data[keep], valence[keep], arousal[keep], {}
+
     def train(self) -> bool:
         """Train the models.
 
+        Rows with a sample weight below 1 are weighted in SVM models and left
+        out of KNN models.
+
         Returns:
             True if training successful, False otherwise
         """
@@ -193,28 +314,34 @@ class MLModelManager:
         try:
             logger.info("Training models...")
 
-            train_data = self.train_data
+            train_data, train_valence, train_arousal, fit_kwargs = self._weighted_training_set()
+            if self._is_out_of_core(train_data) and self.arousal_pca is None:
+                logger.warning("Classifier without PCA will read the spilled data into memory")
 
             # Apply PCA if using PCA models
             if self.arousal_pca is not None:
                 logger.info("Applying PCA transformation for arousal...")
-                train_data_arousal = self.arousal_pca.fit_transform(train_data)
+                self.arousal_pca, train_data_arousal = self._fit_transform_pca(
+                    self.arousal_pca, train_data
+                )
             else:
                 train_data_arousal = train_data
 
             if self.valence_pca is not None:
                 logger.info("Applying PCA transformation for valence...")
-                train_data_valence = self.valence_pca.fit_transform(train_data)
+                self.valence_pca, train_data_valence = self._fit_transform_pca(
+                    self.valence_pca, train_data
+                )
             else:
                 train_data_valence = train_data
 
             # Train arousal model
             logger.info("Training arousal model...")
-            self.arousal_model.fit(train_data_arousal, self.train_arousal)
+            self.arousal_model.fit(train_data_arousal, train_arousal, **fit_kwargs)
 
             # Train valence model
             logger.info("Training valence model...")
-            self.valence_model.fit(train_data_valence, self.train_valence)
+            self.valence_model.fit(train_data_valence, train_valence, **fit_kwargs)
 
             logger.info("Training completed successfully")
             return True
@@ -240,22 +367,32 @@ class MLModelManager:
         try:
             logger.info("Running predictions...")
 
-            test_data = self.test_data
+            test_data = self._as_features(self.test_data)
 
             # Apply PCA if using PCA models
             if self.arousal_pca is not None:
-                test_data_arousal = self.arousal_pca.transform(test_data)
+                test_data_arousal = self._transform(self.arousal_pca, test_data)
             else:
                 test_data_arousal = test_data
 
             if self.valence_pca is not None:
-                test_data_valence = self.valence_pca.transform(test_data)
+                test_data_valence = self._transform(self.valence_pca, test_data)
             else:
                 test_data_valence = test_data
 
-            # Predict
-            self.pred_arousal = self.arousal_model.predict(test_data_arousal)
-            self.pred_valence = self.valence_model.predict(test_data_valence)
+            # Predict (block by block for spilled data)
+            self.pred_arousal = np.concatenate(
+                [
+                    self.arousal_model.predict(test_data_arousal[rows])
+                    for rows in self._row_blocks(test_data_arousal)
+                ]
+            )
+            self.pred_valence = np.concatenate(
+                [
+                    self.valence_model.predict(test_data_valence[rows])
+                    for rows in self._row_blocks(test_data_valence)
+                ]
+            )
 
             logger.info("Predictions completed successfully")
             return True
@@ -300,6 +437,97 @@ class MLModelManager:
 
         return results
 
+    def check_dtype_parity(
+        self,
+        reference_train: np.ndarray,
+        reference_test: np.ndarray,
+        *,
+        reference_dtype: str = "float64",
+        tolerance: float = 0.01,
+    ) -> dict[str, float] | None:
+        """Compare accuracy against the same model trained in a reference dtype.
+
+        Trains a second manager on reference feature matrices and reports how
+        far this manager's results drift from it. The reference matrices must
+        come from the feature path run in ``reference_dtype`` (for example
+        ``EEGProcessor.prepare_feature_set`` with ``numeric_dtype`` set to
+        it); this manager's own data is already rounded to its dtype, so
+        re-casting it would only measure the classifier arithmetic. Requires
+        predict() to have been run on this manager.
+
+        Args:
+            reference_train: Training features computed in the reference dtype,
+                rows matching this manager's training labels
+            reference_test: Test features computed in the reference dtype,
+                rows matching this manager's test labels
+            reference_dtype: Reference floating point dtype
+            tolerance: Accuracy drift above which a warning is logged
+
+        Returns:
+            Dictionary with accuracies, drift and prediction disagreement, or
+            None if the comparison could not be run
+        """
+        results = self.get_results()
+        if results is None or self.current_model_type is None:
+            return None
+
+        for name, data, own in (
+            ("training", reference_train, self.train_data),
+            ("test", reference_test, self.test_data),
+        ):
+            if data.dtype != np.dtype(reference_dtype):
+                logger.error(f"Reference {name} data is {data.dtype}, not {reference_dtype}")
+                return None
+            if own is None or data.shape != own.shape:
+                logger.error(f"Reference {name} data does not match the {name} data shape")
+                return None
+
+        reference = MLModelManager(
+            self.settings.model_copy(update={"numeric_dtype": reference_dtype})
+        )
+        reference.create_model(self.current_model_type)
+        reference.set_training_data(
+            reference_train, self.train_valence, self.train_arousal, self.train_weight
+        )
+        reference.set_test_data(reference_test, self.test_valence, self.test_arousal)
+
+        if not reference.train() or not reference.predict():
+            logger.error("Reference model failed, dtype parity not checked")
+            return None
+
+        reference_results = reference.get_results()
+        if reference_results is None:
+            return None
+
+        parity = {
+            "arousal_accuracy": results["arousal_accuracy"],
+            "valence_accuracy": results["valence_accuracy"],
+            "reference_arousal_accuracy": reference_results["arousal_accuracy"],
+            "reference_valence_accuracy": reference_results["valence_accuracy"],
+            "arousal_drift": abs(
+                results["arousal_accuracy"] - reference_results["arousal_accuracy"]
+            ),
+            "valence_drift": abs(
+                results["valence_accuracy"] - reference_results["valence_accuracy"]
+            ),
+            "arousal_disagreement": float(
+                np.mean(results["arousal_predictions"] != reference_results["arousal_predictions"])
+            ),
+            "valence_disagreement": float(
+                np.mean(results["valence_predictions"] != reference_results["valence_predictions"])
+            ),
+        }
+
+        max_drift = max(parity["arousal_drift"], parity["valence_drift"])
+        if max_drift > tolerance:
+            logger.warning(
+                f"{self.dtype.name} accuracy drifts {max_drift:.4f} from {reference_dtype}"
+            )
+        else:
+            logger.info(f"{self.dtype.name} accuracy within {tolerance} of {reference_dtype}")
+
+        return parity
+
     def save_models(self, path: Path | None = None) -> bool:
         """Save trained models to disk.
 
@@ -340,6 +568,17 @@ class MLModelManager:
                 with open(valence_pca_path, "wb") as f:
                     pickle.dump(self.valence_pca, f)
 
+            # Save metadata needed to feed the models at inference time
+            metadata = {
+                "model_type": self.current_model_type,
+                "dtype": self.dtype.name,
+                "feature_mode": self.settings.feature_mode,
+                "decimation_factor": self.settings.decimation_factor,
+                "n_features": None if self.train_data is None else int(self.train_data.shape[1]),
+            }
+            with open(path / "model_meta.json", "w") as f:
+                json.dump(metadata, f, indent=2)
+
             logger.info(f"Models saved to {path}")
             return True
 
@@ -386,6 +625,26 @@ class MLModelManager:
                 with open(valence_pca_path, "rb") as f:
                     self.valence_pca = pickle.load(f)
 
+            # Restore the dtype the models were trained with
+            meta_path = path / "model_meta.json"
+            if meta_path.exists():
+                with open(meta_path) as f:
+                    metadata = json.load(f)
+                self.current_model_type = metadata.get("model_type")
+                self.dtype = np.dtype(metadata.get("dtype", self.dtype.name))
+                feature_mode = metadata.get("feature_mode", "raw")
+                if feature_mode != self.settings.feature_mode:
+                    logger.warning(
+                        f"Models were trained on '{feature_mode}' features, "
+                        f"but feature_mode is '{self.settings.feature_mode}'"
+                    )
+                decimation_factor = metadata.get("decimation_factor", 1)
+                if decimation_factor != self.settings.decimation_factor:
+                    logger.warning(
+                        f"Models were trained on features decimated by {decimation_factor}, "
+                        f"but decimation_factor is {self.settings.decimation_factor}"
+                    )
+
             logger.info(f"Models loaded from {path}")
             return True
 
@@ -0,0 +1,134 @@
+"""Disk-backed arrays for feature matrices that exceed the memory budget."""
+
+import contextlib
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+# Target size of the row blocks processed at a time when streaming a spilled array
+SPILL_CHUNK_BYTES = 64 * 1024 * 1024
+
+# RAM-backed filesystem preferred for arrays shared between processes
+SHM_DIR = Path("/dev/shm")
+
+
+def exceeds_budget(nbytes: int, budget_bytes: int) -> bool:
+    """Check whether an array of a given size should be spilled to disk.
+
+    Args:
+        nbytes: Array size in bytes
+        budget_bytes: Memory budget in bytes (0 means unlimited)
+
+    Returns:
+        True if the array does not fit the budget
+    """
+    return budget_bytes > 0 and nbytes > budget_bytes
+
+
+def free_bytes(directory: Path) -> int:
+    """Get the space available to unprivileged writers in a directory.
+
+    Args:
+        directory: Directory on the filesystem to check
+
+    Returns:
+        Free bytes (0 if the directory cannot be queried)
+    """
+    try:
+        stats = os.statvfs(directory)
+    except (OSError, AttributeError):
+        return 0
+    return stats.f_bavail * stats.f_frsize
+
+
+def shared_array_dir(nbytes: int, spill_dir: Path | None = None) -> Path:
+    """Choose the directory for the backing file of an array shared between processes.
+
+    Files in tmpfs are sparse until written, so an array larger than the free
+    tmpfs space is only detected when a writer faults (SIGBUS). The array
+    therefore goes to ``SHM_DIR`` only if it fits there.
+
+    Args:
+        nbytes: Array size in bytes
+        spill_dir: Directory to use instead of RAM (the temp directory if None)
+
+    Returns:
+        Directory for the backing file
+    """
+    if spill_dir is None and SHM_DIR.is_dir() and free_bytes(SHM_DIR) >= nbytes:
+        return SHM_DIR
+    directory = Path(tempfile.gettempdir()) if spill_dir is None else spill_dir
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def spill_array(shape: tuple[int, ...], dtype: np.dtype, directory: Path) -> np.memmap:
+    """Allocate an anonymous disk-backed array.
+
+    The backing file is unlinked right away, so its disk space is released as
+    soon as the array is garbage collected. On platforms that cannot unlink
+    open files it stays behind in ``directory``.
+
+    Args:
+        shape: Array shape
+        dtype: Array dtype
+        directory: Directory for the backing file
+
+    Returns:
+        Writable memory-mapped array
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="spill_", suffix=".dat", dir=directory)
+    os.close(fd)
+
+    try:
+        return np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    finally:
+        # The mapping stays valid after unlinking on POSIX systems
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
+
+def row_chunks(
+    n_rows: int, row_nbytes: int, min_rows: int = 1, chunk_bytes: int = SPILL_CHUNK_BYTES
+) -> Iterator[slice]:
+    """Split rows into blocks of about ``chunk_bytes`` each.
+
+    Args:
+        n_rows: Number of rows
+        row_nbytes: Size of one row in bytes
+        min_rows: Minimum rows per block (the last block absorbs a short tail)
+        chunk_bytes: Target block size in bytes
+
+    Yields:
+        Row slices covering all rows in order
+    """
+    step = max(chunk_bytes // max(row_nbytes, 1), min_rows, 1)
+    start = 0
+    while start < n_rows:
+        stop = start + step
+        if n_rows - stop < min_rows:
+            stop = n_rows
+        yield slice(start, stop)
+        start = stop
+
+
+def astype_spilled(array: np.ndarray, dtype: np.dtype, directory: Path) -> np.memmap:
+    """Cast a large array into a new disk-backed array block by block.
+
+    Args:
+        array: Source array (typically memory-mapped)
+        dtype: Target dtype
+        directory: Directory for the backing file
+
+    Returns:
+        Memory-mapped array of the target dtype
+    """
+    out = spill_array(array.shape, dtype, directory)
+    row_nbytes = int(np.prod(array.shape[1:], dtype=np.int64)) * np.dtype(dtype).itemsize
+    for rows in row_chunks(len(array), row_nbytes):
+        out[rows] = array[rows]
+    return out
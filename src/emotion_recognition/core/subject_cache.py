@@ -0,0 +1,142 @@
+"""Bounded in-memory cache for decoded EEG subjects."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+
+def resident_nbytes(value: Any) -> int:
+    """Estimate the RAM held by a cached value.
+
+    Memory-mapped arrays are backed by the OS page cache rather than the
+    process heap, so they count as zero bytes.
+
+    Args:
+        value: Array, dict/list/tuple of arrays, or an object reporting its
+            own ``nbytes``
+
+    Returns:
+        Number of bytes held in process memory
+    """
+    if isinstance(value, np.memmap):
+        return 0
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(resident_nbytes(v) for v in value.values())
+    if isinstance(value, list | tuple):
+        return sum(resident_nbytes(v) for v in value)
+    return int(getattr(value, "nbytes", 0))
+
+
+class SubjectCache:
+    """Thread-safe LRU cache bounded by both entry count and resident bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum total resident bytes (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Get number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check membership without touching recency or counters."""
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        """Get total resident bytes of cached entries."""
+        return self._bytes
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get a cached value and mark it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Insert a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+
+        Returns:
+            True if the value was cached, False if it exceeds the byte budget
+        """
+        size = resident_nbytes(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes
+            ):
+                evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+                logger.debug(f"Evicted {evicted_key} from subject cache")
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+            return True
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current usage
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,140 @@
+"""Prefix-sum index for constant-time statistics over time windows."""
+
+import numpy as np
+
+
+class PrefixStats:
+    """Cumulative sums and sums of squares of signals along their last axis.
+
+    Building the index is one pass over the samples; after that the mean,
+    variance, energy and RMS of any [start, end) window cost two lookups per
+    sum, whatever the window length. Start and end may be integers or 1D
+    arrays of equal length, so many windows are answered in one vectorized
+    query.
+
+    The signals are shifted by their own mean before accumulating, which
+    keeps the variance free of cancellation error for signals with a large
+    DC offset.
+    """
+
+    def __init__(self, data: np.ndarray) -> None:
+        """Build the index.
+
+        Args:
+            data: Signals of shape (..., n_samples)
+        """
+        self.n_samples = data.shape[-1]
+        self.shift = data.mean(axis=-1, keepdims=True, dtype=np.float64)
+
+        shape = (*data.shape[:-1], self.n_samples + 1)
+        self._sum = np.zeros(shape)
+        self._sum_sq = np.zeros(shape)
+        centered = data - self.shift
+        np.cumsum(centered, axis=-1, out=self._sum[..., 1:])
+        np.square(centered, out=centered)
+        np.cumsum(centered, axis=-1, out=self._sum_sq[..., 1:])
+
+    @property
+    def nbytes(self) -> int:
+        """Get the memory held by the index in bytes."""
+        return self._sum.nbytes + self._sum_sq.nbytes + self.shift.nbytes
+
+    def _window_sums(
+        self, start: int | np.ndarray, end: int | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the centered sums of windows.
+
+        Args:
+            start: Window start samples (inclusive)
+            end: Window end samples (exclusive)
+
+        Returns:
+            Tuple of (count, sum, sum_of_squares); with array bounds the
+            windows are on the last axis
+        """
+        start = np.clip(start, 0, self.n_samples)
+        end = np.clip(end, start, self.n_samples)
+        count = end - start
+        total = self._sum[..., end] - self._sum[..., start]
+        total_sq = self._sum_sq[..., end] - self._sum_sq[..., start]
+        return count, total, total_sq
+
+    def mean(self, start: int | np.ndarray, end: int | np.ndarray) -> np.ndarray:
+        """Get the mean of windows (NaN for empty windows).
+
+        Args:
+            start: Window start samples (inclusive)
+            end: Window end samples (exclusive)
+
+        Returns:
+            Mean of shape (...) for scalar bounds, else (..., n_windows)
+        """
+        count, total, _ = self._window_sums(start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._shift_for(total) + total / count
+
+    def variance(self, start: int | np.ndarray, end: int | np.ndarray) -> np.ndarray:
+        """Get the population variance of windows (NaN for empty windows).
+
+        Args:
+            start: Window start samples (inclusive)
+            end: Window end samples (exclusive)
+
+        Returns:
+            Variance of shape (...) for scalar bounds, else (..., n_windows)
+        """
+        count, total, total_sq = self._window_sums(start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            return np.maximum(total_sq / count - mean * mean, 0.0)
+
+    def energy(self, start: int | np.ndarray, end: int | np.ndarray) -> np.ndarray:
+        """Get the energy (sum of squared samples) of windows.
+
+        Args:
+            start: Window start samples (inclusive)
+            end: Window end samples (exclusive)
+
+        Returns:
+            Energy of shape (...) for scalar bounds, else (..., n_windows)
+        """
+        return self._energy(*self._window_sums(start, end))
+
+    def rms(self, start: int | np.ndarray, end: int | np.ndarray) -> np.ndarray:
+        """Get the root mean square of windows (NaN for empty windows).
+
+        Args:
+            start: Window start samples (inclusive)
+            end: Window end samples (exclusive)
+
+        Returns:
+            RMS of shape (...) for scalar bounds, else (..., n_windows)
+        """
+        count, total, total_sq = self._window_sums(start, end)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self._energy(count, total, total_sq) / count)
+
+    def _energy(self, count: np.ndarray, total: np.ndarray, total_sq: np.ndarray) -> np.ndarray:
+        """Undo the shift on centered window sums to get the signal energy.
+
+        Args:
+            count: Window lengths
+            total: Centered window sums
+            total_sq: Centered window sums of squares
+
+        Returns:
+            Sum of squared original samples per window
+        """
+        shift = self._shift_for(total)
+        return total_sq + 2 * shift * total + count * shift * shift
+
+    def _shift_for(self, sums: np.ndarray) -> np.ndarray:
+        """Broadcast the per-signal shift against window sums.
+
+        Args:
+            sums: Window sums of shape (...) or (..., n_windows)
+
+        Returns:
+            Shift broadcastable to the sums
+        """
+        return self.shift if sums.ndim == self.shift.ndim else self.shift[..., 0]
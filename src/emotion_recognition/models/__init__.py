@@ -0,0 +1,18 @@
+"""Data models for EEG trials and face detections."""
+
+from emotion_recognition.models.eeg import EEGData, EmotionLabel
+from emotion_recognition.models.face import (
+    BoundingBox,
+    FaceDetection,
+    FaceDetectionResult,
+    FaceKeypoints,
+)
+
+__all__ = [
+    "BoundingBox",
+    "EEGData",
+    "EmotionLabel",
+    "FaceDetection",
+    "FaceDetectionResult",
+    "FaceKeypoints",
+]
@@ -0,0 +1,58 @@
+"""Data models for EEG trials and their emotion labels."""
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class EmotionLabel(BaseModel):
+    """Self-assessed emotion ratings of a trial on the DEAP 1-9 scale."""
+
+    model_config = ConfigDict(frozen=True)
+
+    valence: float = Field(ge=1.0, le=9.0, description="Valence rating")
+    arousal: float = Field(ge=1.0, le=9.0, description="Arousal rating")
+    dominance: float = Field(ge=1.0, le=9.0, description="Dominance rating")
+    liking: float = Field(ge=1.0, le=9.0, description="Liking rating")
+
+    def to_binary(self, threshold: float = 4.5) -> dict[str, int]:
+        """Convert valence and arousal to high (1) / low (0) classes.
+
+        Args:
+            threshold: Ratings above this value are high
+
+        Returns:
+            Dictionary with binary 'valence' and 'arousal' classes
+        """
+        return {
+            "valence": int(self.valence > threshold),
+            "arousal": int(self.arousal > threshold),
+        }
+
+
+class EEGData(BaseModel):
+    """Multi-channel EEG recording of one trial with its label."""
+
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
+
+    data: np.ndarray = Field(description="Signals of shape (n_channels, n_samples)")
+    label: EmotionLabel = Field(description="Emotion ratings of the trial")
+    user_id: int = Field(description="Subject number")
+    trial_id: int = Field(description="Trial index within the subject")
+
+    @field_validator("data")
+    @classmethod
+    def validate_data(cls, data: np.ndarray) -> np.ndarray:
+        """Ensure the signals are a 2D channel by sample array.
+
+        Args:
+            data: EEG signals
+
+        Returns:
+            The validated signals
+
+        Raises:
+            ValueError: If the array is not 2D
+        """
+        if data.ndim != 2:
+            raise ValueError(f"EEG data must be 2D (n_channels, n_samples), got shape {data.shape}")
+        return data
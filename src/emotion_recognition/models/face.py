@@ -0,0 +1,65 @@
+"""Data models for face detection results."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BoundingBox(BaseModel):
+    """Axis-aligned face bounding box in pixel coordinates."""
+
+    model_config = ConfigDict(frozen=True)
+
+    x: int = Field(description="Left edge")
+    y: int = Field(description="Top edge")
+    width: int = Field(description="Box width")
+    height: int = Field(description="Box height")
+
+    def to_tuple(self) -> tuple[int, int, int, int]:
+        """Return the box as an OpenCV-style (x, y, width, height) tuple."""
+        return (self.x, self.y, self.width, self.height)
+
+    def get_center(self) -> tuple[int, int]:
+        """Return the integer center point of the box."""
+        return (self.x + self.width // 2, self.y + self.height // 2)
+
+    def get_area(self) -> int:
+        """Return the box area in pixels."""
+        return self.width * self.height
+
+
+class FaceKeypoints(BaseModel):
+    """Facial landmark positions in pixel coordinates."""
+
+    model_config = ConfigDict(frozen=True)
+
+    left_eye: tuple[int, int] = Field(description="Left eye center")
+    right_eye: tuple[int, int] = Field(description="Right eye center")
+    nose: tuple[int, int] = Field(description="Nose tip")
+    mouth_left: tuple[int, int] = Field(description="Left mouth corner")
+    mouth_right: tuple[int, int] = Field(description="Right mouth corner")
+
+
+class FaceDetection(BaseModel):
+    """A single detected face."""
+
+    model_config = ConfigDict(frozen=True)
+
+    box: BoundingBox = Field(description="Face bounding box")
+    confidence: float = Field(ge=0.0, le=1.0, description="Detection confidence")
+    keypoints: FaceKeypoints | None = Field(default=None, description="Facial landmarks")
+
+
+class FaceDetectionResult(BaseModel):
+    """All faces detected in one frame."""
+
+    model_config = ConfigDict(frozen=True)
+
+    faces: list[FaceDetection] = Field(default_factory=list, description="Detected faces")
+    processing_time_ms: float = Field(ge=0.0, description="Detection time in milliseconds")
+
+    def __len__(self) -> int:
+        """Return the number of detected faces."""
+        return len(self.faces)
+
+    def has_faces(self) -> bool:
+        """Return True if at least one face was detected."""
+        return bool(self.faces)
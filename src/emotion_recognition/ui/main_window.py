@@ -27,6 +27,7 @@ from emotion_recognition.config import Settings
 from emotion_recognition.core.camera import CameraManager
 from emotion_recognition.core.eeg_processor import EEGProcessor
 from emotion_recognition.core.ml_models import MLModelManager, ModelType
+from emotion_recognition.ui.prefetch import SubjectPrefetcher
 from emotion_recognition.ui.styles import get_theme
 from emotion_recognition.ui.widgets.eeg_plot import EEGPlotWidget
 from emotion_recognition.utils.logger import get_logger
@@ -60,6 +61,7 @@ class MainWindow(QMainWindow):
         )
         self.eeg_processor = EEGProcessor(settings)
         self.ml_manager = MLModelManager(settings)
+        self.eeg_prefetcher = SubjectPrefetcher(self.eeg_processor)
 
         # UI state
         self.current_language = settings.language
@@ -69,7 +71,7 @@ class MainWindow(QMainWindow):
         self.eeg_user_data: dict | None = None
         self.eeg_current_user = settings.n_user_test_start
         self.eeg_current_trial = 0
-        self.eeg_current_time = 384
+        self.eeg_current_time = self._eeg_trial_start(self.eeg_current_user)
 
         # Timers
         self.camera_timer = QTimer()
@@ -505,6 +507,7 @@ class MainWindow(QMainWindow):
     def _connect_signals(self) -> None:
         """Connect UI signals to slots."""
         self.combo_language.currentTextChanged.connect(self._change_language)
+        self.eeg_prefetcher.ready.connect(self._on_eeg_user_ready)
 
     def _change_language(self, language: str) -> None:
         """Change application language.
@@ -588,12 +591,16 @@ class MainWindow(QMainWindow):
     # EEG tab methods
     def _start_eeg_visualization(self) -> None:
         """Start EEG data visualization."""
-        # Load initial data
-        self.eeg_user_data = self.eeg_processor.load_user_data(self.eeg_current_user)
+        # Load initial data (reusing a prefetched subject if one is waiting)
+        self.eeg_user_data = self.eeg_prefetcher.take(
+            self.eeg_current_user
+        ) or self.eeg_processor.load_playback_data(self.eeg_current_user)
         if self.eeg_user_data is None:
             self.status_message.emit("Failed to load EEG data")
             return
 
+        self._prefetch_next_eeg_user()
+
         self.eeg_timer.start(self.settings.plot_update_interval)
         self.btn_eeg_start.setEnabled(False)
         self.btn_eeg_stop.setEnabled(True)
@@ -608,8 +615,50 @@ class MainWindow(QMainWindow):
         self.status_message.emit("EEG visualization stopped")
         logger.info("EEG visualization stopped")
 
+    def _eeg_trial_start(self, user_id: int) -> int:
+        """Get the first sample after a user's pre-trial baseline.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Sample index where playback of each trial starts
+        """
+        info = self.eeg_processor.dataset.subject_info(user_id)
+        return 0 if info is None else info.baseline_samples
+
+    def _prefetch_next_eeg_user(self) -> None:
+        """Start loading the user after the current one in the background."""
+        next_user = self.eeg_current_user + 1
+        if next_user <= self.settings.n_user_test_end:
+            self.eeg_prefetcher.request(next_user)
+
+    def _on_eeg_user_ready(self, user_id: int, success: bool) -> None:
+        """Resume playback when the user it is waiting for has been loaded.
+
+        Args:
+            user_id: Loaded user ID
+            success: Whether the load succeeded
+        """
+        if (
+            self.eeg_user_data is not None
+            or user_id != self.eeg_current_user
+            or not self.eeg_timer.isActive()
+        ):
+            return
+
+        self.eeg_user_data = self.eeg_prefetcher.take(user_id)
+        if not success or self.eeg_user_data is None:
+            self._stop_eeg_visualization()
+            self.status_message.emit(f"Failed to load EEG data for user {user_id}")
+            return
+
+        self.status_message.emit(f"EEG visualization resumed with user {user_id}")
+        self._prefetch_next_eeg_user()
+
     def _update_eeg_plots(self) -> None:
         """Update EEG plots."""
+        # Waiting for the prefetcher: skip this tick instead of blocking the GUI
         if self.eeg_user_data is None:
             return
 
@@ -618,17 +667,19 @@ class MainWindow(QMainWindow):
             self.eeg_user_data, self.eeg_current_trial + 1, self.eeg_current_user
         )
 
+        n_samples = 0
         if eeg_data is not None:
             # Update plots
             self.eeg_plot_widget.update_plots(eeg_data, self.eeg_current_time, 2000)
+            n_samples = eeg_data.data.shape[1]
 
-        # Update time/trial/user indices
+        # Update time/trial/user indices (trial lengths and counts come from the data)
         self.eeg_current_time += 2000
-        if self.eeg_current_time >= 8064:
-            self.eeg_current_time = 384
+        if self.eeg_current_time >= n_samples:
+            self.eeg_current_time = self._eeg_trial_start(self.eeg_current_user)
             self.eeg_current_trial += 1
 
-            if self.eeg_current_trial >= 40:
+            if self.eeg_current_trial >= len(self.eeg_user_data["data"]):
                 self.eeg_current_trial = 0
                 self.eeg_current_user += 1
 
@@ -636,8 +687,17 @@ class MainWindow(QMainWindow):
                     self._stop_eeg_visualization()
                     return
 
-                # Load next user data
-                self.eeg_user_data = self.eeg_processor.load_user_data(self.eeg_current_user)
+                self.eeg_current_time = self._eeg_trial_start(self.eeg_current_user)
+
+                # Hand over the prefetched user, or wait for it without blocking
+                self.eeg_user_data = self.eeg_prefetcher.take(self.eeg_current_user)
+                if self.eeg_user_data is not None:
+                    self._prefetch_next_eeg_user()
+                else:
+                    self.eeg_prefetcher.request(self.eeg_current_user)
+                    self.status_message.emit(
+                        f"Waiting for EEG data of user {self.eeg_current_user}..."
+                    )
 
     # ML tab methods
     def _process_raw_data(self) -> None:
@@ -646,32 +706,27 @@ class MainWindow(QMainWindow):
         self.ml_progress.setValue(0)
         self.status_message.emit("Processing raw data...")
 
-        # Process training data
-        train_data, train_val, train_ar = self.eeg_processor.process_raw_data_batch(
-            (self.settings.n_user_train_start, self.settings.n_user_train_end),
-            (1, 40),
-            (384, 8064),
+        # Process training data (served from the feature cache when unchanged)
+        train_data, train_val_binary, train_ar_binary, train_weight = (
+            self.eeg_processor.prepare_feature_set(
+                (self.settings.n_user_train_start, self.settings.n_user_train_end),
+                with_weights=True,
+            )
         )
 
         self.ml_progress.setValue(50)
 
         # Process test data
-        test_data, test_val, test_ar = self.eeg_processor.process_raw_data_batch(
-            (self.settings.n_user_test_start, self.settings.n_user_test_end),
-            (1, 40),
-            (384, 8064),
+        test_data, test_val_binary, test_ar_binary = self.eeg_processor.prepare_feature_set(
+            (self.settings.n_user_test_start, self.settings.n_user_test_end)
         )
 
         self.ml_progress.setValue(100)
 
-        # Convert to binary labels
-        train_val_binary = self.eeg_processor.labels_to_binary(train_val)
-        train_ar_binary = self.eeg_processor.labels_to_binary(train_ar)
-        test_val_binary = self.eeg_processor.labels_to_binary(test_val)
-        test_ar_binary = self.eeg_processor.labels_to_binary(test_ar)
-
         # Set data in ML manager
-        self.ml_manager.set_training_data(train_data, train_val_binary, train_ar_binary)
+        self.ml_manager.set_training_data(
+            train_data, train_val_binary, train_ar_binary, train_weight
+        )
         self.ml_manager.set_test_data(test_data, test_val_binary, test_ar_binary)
 
         self.status_message.emit("Raw data processed successfully")
@@ -748,5 +803,8 @@ class MainWindow(QMainWindow):
         # Close camera
         self.camera_manager.close()
 
+        # Let background subject loads finish before teardown
+        self.eeg_prefetcher.wait()
+
         logger.info("Application closing")
         event.accept()
@@ -0,0 +1,115 @@
+"""Background loading of EEG subjects for playback."""
+
+import threading
+
+from loguru import logger
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from emotion_recognition.core.eeg_processor import EEGProcessor
+
+
+class _LoadSubjectTask(QRunnable):
+    """Runnable that loads one subject and hands it to the prefetcher."""
+
+    def __init__(self, prefetcher: "SubjectPrefetcher", user_id: int) -> None:
+        """Initialize task.
+
+        Args:
+            prefetcher: Prefetcher receiving the result
+            user_id: User ID to load
+        """
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.user_id = user_id
+
+    def run(self) -> None:
+        """Load the subject on a pool thread."""
+        user_data = self.prefetcher.eeg_processor.load_playback_data(self.user_id)
+        self.prefetcher._finish(self.user_id, user_data)
+
+
+class SubjectPrefetcher(QObject):
+    """Loads upcoming EEG subjects on a worker thread while playback continues.
+
+    ``ready`` is emitted on the GUI thread once a requested subject has been
+    loaded (or failed to load), and ``take`` hands it over without blocking.
+    """
+
+    # Signals
+    ready = pyqtSignal(int, bool)
+
+    def __init__(self, eeg_processor: EEGProcessor) -> None:
+        """Initialize prefetcher.
+
+        Args:
+            eeg_processor: EEG processor used to load subjects
+        """
+        super().__init__()
+
+        self.eeg_processor = eeg_processor
+
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._results: dict[int, dict | None] = {}
+
+    def request(self, user_id: int) -> None:
+        """Start loading a subject in the background if not already loaded or loading.
+
+        Args:
+            user_id: User ID to load
+        """
+        with self._lock:
+            if user_id in self._pending or user_id in self._results:
+                return
+            self._pending.add(user_id)
+
+        logger.debug(f"Prefetching EEG data for user {user_id}")
+        self._pool.start(_LoadSubjectTask(self, user_id))
+
+    def is_pending(self, user_id: int) -> bool:
+        """Check whether a subject is still being loaded.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            True if the load has been requested and has not finished yet
+        """
+        with self._lock:
+            return user_id in self._pending
+
+    def take(self, user_id: int) -> dict | None:
+        """Hand over a loaded subject without blocking.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Loaded subject data, or None if it is not ready or failed to load
+        """
+        with self._lock:
+            return self._results.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop loaded subjects that were never taken."""
+        with self._lock:
+            self._results.clear()
+
+    def wait(self) -> None:
+        """Block until all outstanding loads have finished."""
+        self._pool.waitForDone()
+
+    def _finish(self, user_id: int, user_data: dict | None) -> None:
+        """Store a finished load and notify listeners.
+
+        Args:
+            user_id: User ID
+            user_data: Loaded subject data or None on failure
+        """
+        with self._lock:
+            self._pending.discard(user_id)
+            self._results[user_id] = user_data
+
+        self.ready.emit(user_id, user_data is not None)
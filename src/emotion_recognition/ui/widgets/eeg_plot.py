@@ -149,17 +149,14 @@ class EEGPlotWidget(QWidget):
         active_channels = self.eeg_processor.active_channels
         channel_map = self.eeg_processor.channel_map
 
-        for idx, channel_name in enumerate(active_channels):
-            # Get channel data
-            channel_idx = channel_map[channel_name]
-            end_time = min(start_time + window_size, eeg_data.data.shape[1])
-            channel_data = eeg_data.data[channel_idx, start_time:end_time]
-
-            # Compute FFT
-            fft_freq, fft_db = self.eeg_processor.compute_fft(channel_data, sampling_rate=60)
+        # Compute the spectra of all active channels in one FFT call
+        channel_indices = [channel_map[channel_name] for channel_name in active_channels]
+        end_time = min(start_time + window_size, eeg_data.data.shape[1])
+        window_data = eeg_data.data[channel_indices, start_time:end_time]
+        fft_freq, fft_db = self.eeg_processor.compute_fft(window_data, sampling_rate=60)
 
-            # Plot
-            ax.plot(fft_freq, fft_db, label=channel_name, color=f"C{idx}", linewidth=1.5)
+        for idx, channel_name in enumerate(active_channels):
+            ax.plot(fft_freq, fft_db[idx], label=channel_name, color=f"C{idx}", linewidth=1.5)
 
         # Styling
         ax.set_title("FFT Spectrum", color="#2196F3", fontsize=12, fontweight="bold")
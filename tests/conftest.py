@@ -13,3 +13,57 @@ import sys
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from emotion_recognition.core.manifest import DatasetManifest
+
+
+def write_deap_subjects(
+    root: Path,
+    n_users: int = 2,
+    n_trials: int = 40,
+    n_channels: int = 40,
+    n_samples: int = 128,
+) -> Path:
+    """Write small synthetic DEAP-style ``sNN.dat`` pickles.
+
+    Args:
+        root: Directory to write the subject files to
+        n_users: Number of subjects
+        n_trials: Trials per subject
+        n_channels: Channels per trial
+        n_samples: Samples per channel
+
+    Returns:
+        The directory containing the subject files
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(0)
+    for user_id in range(1, n_users + 1):
+        subject = {
+            "data": rng.standard_normal((n_trials, n_channels, n_samples)) * 50.0,
+            "labels": rng.uniform(1.0, 9.0, (n_trials, 4)),
+        }
+        with open(root / f"s{user_id:02d}.dat", "wb") as f:
+            pickle.dump(subject, f)
+    return root
+
+
+@pytest.fixture
+def deap_dir(tmp_path: Path) -> Path:
+    """Directory with two synthetic DEAP subjects."""
+    return write_deap_subjects(tmp_path / "deap")
+
+
+@pytest.fixture
+def long_deap_dir(tmp_path: Path) -> Path:
+    """Directory with two synthetic DEAP subjects whose trials outlast the 384-sample baseline."""
+    root = write_deap_subjects(tmp_path / "deap_long", n_samples=600)
+    # The manifest records the trial length, which otherwise defaults to n_time_total
+    assert DatasetManifest(root).generate()
+    return root
@@ -0,0 +1,48 @@
+"""Tests for artifact detection."""
+
+import numpy as np
+
+from emotion_recognition.core.artifacts import ArtifactThresholds, artifact_masks, epoch_weights
+
+
+def test_each_check_flags_its_artifact() -> None:
+    """Test that blinks, pops, flat channels and muscle noise are told apart."""
+    rng = np.random.default_rng(0)
+    t = np.arange(256) / 128
+    # Random walks: clean EEG-like channels with most power at low frequencies
+    epochs = np.cumsum(rng.standard_normal((2, 5, 256)), axis=-1)
+    epochs[0, 0, 100:110] += 300  # Blink
+    epochs[0, 1] = np.linspace(-90, 90, 256)  # Drift: large range, small deviation
+    epochs[0, 2] = 4.0  # Flat channel
+    epochs[1, 3] = 10 * np.sin(2 * np.pi * 45 * t)  # Muscle
+
+    masks = artifact_masks(epochs, 128, ArtifactThresholds(), 128)
+
+    assert set(masks) == {"amplitude", "peak_to_peak", "flatline", "high_frequency"}
+    assert masks["amplitude"].shape == (2, 5)
+    assert np.argwhere(masks["amplitude"]).tolist() == [[0, 0]]
+    assert np.argwhere(masks["peak_to_peak"]).tolist() == [[0, 0], [0, 1]]
+    assert np.argwhere(masks["flatline"]).tolist() == [[0, 2]]
+    assert np.argwhere(masks["high_frequency"]).tolist() == [[1, 3]]
+
+
+def test_disabled_checks_are_skipped() -> None:
+    """Test that zero limits turn checks off."""
+    epochs = np.zeros((3, 64))
+
+    masks = artifact_masks(epochs, 128, ArtifactThresholds(0, 0, 0, 0), 64)
+
+    assert masks == {}
+
+
+def test_epoch_weights_fall_with_flagged_channels() -> None:
+    """Test that clean epochs weigh 1 and fully flagged epochs the configured weight."""
+    mask = np.zeros((2, 3, 4), dtype=bool)
+    mask[0, 1, :2] = True
+    mask[1, 2] = True
+
+    weights = epoch_weights(mask, 0.2)
+
+    assert weights.shape == (2, 3)
+    np.testing.assert_allclose(weights[0], [1.0, 0.6, 1.0])
+    np.testing.assert_allclose(weights[1], [1.0, 1.0, 0.2])
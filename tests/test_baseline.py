@@ -0,0 +1,36 @@
+"""Tests for baseline correction."""
+
+import numpy as np
+import pytest
+
+from emotion_recognition.core.baseline import baseline_correct
+
+
+def test_baseline_correct_broadcasts_over_trials() -> None:
+    """Test that every channel of every trial is corrected by its own baseline."""
+    rng = np.random.default_rng(0)
+    trials = rng.standard_normal((6, 4, 200)) * 3 + rng.uniform(-50, 50, (6, 4, 1))
+    baseline, window = trials[..., :50], trials[..., 50:]
+
+    subtracted = baseline_correct(window, baseline)
+    scored = baseline_correct(window, baseline, "zscore")
+
+    for trial in range(6):
+        for channel in range(4):
+            reference = baseline[trial, channel]
+            np.testing.assert_allclose(
+                subtracted[trial, channel], window[trial, channel] - reference.mean()
+            )
+            np.testing.assert_allclose(
+                scored[trial, channel],
+                (window[trial, channel] - reference.mean()) / reference.std(),
+            )
+
+
+def test_baseline_correct_flat_and_unknown_mode() -> None:
+    """Test that flat baselines stay finite and unknown modes are rejected."""
+    flat = np.ones((2, 10))
+
+    assert np.isfinite(baseline_correct(flat, flat, "zscore")).all()
+    with pytest.raises(ValueError, match="Unknown baseline"):
+        baseline_correct(flat, flat, "percent")
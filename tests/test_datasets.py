@@ -0,0 +1,82 @@
+"""Tests for the dataset adapters."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from emotion_recognition.config import Settings
+from emotion_recognition.core.datasets import ShardedDataset, write_sharded_dataset
+from emotion_recognition.core.eeg_processor import EEGProcessor
+
+
+def _subjects(lengths: dict[int, list[int]]) -> list[tuple[int, list[np.ndarray], np.ndarray]]:
+    rng = np.random.default_rng(0)
+    return [
+        (
+            user_id,
+            [rng.standard_normal((32, n_samples)).astype(np.float32) for n_samples in trials],
+            rng.uniform(1.0, 9.0, (len(trials), 4)),
+        )
+        for user_id, trials in lengths.items()
+    ]
+
+
+@pytest.fixture
+def sharded_dir(tmp_path: Path) -> tuple[Path, list]:
+    """Sharded dataset with uniform and variable-length subjects across shards."""
+    subjects = _subjects({1: [300, 300, 300], 2: [250, 400], 7: [320, 280, 300, 260]})
+    root = tmp_path / "sharded"
+    write_sharded_dataset(
+        root, subjects, sampling_rate=128, baseline_samples=50, subjects_per_shard=2
+    )
+    return root, subjects
+
+
+def test_sharded_roundtrip(sharded_dir: tuple[Path, list]) -> None:
+    """Test that subjects load back as views with metadata from the index."""
+    root, subjects = sharded_dir
+    dataset = ShardedDataset(root)
+
+    assert dataset.user_ids() == [1, 2, 7]
+    info = dataset.subject_info(7)
+    assert info is not None
+    assert info.trial_lengths == (320, 280, 300, 260)
+    assert info.baseline_samples == 50
+    assert len({path.name for user_id in (1, 7) for path in dataset.source_files(user_id)}) == 4
+
+    for user_id, trials, labels in subjects:
+        loaded = dataset.load_subject(user_id, "pickle")
+        assert loaded is not None
+        np.testing.assert_array_equal(loaded["labels"], labels)
+        for expected, actual in zip(trials, loaded["data"], strict=True):
+            np.testing.assert_array_equal(actual, expected)
+
+    assert isinstance(dataset.load_subject(1, "pickle")["data"], np.ndarray)
+    assert isinstance(dataset.load_subject(2, "pickle")["data"], list)
+
+
+def test_processor_batch_on_sharded_dataset(sharded_dir: tuple[Path, list], tmp_path: Path) -> None:
+    """Test that batch sizes come from metadata and short trials are dropped."""
+    root, subjects = sharded_dir
+    settings = Settings(
+        raw_data_eeg_path=root,
+        dataset_format="sharded",
+        eeg_cache_dir=tmp_path / "cache",
+        feature_cache_dir=tmp_path / "features",
+    )
+    processor = EEGProcessor(settings)
+
+    plan = processor.plan_batch((1, 7))
+    data, valence, _ = processor.process_raw_data_batch((1, 7))
+
+    # Default window: after the baseline up to the shortest trial (250 samples)
+    assert plan["n_rows"] == 9
+    assert data.shape == (9, 5 * 200)
+    expected = subjects[1][1][1][[1, 3, 2, 4, 7], 50:250].reshape(-1)
+    np.testing.assert_array_equal(data[4], expected)
+
+    # An explicit window longer than some trials skips them
+    data, valence, _ = processor.process_raw_data_batch((1, 7), time_range=(0, 300))
+    assert data.shape == (6, 5 * 300)
+    np.testing.assert_array_equal(valence[4:], subjects[2][2][[0, 2], 0])
@@ -0,0 +1,547 @@
+"""Tests for EEG processor batch processing."""
+
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from emotion_recognition.config import Settings
+from emotion_recognition.core import eeg_processor, spill
+from emotion_recognition.core.artifacts import ArtifactThresholds, artifact_masks
+from emotion_recognition.core.eeg_processor import EEGProcessor
+from emotion_recognition.core.epochs import epoch_view
+from emotion_recognition.core.features import asymmetry_features
+from emotion_recognition.core.filters import decimate
+from emotion_recognition.core.ml_models import MLModelManager
+from emotion_recognition.core.spectral import EEG_BANDS, band_power_features
+from emotion_recognition.models.eeg import EEGData
+
+
+@pytest.fixture
+def make_processor(deap_dir: Path, tmp_path: Path) -> Callable[..., EEGProcessor]:
+    """Factory of processors reading the synthetic DEAP subjects with setting overrides."""
+
+    def make(**overrides: object) -> EEGProcessor:
+        settings = {
+            "raw_data_eeg_path": deap_dir,
+            "eeg_cache_dir": tmp_path / "cache",
+            "feature_cache_dir": tmp_path / "features",
+            "spill_dir": tmp_path / "spill",
+            **overrides,
+        }
+        return EEGProcessor(Settings(**settings))
+
+    return make
+
+
+@pytest.fixture
+def processor(make_processor: Callable[..., EEGProcessor]) -> EEGProcessor:
+    """Processor reading the synthetic DEAP subjects."""
+    return make_processor()
+
+
+# Artifact limits flagging some, but not all, epochs of the 50 uV synthetic noise
+AMPLITUDE_ONLY = {
+    "artifact_max_abs_uv": 165.0,
+    "artifact_max_ptp_uv": 0.0,
+    "artifact_flat_uv": 0.0,
+    "artifact_hf_ratio": 0.0,
+}
+
+
+def _active_rows(processor: EEGProcessor) -> list[int]:
+    """Get the raw channel rows of the active channels."""
+    return [processor.channel_map[ch] for ch in processor.active_channels]
+
+
+def test_batch_shape_and_labels(processor: EEGProcessor) -> None:
+    """Test that batch output has one row per trial and flattened active channels."""
+    data, valence, arousal = processor.process_raw_data_batch((1, 2), (1, 10), (0, 100))
+
+    assert data.shape == (20, len(processor.active_channels) * 100)
+    assert valence.shape == arousal.shape == (20,)
+
+
+def test_batch_skips_missing_users(processor: EEGProcessor) -> None:
+    """Test that users without a data file are skipped."""
+    data, _, _ = processor.process_raw_data_batch((1, 3), (1, 5), (0, 100))
+
+    assert data.shape[0] == 10
+
+
+def test_parallel_batch_matches_serial(processor: EEGProcessor) -> None:
+    """Test that the process pool produces the same rows in the same order."""
+    serial = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128), n_workers=1)
+    parallel = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128), n_workers=2)
+
+    for expected, actual in zip(serial, parallel, strict=True):
+        np.testing.assert_array_equal(expected, actual)
+
+
+@pytest.mark.parametrize("storage", ["memmap", "chunked"])
+def test_storage_backends_match_pickle(processor: EEGProcessor, storage: str) -> None:
+    """Test that converted storage backends return the same values as unpickling."""
+    pickled = processor.load_user_data(1, storage="pickle")
+    converted = processor.load_user_data(1, storage=storage)
+
+    assert pickled is not None
+    assert converted is not None
+    np.testing.assert_array_equal(pickled["data"], converted["data"])
+    np.testing.assert_array_equal(pickled["labels"], converted["labels"])
+
+
+def test_prepare_feature_set_uses_cache(processor: EEGProcessor) -> None:
+    """Test that a repeat run is served from the feature cache."""
+    first = processor.prepare_feature_set((1, 2), (1, 5), (0, 100))
+    second = processor.prepare_feature_set((1, 2), (1, 5), (0, 100))
+
+    assert len(processor.feature_cache.entries()) == 1
+    assert isinstance(second[0], np.memmap)
+    for expected, actual in zip(first, second, strict=True):
+        np.testing.assert_array_equal(expected, actual)
+
+    processor.set_active_channels(["AF3"])
+    processor.prepare_feature_set((1, 2), (1, 5), (0, 100))
+    assert len(processor.feature_cache.entries()) == 2
+
+    # Lossless backends share entries, lossy quantized storage gets its own
+    processor.settings = processor.settings.model_copy(update={"eeg_storage": "memmap"})
+    processor.prepare_feature_set((1, 2), (1, 5), (0, 100))
+    assert len(processor.feature_cache.entries()) == 2
+    processor.settings = processor.settings.model_copy(update={"eeg_storage": "quantized"})
+    processor.prepare_feature_set((1, 2), (1, 5), (0, 100))
+    assert len(processor.feature_cache.entries()) == 3
+
+
+def test_iter_batches_matches_batch(processor: EEGProcessor) -> None:
+    """Test that streamed batches concatenate to the materialized batch."""
+    data, valence, _ = processor.process_raw_data_batch((1, 2), (1, 10), (0, 100))
+    batches = list(processor.iter_batches(8, (1, 2), (1, 10), (0, 100)))
+
+    assert [len(batch[0]) for batch in batches] == [8, 8, 4]
+    np.testing.assert_array_equal(np.concatenate([b[0] for b in batches]), data)
+    np.testing.assert_array_equal(np.concatenate([b[1] for b in batches]), valence)
+
+
+def test_iter_trials_shuffle_is_permutation(processor: EEGProcessor) -> None:
+    """Test that buffered shuffling yields every trial exactly once."""
+    ordered = [(u, t) for *_, u, t in processor.iter_trials((1, 2), (1, 10), (0, 100))]
+    shuffled = [
+        (u, t)
+        for *_, u, t in processor.iter_trials((1, 2), (1, 10), (0, 100), shuffle_buffer=5, seed=1)
+    ]
+
+    assert shuffled != ordered
+    assert sorted(shuffled) == sorted(ordered)
+
+
+def test_batch_uses_configured_dtype(make_processor: Callable[..., EEGProcessor]) -> None:
+    """Test that batch output follows the numeric dtype setting."""
+    processor = make_processor(numeric_dtype="float32")
+    data, _, _ = processor.process_raw_data_batch((1, 2), (1, 5), (0, 100))
+
+    assert data.dtype == np.float32
+
+
+@pytest.mark.parametrize("storage", ["pickle", "memmap", "chunked"])
+def test_get_trial_reads_requested_slice(processor: EEGProcessor, storage: str) -> None:
+    """Test that get_trial returns only the requested channels and samples."""
+    full = processor.load_user_data(2, storage="pickle")
+    assert full is not None
+
+    trial = processor.get_trial(2, 7, channels=["F7", "AF3"], time_range=(20, 60), storage=storage)
+
+    assert trial is not None
+    assert trial.data.shape == (2, 40)
+    np.testing.assert_array_equal(trial.data, full["data"][6][[3, 1], 20:60])
+    assert trial.label.valence == pytest.approx(full["labels"][6][0])
+
+
+def test_get_trial_quantized_close_to_pickle(processor: EEGProcessor) -> None:
+    """Test that quantized reads stay within the recorded reconstruction error."""
+    full = processor.load_user_data(2, storage="pickle")
+    assert full is not None
+
+    trial = processor.get_trial(
+        2, 7, channels=["F7", "AF3"], time_range=(20, 60), storage="quantized"
+    )
+    error = processor.dataset.stores["quantized"].reconstruction_error(2)
+
+    assert trial is not None
+    assert error is not None
+    np.testing.assert_allclose(
+        trial.data, full["data"][6][[3, 1], 20:60], rtol=0, atol=error["max_abs"] * 1.01
+    )
+
+
+def test_batch_matches_raw_channel_indexing(processor: EEGProcessor) -> None:
+    """Test that batch rows match fancy indexing of the raw subject."""
+    processor.set_active_channels(["F3", "AF3", "O2"])
+    raw = processor.load_user_data(1)
+    assert raw is not None
+
+    data, valence, _ = processor.process_raw_data_batch((1, 1), (3, 6), (10, 90))
+
+    expected = raw["data"][2:6][:, [2, 1, 31], 10:90].reshape(4, -1)
+    np.testing.assert_array_equal(data, expected)
+    np.testing.assert_array_equal(valence, raw["labels"][2:6, 0])
+
+
+def test_channel_groups_are_views(processor: EEGProcessor) -> None:
+    """Test that consecutive channel groups select views of the channel-major layout."""
+    layout = processor.load_channel_major(1)
+    raw = processor.load_user_data(1)
+    assert layout is not None
+    assert raw is not None
+
+    active = processor.channel_group_view(layout["data"])
+    right = processor.channel_group_view(layout["data"], "right")
+
+    assert np.shares_memory(active, layout["data"])
+    assert np.shares_memory(right, layout["data"])
+    np.testing.assert_array_equal(active, raw["data"][:, [1, 3, 2, 4, 7], :])
+    assert processor.channel_groups["right"] == ["O2", "P8", "T8", "FC6", "F4", "F8", "AF4"]
+    assert processor.channel_selector(["AF4", "F8", "F4"]) == slice(13, 10, -1)
+
+
+def test_get_channel_data_layout_is_explicit(processor: EEGProcessor) -> None:
+    """Test that a raw trial with as many rows as mapped channels is indexed as raw."""
+    layout = processor.load_channel_major(1)
+    raw = processor.load_user_data(1)
+    assert layout is not None
+    assert raw is not None
+    label = processor.extract_trial_data(raw, 1, 1).label
+    raw_trial = EEGData(data=raw["data"][0, :14], label=label, user_id=1, trial_id=1)
+    major_trial = EEGData(data=layout["data"][0], label=label, user_id=1, trial_id=1)
+
+    np.testing.assert_array_equal(
+        processor.get_channel_data(raw_trial), raw["data"][0, [1, 3, 2, 4, 7]]
+    )
+    selected = processor.get_channel_data(major_trial, channel_major=True)
+    np.testing.assert_array_equal(selected, raw["data"][0, [1, 3, 2, 4, 7]])
+    assert np.shares_memory(selected, layout["data"])
+
+
+def test_parallel_output_avoids_full_tmpfs(
+    processor: EEGProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a shared output too large for /dev/shm goes to the temp directory."""
+    monkeypatch.setattr(spill, "free_bytes", lambda directory: 1024)
+
+    assert spill.shared_array_dir(2048) == Path(tempfile.gettempdir())
+
+    serial = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128), n_workers=1)
+    parallel = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128), n_workers=2)
+    np.testing.assert_array_equal(serial[0], parallel[0])
+
+
+def test_pool_workers_share_the_parent_fft_backend(
+    processor: EEGProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that pool workers neither re-benchmark nor oversubscribe FFT threads."""
+    n_cpus = os.cpu_count() or 1
+    backend = processor.pool_fft_backend(n_cpus)
+    assert backend.name == processor.fft_backend.name
+    assert backend.workers == 1
+
+    def benchmark(*args: object, **kwargs: object) -> None:
+        raise AssertionError("worker benchmarked the FFT backends again")
+
+    monkeypatch.setattr(eeg_processor, "select_fft_backend", benchmark)
+    monkeypatch.setattr(eeg_processor, "_worker_processor", None)
+    eeg_processor._init_batch_worker(processor.settings, processor.active_channels, backend)
+
+    assert eeg_processor._worker_processor is not None
+    assert eeg_processor._worker_processor.fft_backend == backend
+
+
+def test_broken_pool_returns_empty_batch(
+    processor: EEGProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a dead worker is reported like an empty batch instead of raising."""
+
+    def crash(*args: object, **kwargs: object) -> None:
+        raise BrokenProcessPool("worker killed by SIGBUS")
+
+    monkeypatch.setattr(processor, "_run_batch_pool", crash)
+
+    data, valence, arousal = processor.process_raw_data_batch(
+        (1, 2), (1, 40), (0, 128), n_workers=2
+    )
+
+    assert data.size == valence.size == arousal.size == 0
+
+
+def test_batch_spills_above_memory_budget(make_processor: Callable[..., EEGProcessor]) -> None:
+    """Test that a batch larger than the memory budget is returned disk-backed."""
+    processor = make_processor(feature_memory_budget_mb=1)
+    processor.set_active_channels(processor.channel_order)
+
+    spilled, valence, _ = processor.process_raw_data_batch((1, 3), (1, 40), (0, 128))
+
+    processor.settings = processor.settings.model_copy(update={"feature_memory_budget_mb": 0})
+    in_memory, expected_valence, _ = processor.process_raw_data_batch((1, 3), (1, 40), (0, 128))
+
+    assert isinstance(spilled, np.memmap)
+    assert not isinstance(in_memory, np.memmap)
+    np.testing.assert_array_equal(spilled, in_memory)
+    np.testing.assert_array_equal(valence, expected_valence)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"feature_mode": "band_power", "welch_segment_seconds": 0.5},
+        {"epoch_seconds": 0.25, "epoch_hop_seconds": 0.125},
+        {"filter_low_hz": 4.0, "filter_high_hz": 30.0},
+        {"feature_mode": "de_asymmetry", "welch_segment_seconds": 0.5},
+        {"baseline_correction": "zscore"},
+        {"decimation_factor": 4},
+        {"epoch_seconds": 0.5, "artifact_rejection": "drop", **AMPLITUDE_ONLY},
+        {"epoch_seconds": 0.5, "artifact_rejection": "weight", **AMPLITUDE_ONLY},
+    ],
+    ids=[
+        "raw",
+        "band_power",
+        "epochs",
+        "prefilter",
+        "de_asymmetry",
+        "baseline",
+        "decimation",
+        "artifact_drop",
+        "artifact_weight",
+    ],
+)
+def test_iter_batches_match_batch_in_every_mode(
+    make_processor: Callable[..., EEGProcessor], long_deap_dir: Path, overrides: dict
+) -> None:
+    """Test that the streaming path yields the materialized batch rows in every feature mode."""
+    # Trials outlast the DEAP baseline, so baseline correction has a window to correct
+    processor = make_processor(raw_data_eeg_path=long_deap_dir, **overrides)
+
+    data, valence, _, weights = processor.process_raw_data_batch(
+        (1, 2), (1, 40), (416, 512), with_weights=True
+    )
+    batches = list(processor.iter_batches(16, (1, 2), (1, 40), (416, 512)))
+
+    assert len(data) > 0
+    np.testing.assert_allclose(np.concatenate([batch[0] for batch in batches]), data)
+    np.testing.assert_array_equal(np.concatenate([batch[1] for batch in batches]), valence)
+    np.testing.assert_allclose(np.concatenate([batch[3] for batch in batches]), weights)
+
+
+def test_band_power_features(make_processor: Callable[..., EEGProcessor]) -> None:
+    """Test that band-power mode emits per-channel Welch band powers usable by PCA models."""
+    processor = make_processor(feature_mode="band_power", welch_segment_seconds=0.5)
+    raw = processor.load_user_data(2)
+    assert raw is not None
+
+    data, valence, _ = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128))
+
+    assert data.shape == (80, len(processor.active_channels) * len(EEG_BANDS))
+    expected = band_power_features(raw["data"][4][_active_rows(processor)], 128, 64)
+    np.testing.assert_allclose(data[44], expected.reshape(-1))
+
+    manager = MLModelManager(processor.settings)
+    manager.create_model("PCA+KNN")
+    labels = processor.labels_to_binary(valence)
+    manager.set_training_data(data, labels, labels)
+    assert manager.train()
+
+
+def test_epoched_batch_propagates_trial_labels(
+    make_processor: Callable[..., EEGProcessor],
+) -> None:
+    """Test that epoching turns each trial into overlapping rows with the trial's labels."""
+    processor = make_processor(epoch_seconds=0.25, epoch_hop_seconds=0.125)
+    raw = processor.load_user_data(1)
+    assert raw is not None
+
+    data, valence, _ = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128), n_workers=2)
+
+    # 32-sample epochs every 16 samples give 7 epochs per 128-sample trial
+    assert data.shape == (80 * 7, len(processor.active_channels) * 32)
+    assert processor.plan_batch((1, 2), (1, 40), (0, 128))["n_rows"] == 80 * 7
+    expected = raw["data"][3][_active_rows(processor), 32:64]
+    np.testing.assert_array_equal(data[3 * 7 + 2], expected.reshape(-1))
+    np.testing.assert_array_equal(valence[3 * 7 : 4 * 7], raw["labels"][3][0])
+
+
+def test_prefilter_applies_before_features(make_processor: Callable[..., EEGProcessor]) -> None:
+    """Test that the pre-filter runs over the trial before the window is cut."""
+    processor = make_processor(filter_low_hz=4.0, filter_high_hz=30.0)
+    raw = processor.load_user_data(1)
+    assert raw is not None
+
+    data, _, _ = processor.process_raw_data_batch((1, 2), (1, 40), (32, 128))
+
+    bank = processor.filter_bank(128, {"band": (4.0, 30.0)})
+    expected, _ = bank.apply(raw["data"][5][_active_rows(processor)])
+    np.testing.assert_allclose(data[5], expected[0, :, 32:].reshape(-1))
+
+
+def test_de_asymmetry_features(make_processor: Callable[..., EEGProcessor]) -> None:
+    """Test that the asymmetry feature set covers all channels and symmetric pairs."""
+    processor = make_processor(feature_mode="de_asymmetry", welch_segment_seconds=0.5)
+    layout = processor.load_channel_major(1)
+    assert layout is not None
+    assert processor.channel_pairs[0] == ("AF3", "AF4")
+    assert processor.channel_pairs[-1] == ("O1", "O2")
+
+    data, _, _ = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128))
+
+    assert data.shape == (80, (14 + 7) * len(EEG_BANDS))
+    pairs = (processor.channel_selector("left"), slice(13, 6, -1))
+    expected = asymmetry_features(layout["data"][2], 128, 64, pairs)
+    np.testing.assert_allclose(data[2], expected.reshape(-1))
+
+
+def test_window_stats_cached_per_subject(processor: EEGProcessor) -> None:
+    """Test that the subject index answers channel-major window queries and is cached."""
+    layout = processor.load_channel_major(1)
+    assert layout is not None
+
+    stats = processor.window_stats(1)
+
+    assert stats is not None
+    assert processor.window_stats(1) is stats
+    np.testing.assert_allclose(
+        stats.rms(20, 90), np.sqrt(np.mean(layout["data"][..., 20:90] ** 2, -1))
+    )
+
+
+def test_baseline_correction_offline_and_playback(
+    make_processor: Callable[..., EEGProcessor], long_deap_dir: Path
+) -> None:
+    """Test that trials are corrected by their pre-trial segment in both paths."""
+    processor = make_processor(raw_data_eeg_path=long_deap_dir, baseline_correction="zscore")
+    raw = processor.load_user_data(1)
+    assert raw is not None
+    assert raw["data"].shape[-1] == 600
+
+    data, _, _ = processor.process_raw_data_batch((1, 2), (1, 40), (384, 600))
+
+    # The first 384 samples are the baseline; only the samples after it are features
+    trial = raw["data"][5][_active_rows(processor)]
+    baseline = trial[:, :384]
+    mean, std = baseline.mean(-1, keepdims=True), baseline.std(-1, keepdims=True)
+    np.testing.assert_allclose(data[5], ((trial[:, 384:] - mean) / std).reshape(-1), rtol=1e-6)
+
+    playback = processor.load_playback_data(1)
+    assert playback is not None
+    assert playback["data"].shape == raw["data"].shape
+    np.testing.assert_allclose(playback["data"][..., :384].mean(-1), 0, atol=1e-9)
+    np.testing.assert_allclose(playback["data"][..., :384].std(-1), 1)
+    np.testing.assert_allclose(
+        playback["data"][5][_active_rows(processor), 384:], (trial[:, 384:] - mean) / std
+    )
+    # The cached subject shared with other callers is left as it was
+    assert processor.load_user_data(1)["data"] is raw["data"]
+    assert np.abs(raw["data"].mean(-1)).max() > 1
+
+
+def test_baseline_correction_rejects_windows_inside_the_baseline(
+    make_processor: Callable[..., EEGProcessor],
+) -> None:
+    """Test that a time range ending inside the baseline is rejected, not corrected."""
+    processor = make_processor(baseline_correction="zscore")
+
+    # The 128-sample synthetic trials lie wholly inside the 384-sample baseline
+    data, valence, _ = processor.process_raw_data_batch((1, 2), (1, 40), (64, 128))
+
+    assert data.size == valence.size == 0
+    assert list(processor.iter_batches(16, (1, 2), (1, 40), (64, 128))) == []
+    raw = processor.load_user_data(1)
+    playback = processor.load_playback_data(1)
+    assert playback is not None
+    assert playback["data"] is raw["data"]
+
+
+def test_decimated_raw_features(
+    make_processor: Callable[..., EEGProcessor], tmp_path: Path
+) -> None:
+    """Test that raw features are decimated before flattening and keyed by the factor."""
+    processor = make_processor(decimation_factor=4)
+    raw = processor.load_user_data(1)
+    assert raw is not None
+
+    data, valence, _ = processor.process_raw_data_batch((1, 2), (1, 40), (0, 128))
+
+    n_channels = len(processor.active_channels)
+    assert data.shape == (80, n_channels * 32)
+    expected = decimate(raw["data"][7][_active_rows(processor)], 4)
+    np.testing.assert_allclose(data[7], expected.reshape(-1))
+
+    params = processor._feature_cache_params((1, 2), (1, 40), (0, 128))
+    assert params["decimation_factor"] == 4
+
+    manager = MLModelManager(processor.settings)
+    manager.create_model("KNN")
+    labels = processor.labels_to_binary(valence)
+    manager.set_training_data(data, labels, labels)
+    assert manager.train()
+    assert manager.save_models(tmp_path / "models")
+    meta = json.loads((tmp_path / "models" / "model_meta.json").read_text())
+    assert meta["decimation_factor"] == 4
+    assert meta["n_features"] == n_channels * 32
+
+
+@pytest.mark.parametrize("rejection", ["drop", "weight"])
+def test_artifact_rejection(make_processor: Callable[..., EEGProcessor], rejection: str) -> None:
+    """Test that flagged epochs are dropped or down-weighted with their samples untouched."""
+    processor = make_processor(
+        epoch_seconds=0.5,
+        artifact_rejection=rejection,
+        artifact_weight=0.2,
+        **AMPLITUDE_ONLY,
+    )
+    layout = processor.load_channel_major(1)
+    assert layout is not None
+
+    data, valence, _, weights = processor.process_raw_data_batch(
+        (1, 1), (1, 40), (0, 128), with_weights=True
+    )
+
+    epochs = epoch_view(processor.channel_group_view(layout["data"]), 64, 64)
+    flagged = artifact_masks(epochs, 128, ArtifactThresholds(165.0, 0, 0, 0), 128)["amplitude"]
+    rows = flagged.any(axis=-1).reshape(-1)
+    assert 0 < rows.sum() < len(rows)
+    if rejection == "drop":
+        assert data.shape[0] == valence.shape[0] == (~rows).sum()
+        np.testing.assert_allclose(data, epochs.reshape(len(rows), -1)[~rows])
+        np.testing.assert_array_equal(weights, 1)
+    else:
+        np.testing.assert_allclose(data, epochs.reshape(len(rows), -1))
+        # Weights fall from 1 to artifact_weight with the share of flagged channels
+        np.testing.assert_allclose(weights, 1 - 0.8 * flagged.mean(axis=-1).reshape(-1))
+        assert (weights[rows] < 1).all()
+
+    params = processor._feature_cache_params((1, 1), (1, 40), (0, 128))
+    assert params["artifacts"]["rejection"] == rejection
+
+
+def test_weighted_feature_set_trains_svm_with_sample_weights(
+    make_processor: Callable[..., EEGProcessor],
+) -> None:
+    """Test that artifact weights survive the feature cache and reach the SVM fit."""
+    processor = make_processor(
+        epoch_seconds=0.5, artifact_rejection="weight", use_feature_cache=True, **AMPLITUDE_ONLY
+    )
+
+    data, valence, arousal, weights = processor.prepare_feature_set(
+        (1, 2), (1, 40), (0, 128), with_weights=True
+    )
+    cached = processor.prepare_feature_set((1, 2), (1, 40), (0, 128), with_weights=True)
+
+    assert (weights < 1).any()
+    np.testing.assert_array_equal(cached[3], weights)
+    manager = MLModelManager(processor.settings)
+    manager.create_model("SVM")
+    manager.set_training_data(data, valence, arousal, weights)
+    assert manager.train()
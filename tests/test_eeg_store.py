@@ -0,0 +1,131 @@
+"""Tests for binary EEG subject storage."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from emotion_recognition.core.eeg_store import (
+    ChunkedSubjectStore,
+    MemmapSubjectStore,
+    QuantizedSubjectStore,
+    byte_shuffle,
+    byte_unshuffle,
+    read_deap_pickle,
+)
+
+
+def test_convert_and_load_memmap(deap_dir: Path, tmp_path: Path) -> None:
+    """Test that converted subjects load as read-only memmaps with identical values."""
+    store = MemmapSubjectStore(tmp_path / "cache")
+    source = deap_dir / "s01.dat"
+
+    assert not store.is_current(1, source)
+    assert store.convert(1, source)
+    assert store.is_current(1, source)
+
+    loaded = store.load(1)
+    original = read_deap_pickle(source)
+
+    assert loaded is not None
+    assert isinstance(loaded["data"], np.memmap)
+    assert not loaded["data"].flags.writeable
+    np.testing.assert_array_equal(loaded["data"], original["data"])
+    np.testing.assert_array_equal(loaded["labels"], original["labels"])
+
+
+def test_stale_conversion_detected(deap_dir: Path, tmp_path: Path) -> None:
+    """Test that a source newer than its conversion is reported as stale."""
+    store = MemmapSubjectStore(tmp_path / "cache")
+    source = deap_dir / "s01.dat"
+    store.convert(1, source)
+
+    data_path, _ = store.paths(1)
+    mtime = data_path.stat().st_mtime
+    os.utime(source, (mtime + 10, mtime + 10))
+
+    assert not store.is_current(1, source)
+
+
+def test_load_missing_subject(tmp_path: Path) -> None:
+    """Test that loading an unconverted subject returns None."""
+    store = MemmapSubjectStore(tmp_path / "cache")
+
+    assert store.load(3) is None
+
+
+@pytest.mark.parametrize("codec", ["zlib", "auto"])
+def test_chunked_roundtrip(deap_dir: Path, tmp_path: Path, codec: str) -> None:
+    """Test that chunked subjects decompress to the original values."""
+    store = ChunkedSubjectStore(tmp_path / "cache", codec=codec, channels_per_chunk=3)
+    source = deap_dir / "s01.dat"
+
+    assert store.convert(1, source)
+    assert store.is_current(1, source)
+
+    loaded = store.load(1)
+    original = read_deap_pickle(source)
+
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded["data"], original["data"])
+    np.testing.assert_array_equal(loaded["labels"], original["labels"])
+
+
+def test_chunked_partial_read(deap_dir: Path, tmp_path: Path) -> None:
+    """Test reading a subset of trials, channels and samples."""
+    store = ChunkedSubjectStore(tmp_path / "cache", codec="zlib", n_threads=2)
+    source = deap_dir / "s01.dat"
+    store.convert(1, source)
+    original = read_deap_pickle(source)["data"]
+
+    part = store.read(1, trials=[5, 2], channels=[1, 3, 2, 31], time_range=(10, 50))
+
+    np.testing.assert_array_equal(part, original[[5, 2]][:, [1, 3, 2, 31], 10:50])
+
+
+def test_quantized_roundtrip(deap_dir: Path, tmp_path: Path) -> None:
+    """Test that quantized subjects are int16 and dequantize within half a step."""
+    store = QuantizedSubjectStore(tmp_path / "cache", dtype="float64")
+    source = deap_dir / "s01.dat"
+
+    assert store.convert(1, source)
+    assert store.is_current(1, source)
+
+    original = read_deap_pickle(source)
+    data_path, _, _ = store.paths(1)
+    assert np.load(data_path, mmap_mode="r").dtype == np.int16
+
+    loaded = store.load(1)
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded["labels"], original["labels"])
+
+    scale = np.asarray(store.read_index(1)["scale"])
+    error = np.abs(loaded["data"] - original["data"]).max(axis=(0, 2))
+    assert np.all(error <= scale / 2 * (1 + 1e-6))
+
+    measured = store.reconstruction_error(1)
+    assert measured is not None
+    assert measured["max_abs"] == pytest.approx(error.max(), rel=1e-6)
+    assert measured["snr_db"] > 80
+
+
+def test_quantized_partial_read(deap_dir: Path, tmp_path: Path) -> None:
+    """Test that partial reads match the same slice of the full subject."""
+    store = QuantizedSubjectStore(tmp_path / "cache")
+    store.convert(1, deap_dir / "s01.dat")
+    full = store.read(1)
+
+    part = store.read(1, trials=[5, 2], channels=[1, 3, 2, 31], time_range=(10, 50))
+
+    assert part.dtype == np.float32
+    np.testing.assert_array_equal(part, full[[5, 2]][:, [1, 3, 2, 31], 10:50])
+
+
+def test_byte_shuffle_roundtrip() -> None:
+    """Test that byte shuffling is lossless."""
+    array = np.random.default_rng(0).standard_normal((3, 17)).astype(np.float32)
+
+    restored = byte_unshuffle(byte_shuffle(array), array.dtype, array.shape)
+
+    np.testing.assert_array_equal(restored, array)
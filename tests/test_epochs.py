@@ -0,0 +1,17 @@
+"""Tests for sliding-window epoching."""
+
+import numpy as np
+
+from emotion_recognition.core.epochs import epoch_count, epoch_view
+
+
+def test_epoch_view_is_strided_view() -> None:
+    """Test that epochs match slicing and share memory with the trial."""
+    data = np.arange(2 * 3 * 20, dtype=float).reshape(2, 3, 20)
+
+    epochs = epoch_view(data, 8, 4)
+
+    assert epochs.shape == (2, epoch_count(20, 8, 4), 3, 8) == (2, 4, 3, 8)
+    assert np.shares_memory(epochs, data)
+    np.testing.assert_array_equal(epochs[1, 2], data[1, :, 8:16])
+    assert epoch_count(7, 8, 4) == 0
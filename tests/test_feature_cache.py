@@ -0,0 +1,68 @@
+"""Tests for the persistent feature cache."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from emotion_recognition.core.feature_cache import FeatureCache
+
+
+def _arrays(n_rows: int = 4) -> dict[str, np.ndarray]:
+    return {
+        "data": np.arange(n_rows * 8, dtype=float).reshape(n_rows, 8),
+        "labels": np.ones(n_rows),
+    }
+
+
+def test_roundtrip(tmp_path: Path) -> None:
+    """Test that stored arrays load back unchanged."""
+    cache = FeatureCache(tmp_path, max_bytes=1 << 20)
+    arrays = _arrays()
+
+    assert cache.save("abc", arrays, {"mode": "raw"})
+    loaded = cache.load("abc")
+
+    assert loaded is not None
+    np.testing.assert_array_equal(loaded["data"], arrays["data"])
+    assert cache.entries()[0]["params"] == {"mode": "raw"}
+
+
+def test_key_changes_with_params_and_sources(tmp_path: Path) -> None:
+    """Test that keys depend on both parameters and source file contents."""
+    cache = FeatureCache(tmp_path / "cache", max_bytes=1 << 20)
+    source = tmp_path / "s01.dat"
+    source.write_bytes(b"first")
+
+    key = cache.make_key({"channels": ["AF3"]}, [source])
+    assert key == cache.make_key({"channels": ["AF3"]}, [source])
+    assert key != cache.make_key({"channels": ["F7"]}, [source])
+
+    source.write_bytes(b"second")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert key != cache.make_key({"channels": ["AF3"]}, [source])
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the size limit evicts the least recently used entry."""
+    nbytes = sum(array.nbytes for array in _arrays().values())
+    cache = FeatureCache(tmp_path, max_bytes=2 * nbytes)
+
+    cache.save("a", _arrays(), {})
+    cache.save("b", _arrays(), {})
+    cache.load("a")
+    cache.save("c", _arrays(), {})
+
+    keys = {meta["key"] for meta in cache.entries()}
+    assert keys == {"a", "c"}
+    assert cache.total_bytes() <= 2 * nbytes
+
+
+def test_clear(tmp_path: Path) -> None:
+    """Test that clear removes every entry."""
+    cache = FeatureCache(tmp_path, max_bytes=1 << 20)
+    cache.save("a", _arrays(), {})
+
+    assert cache.clear() == 1
+    assert cache.load("a") is None
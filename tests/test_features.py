@@ -0,0 +1,66 @@
+"""Tests for differential entropy and asymmetry features."""
+
+import numpy as np
+import pytest
+
+from emotion_recognition.core.features import (
+    asymmetry_features,
+    differential_entropy,
+    hemispheric_asymmetry,
+)
+from emotion_recognition.core.spectral import EEG_BANDS, band_powers, welch_psd
+
+
+def test_differential_entropy_of_gaussian_noise() -> None:
+    """Test that white noise entropy follows the Gaussian formula for each band's variance."""
+    rate = 128
+    noise = np.random.default_rng(0).standard_normal((4, 128 * 60))
+
+    entropy = differential_entropy(noise, rate, 256)
+
+    # Unit-variance white noise spreads its power evenly up to Nyquist
+    widths = np.array([high - low for low, high in EEG_BANDS.values()])
+    expected = 0.5 * np.log(2 * np.pi * np.e * widths / (rate / 2))
+    assert entropy.shape == (4, len(EEG_BANDS))
+    np.testing.assert_allclose(entropy, np.broadcast_to(expected, entropy.shape), atol=0.05)
+
+
+def test_asymmetry_pairs_left_with_right() -> None:
+    """Test DASM pairing with a reversed right hemisphere slice."""
+    entropy = np.arange(1, 4 * 2 + 1, dtype=float).reshape(4, 2)
+
+    dasm = hemispheric_asymmetry(entropy, slice(0, 2), slice(3, 1, -1))
+
+    np.testing.assert_array_equal(dasm, entropy[[0, 1]] - entropy[[3, 2]])
+
+
+def test_dasm_is_a_log_band_power_ratio_for_low_variance_signals() -> None:
+    """Test that DASM stays finite where entropy is negative or near zero."""
+    rng = np.random.default_rng(2)
+    data = rng.standard_normal((4, 2048)) * np.array([[1e-3], [1.0], [2e-3], [0.5]])
+
+    entropy = differential_entropy(data, 128, 256)
+    dasm = hemispheric_asymmetry(entropy, [0, 1], [2, 3])
+
+    # Entropies are negative or near zero here, where a ratio of entropies breaks down
+    assert (entropy < 1).all()
+    assert (entropy < 0).any()
+    assert np.isfinite(dasm).all()
+    powers = band_powers(*welch_psd(data, 128, 256))
+    # The log floor is not negligible next to 1e-7 band powers
+    np.testing.assert_allclose(
+        2 * dasm, np.log(powers[[0, 1]] / powers[[2, 3]]), rtol=1e-3, atol=1e-3
+    )
+
+
+def test_asymmetry_features_layout() -> None:
+    """Test that features stack entropy and DASM over all leading axes."""
+    data = np.random.default_rng(1).standard_normal((3, 5, 4, 512)) * 20
+
+    features = asymmetry_features(data, 128, 128, (slice(0, 2), slice(3, 1, -1)))
+
+    assert features.shape == (3, 5, 4 + 2, len(EEG_BANDS))
+    np.testing.assert_allclose(features[..., :4, :], differential_entropy(data, 128, 128))
+    assert features[..., 4:6, :] == pytest.approx(
+        features[..., [0, 1], :] - features[..., [3, 2], :]
+    )
@@ -0,0 +1,57 @@
+"""Tests for IIR filter banks."""
+
+import numpy as np
+import pytest
+
+from emotion_recognition.core.filters import FilterBank, decimate, decimated_length, design_sos
+from emotion_recognition.core.spectral import EEG_BANDS
+
+
+def test_streaming_matches_offline_bit_for_bit() -> None:
+    """Test that chunks of any size carry state to reproduce offline filtering exactly."""
+    data = np.random.default_rng(0).standard_normal((3, 14, 1000))
+    bank = FilterBank(EEG_BANDS, 128)
+
+    offline, _ = bank.apply(data)
+
+    stream = bank.stream()
+    chunks = np.split(data, [1, 8, 258, 358], axis=-1)
+    streamed = np.concatenate([stream.process(chunk) for chunk in chunks], axis=-1)
+
+    assert offline.shape == (len(EEG_BANDS), 3, 14, 1000)
+    np.testing.assert_array_equal(streamed, offline)
+
+
+def test_bands_pass_their_frequencies() -> None:
+    """Test that a 10 Hz tone passes the alpha band and is rejected by the others."""
+    t = np.arange(1280) / 128
+    tone = np.sin(2 * np.pi * 10 * t)
+    bank = FilterBank(EEG_BANDS, 128)
+
+    filtered, _ = bank.apply(tone)
+    rms = np.sqrt(np.mean(filtered[:, 640:] ** 2, axis=-1))
+
+    assert bank.names[int(np.argmax(rms))] == "alpha"
+    assert rms[bank.names.index("alpha")] == pytest.approx(np.sqrt(0.5), rel=0.1)
+    assert rms[bank.names.index("gamma")] < 0.01
+
+
+def test_design_sos_requires_a_cutoff() -> None:
+    """Test that cutoffs at or above Nyquist alone are rejected."""
+    assert design_sos(0, 30, 128).shape == (2, 6)
+    with pytest.raises(ValueError, match="Nyquist"):
+        design_sos(0, 64, 128)
+
+
+def test_decimate_keeps_low_and_rejects_aliasing_frequencies() -> None:
+    """Test that decimation passes slow rhythms and filters out would-be aliases."""
+    t = np.arange(1280) / 128
+    slow = np.sin(2 * np.pi * 3 * t)
+    fast = np.sin(2 * np.pi * 50 * t)  # Aliases to 14 Hz at 32 Hz without filtering
+
+    out = decimate(np.stack([slow + 20, fast]), 4)
+
+    assert out.shape == (2, decimated_length(1280, 4)) == (2, 320)
+    np.testing.assert_allclose(out[0, 20:-20], slow[::4][20:-20] + 20, atol=0.05)
+    assert np.abs(out[1, 20:-20]).max() < 0.05
+    assert decimate(slow, 1) is slow
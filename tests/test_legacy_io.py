@@ -0,0 +1,84 @@
+"""Tests for the legacy text dataset importer/exporter."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from emotion_recognition.core.feature_cache import load_feature_set
+from emotion_recognition.core.legacy_io import (
+    export_legacy_text,
+    import_legacy_dataset,
+    parse_text_matrix,
+)
+
+
+def _write_legacy_split(
+    directory: Path, split: str, n_rows: int, seed: int, with_classes: bool = True
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    data = rng.normal(size=(n_rows, 12))
+    valence = rng.uniform(1.0, 9.0, size=n_rows)
+    arousal = rng.uniform(1.0, 9.0, size=n_rows)
+
+    export_legacy_text(
+        data,
+        valence,
+        arousal,
+        data_path=directory / f"{split}_data_eeg.dat",
+        valence_path=directory / f"{split}_label_valance.dat",
+        arousal_path=directory / f"{split}_label_arousal.dat",
+    )
+    if with_classes:
+        np.savetxt(directory / f"{split}_label_valance_class.dat", valence > 4.5, fmt="%d")
+        np.savetxt(directory / f"{split}_label_arousal_class.dat", arousal > 4.5, fmt="%d")
+    return data, valence, arousal
+
+
+def _write_legacy_config(path: Path) -> None:
+    config = {"label_threshold": 4.5, "nTime_head": 384, "nTime_end": 8064}
+    for split in ("train", "test"):
+        config[f"{split}_data_eeg_path"] = f"/home/user/data/{split}_data_eeg.dat"
+        for label in ("valance", "arousal"):
+            config[f"{split}_label_{label}_path"] = f"/home/user/data/{split}_label_{label}.dat"
+            config[f"{split}_label_{label}_class_path"] = (
+                f"/home/user/data/{split}_label_{label}_class.dat"
+            )
+    config["nChannel_ON"] = {"AF3": 1, "F7": 3}
+    path.write_text(json.dumps(config))
+
+
+def test_parse_text_matrix_parallel_matches_serial(tmp_path: Path) -> None:
+    """Test that chunked parallel parsing reproduces the exported values exactly."""
+    data = np.random.default_rng(0).normal(size=(37, 9))
+    text_path = tmp_path / "data.dat"
+    np.savetxt(text_path, data, fmt="%.17g", delimiter=" ", newline=" \n")
+
+    serial = parse_text_matrix(text_path, tmp_path / "serial.npy", n_workers=1)
+    parallel = parse_text_matrix(text_path, tmp_path / "parallel.npy", n_workers=3)
+
+    np.testing.assert_array_equal(serial, data)
+    np.testing.assert_array_equal(parallel, data)
+
+
+def test_import_legacy_dataset(tmp_path: Path) -> None:
+    """Test importing both splits with class files and threshold fallback."""
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    train = _write_legacy_split(legacy_dir, "train", 20, seed=1)
+    test = _write_legacy_split(legacy_dir, "test", 7, seed=2, with_classes=False)
+    config_path = tmp_path / "config_deap_eeg.json"
+    _write_legacy_config(config_path)
+
+    imported = import_legacy_dataset(config_path, tmp_path / "out", base_dir=legacy_dir)
+
+    assert set(imported) == {"train", "test"}
+    for split, (data, valence, arousal) in (("train", train), ("test", test)):
+        arrays = load_feature_set(imported[split])
+        np.testing.assert_array_equal(arrays["data"], data)
+        np.testing.assert_array_equal(arrays["valence"], (valence > 4.5).astype(int))
+        np.testing.assert_array_equal(arrays["arousal"], (arousal > 4.5).astype(int))
+
+    meta = json.loads((imported["train"] / "meta.json").read_text())
+    assert meta["channels"] == ["AF3", "F7"]
+    assert meta["time_range"] == [384, 8064]
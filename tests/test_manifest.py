@@ -0,0 +1,60 @@
+"""Tests for the dataset manifest."""
+
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from emotion_recognition.config import Settings
+from emotion_recognition.core.eeg_processor import EEGProcessor
+from emotion_recognition.core.manifest import DatasetManifest
+
+
+def test_manifest_records_shapes_and_offsets(deap_dir: Path) -> None:
+    """Test that entries describe the arrays and locate their raw payloads."""
+    manifest = DatasetManifest(deap_dir)
+    assert manifest.generate()
+
+    entry = DatasetManifest(deap_dir).subjects[1]
+    assert entry["data"]["shape"] == [40, 40, 128]
+    assert entry["labels"]["shape"] == [40, 4]
+    assert manifest.verify(1)
+    assert manifest.validate() == {}
+
+    with open(deap_dir / "s01.dat", "rb") as f:
+        subject = pickle.load(f)
+    raw = np.memmap(
+        deap_dir / "s01.dat",
+        dtype=entry["data"]["dtype"],
+        mode="r",
+        offset=entry["data"]["offset"],
+        shape=tuple(entry["data"]["shape"]),
+    )
+    np.testing.assert_array_equal(raw, subject["data"])
+    np.testing.assert_allclose(entry["labels"]["min"], subject["labels"].min(axis=0))
+
+
+def test_processor_skips_subjects_failing_manifest(deap_dir: Path, tmp_path: Path) -> None:
+    """Test that truncated subjects are excluded before any payload is read."""
+    settings = Settings(
+        raw_data_eeg_path=deap_dir,
+        eeg_cache_dir=tmp_path / "cache",
+        feature_cache_dir=tmp_path / "features",
+        dataset_manifest="generate",
+    )
+    EEGProcessor(settings)
+    assert (deap_dir / "manifest.json").exists()
+
+    path = deap_dir / "s02.dat"
+    stat = path.stat()
+    path.write_bytes(path.read_bytes()[:1000])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    processor = EEGProcessor(settings)
+    assert processor.validate_dataset() == {2: "size"}
+
+    plan = processor.plan_batch((1, 2), (1, 10), (0, 100))
+    assert plan == {"n_users": 1, "n_rows": 10, "n_features": 500, "nbytes": 10 * 500 * 8}
+    data, _, _ = processor.process_raw_data_batch((1, 2), (1, 10), (0, 100))
+    assert data.shape == (10, 500)
@@ -0,0 +1,111 @@
+"""Tests for the ML model manager."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.svm import SVC
+
+from emotion_recognition.config import Settings
+from emotion_recognition.core.ml_models import MLModelManager
+
+
+@pytest.fixture
+def dataset() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Small separable binary classification problem."""
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 80)
+    data = rng.standard_normal((80, 20)) + labels[:, None] * 2.0
+    return data[:60], labels[:60], data[60:], labels[60:]
+
+
+def _trained_manager(settings: Settings, dataset: tuple) -> MLModelManager:
+    train_data, train_labels, test_data, test_labels = dataset
+    manager = MLModelManager(settings)
+    manager.create_model("KNN")
+    manager.set_training_data(train_data, train_labels, train_labels)
+    manager.set_test_data(test_data, test_labels, test_labels)
+    assert manager.train()
+    assert manager.predict()
+    return manager
+
+
+def test_float32_data_path(dataset: tuple) -> None:
+    """Test that data is stored in the configured dtype."""
+    manager = _trained_manager(Settings(numeric_dtype="float32"), dataset)
+
+    assert manager.train_data is not None
+    assert manager.train_data.dtype == np.float32
+    assert manager.test_data is not None
+    assert manager.test_data.dtype == np.float32
+
+
+def test_dtype_parity_report(dataset: tuple) -> None:
+    """Test that the parity check compares against a float64 reference."""
+    train_data, _, test_data, _ = dataset
+    manager = _trained_manager(Settings(numeric_dtype="float32"), dataset)
+
+    parity = manager.check_dtype_parity(train_data, test_data)
+
+    assert parity is not None
+    assert parity["arousal_drift"] <= 0.05
+    assert 0.0 <= parity["valence_disagreement"] <= 1.0
+
+    # Data already rounded to float32 is no float64 reference
+    assert manager.check_dtype_parity(manager.train_data, manager.test_data) is None
+
+
+def test_saved_models_record_dtype(dataset: tuple, tmp_path: Path) -> None:
+    """Test that loading models restores the dtype they were trained with."""
+    manager = _trained_manager(Settings(numeric_dtype="float32"), dataset)
+    assert manager.save_models(tmp_path)
+
+    loaded = MLModelManager(Settings())
+    assert loaded.load_models(tmp_path)
+
+    assert loaded.dtype == np.float32
+    assert loaded.current_model_type == "KNN"
+
+
+def test_spilled_training_data(tmp_path: Path) -> None:
+    """Test that PCA models train block by block on disk-backed data over budget."""
+    settings = Settings(spill_dir=tmp_path, feature_memory_budget_mb=1)
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 2, 400)
+    data = np.memmap(tmp_path / "train.dat", dtype=np.float32, mode="w+", shape=(400, 1200))
+    data[:] = rng.standard_normal((400, 1200)) + labels[:, None]
+
+    manager = MLModelManager(settings)
+    manager.create_model("PCA+KNN")
+    manager.set_training_data(data[:300], labels[:300], labels[:300])
+    manager.set_test_data(data[300:], labels[300:], labels[300:])
+
+    assert isinstance(manager.train_data, np.memmap)
+    assert manager.train_data.dtype == np.float64
+    assert manager.train()
+    assert manager.predict()
+    assert type(manager.arousal_pca).__name__ == "IncrementalPCA"
+
+    results = manager.get_results()
+    assert results is not None
+    assert results["arousal_accuracy"] > 0.9
+
+
+@pytest.mark.parametrize("model_type", ["SVM", "KNN", "PCA+KNN"])
+def test_sample_weights(dataset: tuple, model_type: str) -> None:
+    """Test that SVM models are fitted with sample weights and KNN models without light rows."""
+    train_data, train_labels, _, _ = dataset
+    weights = np.ones(len(train_labels))
+    weights[::4] = 0.25
+
+    manager = MLModelManager(Settings())
+    manager.create_model(model_type)
+    manager.set_training_data(train_data, train_labels, train_labels, weights)
+    assert manager.train()
+
+    if model_type == "SVM":
+        reference = SVC(kernel="rbf", C=1.0, gamma="scale", random_state=42)
+        reference.fit(train_data, train_labels, sample_weight=weights)
+        np.testing.assert_allclose(manager.arousal_model.dual_coef_, reference.dual_coef_)
+    else:
+        assert manager.arousal_model.n_samples_fit_ == (weights == 1).sum()
@@ -0,0 +1,120 @@
+"""Tests for batched spectral analysis."""
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from emotion_recognition.core.spectral import (
+    EEG_BANDS,
+    FFTBackend,
+    band_powers,
+    benchmark_fft_backends,
+    compute_spectrum,
+    rfft_frequencies,
+    select_fft_backend,
+    welch_psd,
+    window_function,
+)
+
+
+def test_batched_spectrum_matches_per_channel() -> None:
+    """Test that one call over a window stack matches transforming each row."""
+    data = np.random.default_rng(0).standard_normal((3, 4, 64))
+
+    freqs, spectra = compute_spectrum(data, 128, window="hann")
+
+    assert spectra.shape == (3, 4, 33)
+    for channel in range(3):
+        for window in range(4):
+            row = data[channel, window] * np.hanning(64)
+            expected = 20 * np.log10(np.abs(np.fft.rfft(row)) + 1e-10)
+            np.testing.assert_allclose(spectra[channel, window], expected)
+    np.testing.assert_allclose(freqs, np.fft.rfftfreq(64, 1 / 128))
+
+
+def test_spectrum_peak_at_signal_frequency() -> None:
+    """Test that a pure tone peaks at its frequency in linear magnitude."""
+    t = np.arange(256) / 128
+    tone = np.sin(2 * np.pi * 10 * t)
+
+    freqs, magnitude = compute_spectrum(tone, 128, db=False)
+
+    assert freqs[np.argmax(magnitude)] == pytest.approx(10)
+
+
+def test_frequency_axes_are_memoized() -> None:
+    """Test that repeat lookups return the same read-only arrays."""
+    assert rfft_frequencies(100, 60) is rfft_frequencies(100, 60)
+    assert window_function("hann", 100) is window_function("hann", 100)
+    assert not rfft_frequencies(100, 60).flags.writeable
+
+    with pytest.raises(ValueError, match="Unknown window"):
+        window_function("kaiser", 100)
+
+
+def test_band_powers_integrate_psd() -> None:
+    """Test that an alpha tone puts its power in the alpha band."""
+    t = np.arange(1024) / 128
+    tone = np.sin(2 * np.pi * 10 * t)
+
+    freqs, psd = welch_psd(tone, 128, 256)
+    powers = band_powers(freqs, psd)
+
+    assert list(EEG_BANDS)[int(np.argmax(powers))] == "alpha"
+
+
+@pytest.mark.parametrize(("n_samples", "segment", "overlap"), [(1024, 256, 0.5), (1000, 125, 0.25)])
+def test_welch_matches_scipy(n_samples: int, segment: int, overlap: float) -> None:
+    """Test that batched Welch estimates equal scipy.signal.welch row by row."""
+    data = np.random.default_rng(2).standard_normal((3, 2, n_samples))
+
+    freqs, psd = welch_psd(data, 128, segment, overlap=overlap)
+    expected_freqs, expected = signal.welch(
+        data, 128, nperseg=segment, noverlap=segment - int(segment * (1 - overlap))
+    )
+
+    np.testing.assert_allclose(freqs, expected_freqs)
+    np.testing.assert_allclose(psd, expected, rtol=1e-10)
+    np.testing.assert_allclose(
+        window_function("hann", 8, periodic=True), signal.get_window("hann", 8)
+    )
+
+
+def test_fft_backends_agree() -> None:
+    """Test that the threaded scipy backend matches numpy."""
+    data = np.random.default_rng(1).standard_normal((14, 3, 256))
+
+    _, numpy_spectra = compute_spectrum(data, 128, window="hann", backend=FFTBackend("numpy"))
+    _, scipy_spectra = compute_spectrum(
+        data, 128, window="hann", backend=FFTBackend("scipy", workers=2)
+    )
+    _, numpy_psd = welch_psd(data, 128, 64, backend=FFTBackend("numpy"))
+    _, scipy_psd = welch_psd(data, 128, 64, backend=FFTBackend("scipy", workers=2))
+
+    np.testing.assert_allclose(scipy_spectra, numpy_spectra, atol=1e-9)
+    np.testing.assert_allclose(scipy_psd, numpy_psd, rtol=1e-9)
+
+    with pytest.raises(ValueError, match="Unknown FFT backend"):
+        FFTBackend("fftw").rfft(data)
+
+
+def test_fast_length_padding() -> None:
+    """Test that padding moves to a fast length and keeps the tone peak."""
+    backend = FFTBackend("scipy", pad_fast=True)
+    tone = np.sin(2 * np.pi * 10 * np.arange(2003) / 128)
+
+    freqs, magnitude = compute_spectrum(tone, 128, db=False, backend=backend)
+
+    assert backend.fft_length(2003) == 2025
+    assert magnitude.shape == (1013,)
+    np.testing.assert_allclose(freqs, np.fft.rfftfreq(2025, 1 / 128))
+    assert freqs[np.argmax(magnitude)] == pytest.approx(10, abs=0.1)
+
+
+def test_auto_backend_selection() -> None:
+    """Test that the benchmark times every backend and 'auto' picks one."""
+    timings = benchmark_fft_backends(repeats=1, shapes=((2, 64),))
+
+    assert set(timings) == {"numpy", "scipy"}
+    assert select_fft_backend("auto").name in timings
+    assert select_fft_backend("numpy", 2) == FFTBackend("numpy", 2)
@@ -0,0 +1,59 @@
+"""Tests for the bounded subject cache."""
+
+import numpy as np
+
+from emotion_recognition.core.subject_cache import SubjectCache, resident_nbytes
+
+
+def test_hits_and_misses() -> None:
+    """Test that lookups update hit and miss counters."""
+    cache = SubjectCache(max_entries=4, max_bytes=10_000)
+    cache.put(1, np.zeros(10))
+
+    assert cache.get(1) is not None
+    assert cache.get(2) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_evicts_least_recently_used_by_entries() -> None:
+    """Test that the entry bound evicts the least recently used key."""
+    cache = SubjectCache(max_entries=2, max_bytes=10_000)
+    cache.put(1, np.zeros(1))
+    cache.put(2, np.zeros(1))
+    cache.get(1)
+    cache.put(3, np.zeros(1))
+
+    assert 1 in cache
+    assert 2 not in cache
+    assert cache.evictions == 1
+
+
+def test_evicts_by_bytes() -> None:
+    """Test that the byte bound evicts entries until the new value fits."""
+    cache = SubjectCache(max_entries=100, max_bytes=200)
+    cache.put(1, np.zeros(10))  # 80 bytes
+    cache.put(2, np.zeros(10))
+    cache.put(3, np.zeros(10))
+
+    assert len(cache) == 2
+    assert cache.nbytes == 160
+    assert 1 not in cache
+
+
+def test_oversized_value_not_cached() -> None:
+    """Test that values larger than the byte budget are rejected."""
+    cache = SubjectCache(max_entries=10, max_bytes=8)
+
+    assert not cache.put(1, np.zeros(10))
+    assert len(cache) == 0
+
+
+def test_resident_nbytes_ignores_memmap(tmp_path) -> None:
+    """Test that memory-mapped arrays do not count against the budget."""
+    mapped = np.lib.format.open_memmap(tmp_path / "a.npy", mode="w+", shape=(100,))
+    value = {"data": mapped, "labels": np.zeros(4)}
+
+    assert resident_nbytes(value) == 32
@@ -0,0 +1,27 @@
+"""Tests for the prefix-sum window statistics index."""
+
+import numpy as np
+
+from emotion_recognition.core.window_stats import PrefixStats
+
+
+def test_window_stats_match_direct_reduction() -> None:
+    """Test scalar and vectorized window queries against numpy reductions."""
+    data = np.random.default_rng(0).standard_normal((3, 4, 500)) * 20 + 1e4
+    stats = PrefixStats(data)
+
+    window = data[..., 100:400]
+    np.testing.assert_allclose(stats.mean(100, 400), window.mean(axis=-1))
+    np.testing.assert_allclose(stats.variance(100, 400), window.var(axis=-1), rtol=1e-9)
+    np.testing.assert_allclose(stats.energy(100, 400), np.square(window).sum(axis=-1))
+    np.testing.assert_allclose(stats.rms(100, 400), np.sqrt(np.square(window).mean(axis=-1)))
+
+    starts, ends = np.array([0, 384, 250]), np.array([50, 500, 251])
+    variances = stats.variance(starts, ends)
+    assert variances.shape == (3, 4, 3)
+    for i, (start, end) in enumerate(zip(starts, ends, strict=True)):
+        np.testing.assert_allclose(
+            variances[..., i], data[..., start:end].var(axis=-1), rtol=1e-9, atol=1e-9
+        )
+
+    assert np.isnan(stats.mean(10, 10)).all()